@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management import BaseCommand
+from django.db import transaction
 from django.db.models import Count
 
+from common.generations import bump_table_generation
 from common.models import Coach, Team
+from common.search import SearchIndex
+from common.utils import warn_unless_cache_shared
 
 
 class Command(BaseCommand):
@@ -15,18 +24,100 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("--execute", action=argparse.BooleanOptionalAction)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of processes hashing passwords",
+        )
 
     def handle(self, *args, **options):
-        execute = options["execute"]
+        Profile = get_user_model()
 
-        print("username,password")
-        for team in Team.objects.all().annotate(Count("coaches")):
-            username = re.sub(r"\W", "", team.name).lower()
+        self.stdout.write("username,password")
+        accounts = []
+        for team_id, name, coach_count in Team.objects.annotate(
+            Count("coaches")
+        ).values_list("id", "name", "coaches__count"):
+            username = re.sub(r"\W", "", name).lower()
             password = username + "password"
-            print(f"{username},{password}")
+            self.stdout.write(f"{username},{password}")
+            if coach_count == 0:
+                accounts.append(
+                    (team_id, Profile.normalize_username(username), password)
+                )
+
+        if not options["execute"]:
+            return
+        taken = set(
+            Profile.objects.filter(
+                username__in=[username for _, username, _ in accounts]
+            ).values_list("username", flat=True)
+        )
+        for username in sorted(taken):
+            self.stderr.write(f"{username}: username taken, skipped")
+        # Teams whose names differ only in punctuation or case get the same username
+        counts = Counter(username for _, username, _ in accounts)
+        duplicates = {username for username, count in counts.items() if count > 1}
+        for username in sorted(duplicates - taken):
+            self.stderr.write(
+                f"{username}: username shared by {counts[username]} teams, skipped"
+            )
+        skipped = taken | duplicates
+        accounts = [account for account in accounts if account[1] not in skipped]
+        if not accounts:
+            return
+
+        # Hashing is deliberately slow and CPU bound, so spread it over processes
+        start = time.perf_counter()
+        workers = max(1, options["workers"])
+        with ProcessPoolExecutor(workers) as executor:
+            hashes = list(
+                executor.map(
+                    make_password,
+                    [password for _, _, password in accounts],
+                    chunksize=max(1, len(accounts) // (workers * 4)),
+                )
+            )
+        hashed = time.perf_counter()
 
-            if execute and team.coaches__count == 0:
-                profile = get_user_model().objects.create_user(
-                    username=username, password=password
+        # Bulk inserts skip Coach.save, so set what it sets on the profiles here
+        with transaction.atomic():
+            profiles = Profile.objects.bulk_create(
+                Profile(
+                    username=username,
+                    password=password_hash,
+                    is_coach=True,
+                    is_staff=True,
                 )
-                Coach.objects.create(profile=profile, team=team)
+                for (_, username, _), password_hash in zip(accounts, hashes)
+            )
+            coaches = Coach.objects.bulk_create(
+                Coach(team_id=team_id, profile=profile)
+                for (team_id, _, _), profile in zip(accounts, profiles)
+            )
+            group = Coach.permissions_group()
+            Profile.groups.through.objects.bulk_create(
+                Profile.groups.through(profile_id=profile.id, group_id=group.id)
+                for profile in profiles
+            )
+        created = time.perf_counter()
+
+        bump_table_generation(Coach._meta.db_table)
+        SearchIndex.index_objects(
+            {
+                Profile: [profile.id for profile in profiles],
+                Coach: [coach.id for coach in coaches],
+            }
+        )
+
+        count = len(accounts)
+        self.stderr.write(
+            f"Hashed {count} passwords in {hashed - start:.2f}s "
+            f"({count / (hashed - start):.1f}/s, {workers} workers)"
+        )
+        self.stderr.write(
+            f"Created {count} coaches in {created - hashed:.2f}s "
+            f"({count / (created - hashed):.1f}/s)"
+        )
+        warn_unless_cache_shared(self)
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from common.access import UserAccess
+from common.models import Coach, Team
+
+
+class CreateCoachesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.needham = Team.objects.create(name="Needham")
+        cls.wellesley = Team.objects.create(name="Wellesley")
+        cls.coach = get_user_model().objects.create_user(username="coach")
+        Coach.objects.create(team=cls.needham, profile=cls.coach)
+
+    def test_created_coaches_have_access(self):
+        dover = Team.objects.create(name="Dover Sherborn")
+        stderr = StringIO()
+        call_command(
+            "createcoaches", execute=True, workers=2, stdout=StringIO(), stderr=stderr
+        )
+
+        coach = get_user_model().objects.get(username="doversherborn")
+        assert coach.check_password("doversherbornpassword")
+        assert coach.is_staff and coach.has_perm("common.change_athlete")
+        assert UserAccess(coach).team_ids == {dover.id}
+        assert Coach.objects.filter(team=self.wellesley).exists()
+        assert "Created 2 coaches" in stderr.getvalue()
+
+    def test_duplicate_coach_usernames_are_skipped(self):
+        Team.objects.create(name="Dover-Sherborn")
+        Team.objects.create(name="Dover Sherborn")
+        Team.objects.create(name="Natick")
+        stderr = StringIO()
+        call_command(
+            "createcoaches", execute=True, workers=1, stdout=StringIO(), stderr=stderr
+        )
+
+        assert "doversherborn: username shared by 2 teams" in stderr.getvalue()
+        assert not get_user_model().objects.filter(username="doversherborn").exists()
+        assert get_user_model().objects.filter(username="natick").exists()
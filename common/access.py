@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from common.models import Coach
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+    from account.models import Profile
+
+
+class UserAccess:
+    """
+    What the current user may see and change, read at most once per request.
+
+    Every lookup is loaded lazily on first use and then shared by the views,
+    admins, forms and table columns handling the same request.
+    """
+
+    def __init__(self, user: Profile) -> None:
+        self.user = user
+
+    @staticmethod
+    def for_request(request: HttpRequest) -> UserAccess:
+        access = getattr(request, "_user_access", None)
+        if access is None:
+            access = request._user_access = UserAccess(request.user)
+        return access
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.user.is_superuser
+
+    @property
+    def is_coach(self) -> bool:
+        return self.user.is_authenticated and self.user.is_coach
+
+    @property
+    def is_official(self) -> bool:
+        return getattr(self.user, "is_official", False)
+
+    @cached_property
+    def team_ids(self) -> frozenset[int]:
+        """The teams the user coaches"""
+        if not self.user.is_authenticated:
+            return frozenset()
+        # Removed coaches are soft deleted, so go through the coach rows
+        return frozenset(
+            Coach.objects.filter(profile=self.user, team__deleted=False)
+            .order_by()
+            .values_list("team_id", flat=True)
+        )
+
+    @cached_property
+    def coach_request_team_ids(self) -> frozenset[int]:
+        """The teams the user has asked to coach"""
+        if not self.user.is_authenticated:
+            return frozenset()
+        return frozenset(self.user.coach_requests.all().values_list("team", flat=True))
+
+    def coaches(self, team_id: int) -> bool:
+        return team_id in self.team_ids
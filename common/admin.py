@@ -8,27 +8,41 @@ from django.utils.html import format_html
 from import_export.admin import ImportExportModelAdmin
 
 from common import utils
+from common.access import UserAccess
 from common.forms import AthleteAdminForm
 from common.models import Athlete, Coach, Meet, MeetTeam, Team
+from common.search import SearchIndex
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
 
 
 class BaseAdmin(ImportExportModelAdmin):
-    pass
+    # Search through the full-text index of the search fields, see SearchIndex
+    search_index = False
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: models.QuerySet, search_term: str
+    ) -> tuple[models.QuerySet, bool]:
+        if self.search_index:
+            results = SearchIndex.search(queryset, search_term)
+            if results is not None:
+                return results, False
+        return super().get_search_results(request, queryset, search_term)
 
 
 @admin.register(Team)
 class TeamAdmin(BaseAdmin):
     list_display = ("name",)
     search_fields = ("name",)
+    search_index = True
 
     def get_queryset(self, request: HttpRequest) -> models.QuerySet:
         qs = super().get_queryset(request)
-        if request.user.is_superuser:
+        access = UserAccess.for_request(request)
+        if access.is_superuser:
             return qs
-        return request.user.teams.all()
+        return qs.filter(id__in=access.team_ids)
 
 
 @admin.register(Meet)
@@ -36,13 +50,14 @@ class MeetAdmin(BaseAdmin):
     list_display = ("name", "start_date", "end_date", "entries_open")
     list_filter = ("start_date", "end_date")
     search_fields = ("name", "start_date", "end_date")
+    search_index = True
 
     def get_queryset(self, request: HttpRequest) -> models.QuerySet:
         qs = super().get_queryset(request)
-        if request.user.is_superuser:
+        access = UserAccess.for_request(request)
+        if access.is_superuser:
             return qs
-        teams = request.user.teams.all()
-        meet_ids = MeetTeam.objects.filter(team__in=teams).values_list(
+        meet_ids = MeetTeam.objects.filter(team_id__in=access.team_ids).values_list(
             "meet", flat=True
         )
         return Meet.objects.filter(id__in=meet_ids)
@@ -59,17 +74,19 @@ class AthleteAdmin(BaseAdmin):
     )
     list_filter = ("active",)
     search_fields = ("first_name", "last_name", "team__name", "high_school_class_of")
+    search_index = True
 
     def get_form(self, request, *args, **kwargs):
         form = super().get_form(request, *args, **kwargs)
-        form.current_user = request.user
+        form.user_access = UserAccess.for_request(request)
         return form
 
     def get_queryset(self, request: HttpRequest) -> models.QuerySet:
         qs = super().get_queryset(request)
-        if request.user.is_superuser:
+        access = UserAccess.for_request(request)
+        if access.is_superuser:
             return qs
-        return qs.filter(team__in=request.user.teams.all())
+        return qs.filter(team_id__in=access.team_ids)
 
 
 @admin.register(Coach)
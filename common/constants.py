@@ -1,10 +1,7 @@
 from __future__ import annotations
 
-import re
 from enum import StrEnum
 
-SEED_REGEX = re.compile(r"^(\d*(\.\d{0,2})?|\d+:\d{2}(\.\d{0,2})?)$")
-
 
 class Event(StrEnum):
     D_1_METER_DIVING = "1 Meter Diving"
@@ -74,3 +71,19 @@ EVENT_ORDER = [
     Event.S_100_YARD_BREASTSTROKE,
     Event.S_400_YARD_FREESTYLE_RELAY,
 ]
+
+# The models read by cached listings and counts, whose writes bump the generation
+# of their table, see common.generations
+CACHED_MODELS = ["common.Meet", "common.Team", "common.MeetTeam", "common.Coach"]
+
+# Listing counts are also invalidated whenever a row of a table they read changes
+COUNT_CACHE_TIMEOUT = 60
+# Listings with more matches than this show an estimated count
+COUNT_ESTIMATE_THRESHOLD = 10_000
+COUNT_ESTIMATE_SAMPLE_SIZE = 1_000
+
+# Cached listing results are also invalidated whenever a row of their tables changes
+LISTING_CACHE_TIMEOUT = 60 * 60
+
+# Coaches are granted their permissions through membership of this group
+COACHES_GROUP = "Coaches"
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from django import forms
 from django.core.exceptions import ValidationError
 from django.forms import Form, ModelForm
 
+from common import utils
 from common.models import Athlete
 
 
@@ -16,6 +18,24 @@ class BaseModelForm(ModelForm):
         super().__init__(*args, **kwargs)
 
 
+class SeedField(forms.CharField):
+    """A seed entered as text such as 1:01.23 and cleaned to hundredths"""
+
+    def prepare_value(self, value):
+        if isinstance(value, int):
+            return utils.format_hundredths(value)
+        return value
+
+    def to_python(self, value) -> int | None:
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return None
+        seed = utils.parse_seed(value)
+        if seed is None:
+            raise ValidationError("Seed not formatted properly")
+        return seed
+
+
 class AthleteAdminForm(BaseModelForm):
     class Meta:
         model = Athlete
@@ -23,12 +43,15 @@ class AthleteAdminForm(BaseModelForm):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        if self.current_user.is_superuser:
+        if self.user_access.is_superuser:
             return
-        self.fields["team"].queryset = self.current_user.teams.all()
+        self.fields["team"].queryset = self.fields["team"].queryset.filter(
+            id__in=self.user_access.team_ids
+        )
 
     def clean(self) -> None:
-        if not self.current_user.is_superuser and self.cleaned_data[
-            "team"
-        ] not in self.current_user.teams.all().values_list("id", flat=True):
+        team = self.cleaned_data.get("team")
+        if not self.user_access.is_superuser and (
+            team is None or not self.user_access.coaches(team.id)
+        ):
             raise ValidationError("Permission denied")
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import functools
+import time
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.cache import cache
+
+from common.constants import CACHED_MODELS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def _generation_key(table: str) -> str:
+    return f"table-generation:{table}"
+
+
+@functools.cache
+def cached_tables() -> frozenset[str]:
+    """The tables of CACHED_MODELS, the only ones whose generations are kept"""
+    return frozenset(apps.get_model(label)._meta.db_table for label in CACHED_MODELS)
+
+
+def _new_generation() -> int:
+    # Generations are never counted up from a fixed start, since a generation
+    # culled from the cache would start over and match keys cached before it
+    return time.time_ns()
+
+
+def table_generations(tables: Iterable[str]) -> dict[str, int]:
+    """
+    The current generation of each table, bumped whenever a row is saved or deleted.
+
+    Cache keys that include the generations of the tables they read are invalidated
+    by any write to those tables, see common.signals.
+    """
+    tables = sorted(set(tables))
+    keys = {table: _generation_key(table) for table in tables}
+    generations = cache.get_many(keys.values())
+    missing = [key for key in keys.values() if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_generation(), None)
+        # Another process may have added a generation first
+        generations |= cache.get_many(missing)
+    return {table: generations.get(key, 0) for table, key in keys.items()}
+
+
+def bump_table_generation(table: str) -> None:
+    # Writes to tables that nothing caches would only cost a cache write
+    if table in cached_tables():
+        cache.set(_generation_key(table), _new_generation(), None)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+import re
+import timeit
+from decimal import Decimal
+
+from django.core.management import BaseCommand
+
+from common import utils
+
+# The Decimal seed path the integer codec replaced, kept for comparison
+DECIMAL_SEED_REGEX = re.compile(r"^(\d*(\.\d{0,2})?|\d+:\d{2}(\.\d{0,2})?)$")
+
+
+def decimal_is_seed(seed: str) -> bool:
+    return DECIMAL_SEED_REGEX.match(seed) and seed != "."
+
+
+def decimal_seed_to_decimal(seed: str) -> Decimal:
+    if ":" not in seed:
+        return Decimal("0" + seed)
+    minutes, seconds = seed.split(":")
+    seconds, milliseconds = seconds.split(".")
+    seconds = str(60 * int(minutes) + int(seconds))
+    return Decimal(f"{seconds}.{milliseconds}")
+
+
+def decimal_format_seed(seed: Decimal) -> str:
+    if seed >= 60:
+        minutes = seed // 60
+        seconds = seed - 60 * minutes
+        return f"{minutes}:{seconds:05.2f}"
+    return str(seed)
+
+
+class Command(BaseCommand):
+    help = "Compare the integer seed codec with the Decimal seed path"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seeds", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        hundredths = [rng.randrange(2000, 40000) for _ in range(options["seeds"])]
+        texts = [utils.format_seed(seed) for seed in hundredths]
+        decimals = [decimal_seed_to_decimal(text) for text in texts]
+
+        cases = [
+            (
+                "parse",
+                lambda: [
+                    decimal_seed_to_decimal(text)
+                    for text in texts
+                    if decimal_is_seed(text)
+                ],
+                lambda: utils.parse_seeds(texts),
+            ),
+            (
+                "format",
+                lambda: [decimal_format_seed(seed) for seed in decimals],
+                lambda: [utils.format_seed(seed) for seed in hundredths],
+            ),
+            (
+                "sort",
+                lambda: sorted(decimals),
+                lambda: sorted(hundredths),
+            ),
+            (
+                "sum",
+                lambda: sum(decimals),
+                lambda: sum(hundredths),
+            ),
+        ]
+        self.stdout.write(f"{'':8}{'Decimal':>12}{'integer':>12}{'speedup':>10}")
+        for name, decimal_case, integer_case in cases:
+            decimal_time = min(
+                timeit.repeat(decimal_case, number=1, repeat=options["repeat"])
+            )
+            integer_time = min(
+                timeit.repeat(integer_case, number=1, repeat=options["repeat"])
+            )
+            self.stdout.write(
+                f"{name:8}{decimal_time * 1000:>10.2f}ms{integer_time * 1000:>10.2f}ms"
+                f"{decimal_time / integer_time:>9.1f}x"
+            )
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from common.search import SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index tables, run after migrate"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The search index needs SQLite with FTS5")
+        for model in SearchIndex.indexed_admins():
+            with transaction.atomic():
+                SearchIndex.rebuild(model)
+            self.stdout.write(f"{SearchIndex.table_name(model)}: rebuilt")
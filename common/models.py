@@ -5,9 +5,11 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import F, Q
+from django.utils import timezone
 
-from account.models import Profile
-from common.constants import Event
+from account.models import Group, Profile
+from common.constants import COACHES_GROUP, Event
+from common.generations import bump_table_generation
 
 
 class BaseManager(models.Manager):
@@ -21,7 +23,42 @@ class BaseModel(models.Model):
         abstract = True
 
 
-class SoftDeleteManager(BaseManager):
+class SeedField(models.PositiveIntegerField):
+    """A seed time or score stored as a whole number of hundredths"""
+
+    description = "Seed in hundredths"
+
+    def formfield(self, **kwargs):
+        from common.forms import SeedField as SeedFormField
+
+        # Skip the min_value that IntegerField passes to its form field
+        return models.Field.formfield(self, **{"form_class": SeedFormField, **kwargs})
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def delete(self) -> tuple[int, dict[str, int]]:
+        """
+        Mark the records as deleted with a single UPDATE instead of deleting them.
+
+        No signals are sent, so apart from the table generation callers keep
+        anything derived from the records in sync themselves, as with any other
+        bulk write.
+        """
+        count = self.update(deleted=True, deleted_at=timezone.now())
+        if count:
+            bump_table_generation(self.model._meta.db_table)
+        return count, {self.model._meta.label: count}
+
+    def hard_delete(self) -> int:
+        """
+        Delete the records with a single DELETE, without signals or cascades.
+
+        Only for records that no other record references.
+        """
+        return self._raw_delete(self.db)
+
+
+class SoftDeleteManager(BaseManager.from_queryset(SoftDeleteQuerySet)):
     def __init__(self, include_deleted: bool = False) -> None:
         super().__init__()
         self.include_deleted = include_deleted
@@ -35,6 +72,7 @@ class SoftDeleteManager(BaseManager):
 
 class SoftDeleteModel(BaseModel):
     deleted = models.BooleanField(default=False, editable=False)
+    deleted_at = models.DateTimeField(default=None, null=True, editable=False)
     objects = SoftDeleteManager(include_deleted=False)
     all_objects = SoftDeleteManager(include_deleted=True)
 
@@ -44,7 +82,8 @@ class SoftDeleteModel(BaseModel):
     def delete(self, *args) -> None:
         """Mark the record as deleted instead of deleting it"""
         self.deleted = True
-        self.save()
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted", "deleted_at"])
 
 
 class Meet(SoftDeleteModel):
@@ -65,6 +104,14 @@ class Meet(SoftDeleteModel):
             )
         ]
         ordering = ("start_date", "end_date", "name")
+        indexes = [
+            # Listings page through meets in this order
+            models.Index(
+                fields=["start_date", "end_date", "name"],
+                condition=Q(deleted=False),
+                name="meet_listing_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.name}"
@@ -77,6 +124,12 @@ class Team(SoftDeleteModel):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            # The unique index on name also covers deleted teams
+            models.Index(
+                fields=["name"], condition=Q(deleted=False), name="team_listing_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -96,6 +149,15 @@ class Athlete(SoftDeleteModel):
 
     class Meta:
         ordering = ("team", "first_name", "last_name")
+        indexes = [
+            # Rosters are the active athletes of a team, sorted by name. Filters on
+            # booleans are not equality terms in SQLite, so active is in the condition
+            models.Index(
+                fields=["team", "first_name", "last_name"],
+                condition=Q(deleted=False, active=True),
+                name="athlete_roster_idx",
+            )
+        ]
 
     @property
     def name(self) -> str:
@@ -119,6 +181,14 @@ class Coach(SoftDeleteModel):
     class Meta:
         verbose_name_plural = "Coaches"
         ordering = ("team", "profile")
+        indexes = [
+            # The teams a user coaches, see UserAccess and validate_request
+            models.Index(
+                fields=["profile", "team"],
+                condition=Q(deleted=False),
+                name="coach_profile_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.team} - {self.profile}"
@@ -126,17 +196,29 @@ class Coach(SoftDeleteModel):
     def save(self, *args, **kwargs) -> None:
         self.profile.is_coach = True
         self.profile.is_staff = True
-        permission_ids = Permission.objects.filter(
-            codename__in=Coach.COACH_PERMISSIONS
-        ).values_list("id", flat=True)
-        self.profile.user_permissions.add(*permission_ids)
+        self.profile.groups.add(Coach.permissions_group())
         self.profile.save()
         return super().save(*args, **kwargs)
 
+    @staticmethod
+    def permissions_group() -> Group:
+        """The group granting the coach permissions, shared by every coach"""
+        group, created = Group.objects.get_or_create(name=COACHES_GROUP)
+        if created:
+            group.permissions.set(
+                Permission.objects.filter(codename__in=Coach.COACH_PERMISSIONS)
+            )
+        return group
+
 
 class MeetTeam(SoftDeleteModel):
     meet = models.ForeignKey(Meet, on_delete=models.RESTRICT)
     team = models.ForeignKey(Team, on_delete=models.RESTRICT)
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Incremented whenever the team's entries for the meet are saved.",
+    )
 
     class Meta:
         verbose_name = "Meet Team Entry"
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import cache
+from typing import TYPE_CHECKING
+
+from django.contrib import admin
+from django.db import connection, models
+from django.db.models import F, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
+from django.utils.text import smart_split, unescape_string_literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db.models import QuerySet
+
+    from common.admin import BaseAdmin
+
+# Separates the search fields of a document so that no search word spans two fields
+FIELD_SEPARATOR = "\x1f"
+# The trigram tokenizer can only match words of at least three characters
+MIN_WORD_LENGTH = 3
+
+
+class _JoinText(Func):
+    """Join text with ||, since Concat nests a function call per argument"""
+
+    arg_joiner = " || "
+    template = "(%(expressions)s)"
+    output_field = models.TextField()
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 trigram indexes over the search fields of admins with search_index.
+
+    Each indexed model has its own index table, keyed by rowid on the primary key,
+    holding one document with the values of every search field of the admin. A
+    search matches every word as a substring of the document, like the icontains
+    lookups of ModelAdmin.get_search_results, without scanning or joining the
+    searched tables. The indexes are kept in sync by common.signals, and writers
+    that bypass signals call index_objects.
+    """
+
+    @staticmethod
+    @cache
+    def indexed_admins() -> dict[type[models.Model], BaseAdmin]:
+        return {
+            model: model_admin
+            for model, model_admin in admin.site._registry.items()
+            if getattr(model_admin, "search_index", False)
+        }
+
+    @staticmethod
+    @cache
+    def dependents() -> dict[type[models.Model], list[tuple[type, str]]]:
+        """Map each model to the indexed models and paths whose documents it is in"""
+        dependents = defaultdict(list)
+        for model, model_admin in SearchIndex.indexed_admins().items():
+            paths = set()
+            for field_path in model_admin.search_fields:
+                related_model = model
+                names = field_path.split("__")
+                for depth, name in enumerate(names[:-1], start=1):
+                    related_model = related_model._meta.get_field(name).related_model
+                    paths.add((related_model, "__".join(names[:depth])))
+            for related_model, path in paths:
+                dependents[related_model].append((model, path))
+        return dependents
+
+    @staticmethod
+    @cache
+    def indexed_fields() -> dict[type[models.Model], set[str]]:
+        """Map each model to the names of its fields that are in indexed documents"""
+        fields = defaultdict(set)
+        for model, model_admin in SearchIndex.indexed_admins().items():
+            # Soft deleted objects are dropped, since the default manager skips them
+            fields[model].add("deleted")
+            for field_path in model_admin.search_fields:
+                related_model = model
+                for name in field_path.split("__"):
+                    field = related_model._meta.get_field(name)
+                    fields[related_model].update((field.name, field.attname))
+                    related_model = field.related_model
+        return fields
+
+    @staticmethod
+    def table_name(model: type[models.Model]) -> str:
+        return f"{model._meta.db_table}_search"
+
+    @staticmethod
+    @cache
+    def index_tables() -> frozenset[str]:
+        """
+        The names of the index tables in the database.
+
+        Looked up once per process, since the tables are only created by rebuild,
+        which buildsearchindex runs on deploy before the server starts.
+        """
+        tables = [
+            SearchIndex.table_name(model) for model in SearchIndex.indexed_admins()
+        ]
+        if not tables:
+            return frozenset()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN "
+                f"({', '.join(['%s'] * len(tables))})",
+                tables,
+            )
+            return frozenset(name for name, in cursor.fetchall())
+
+    @staticmethod
+    def available_models(
+        candidates: Iterable[type[models.Model]] | None = None,
+    ) -> set[type[models.Model]]:
+        """The indexed models among the candidates whose index table exists"""
+        if connection.vendor != "sqlite":
+            return set()
+        if candidates is None:
+            candidates = SearchIndex.indexed_admins()
+        return {
+            model
+            for model in candidates
+            if model in SearchIndex.indexed_admins()
+            and SearchIndex.table_name(model) in SearchIndex.index_tables()
+        }
+
+    @staticmethod
+    def rebuild(model: type[models.Model]) -> None:
+        table = connection.ops.quote_name(SearchIndex.table_name(model))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5(content, tokenize='trigram')"
+            )
+        SearchIndex.index_tables.cache_clear()
+        SearchIndex._index(model, model._base_manager.all())
+
+    @staticmethod
+    def index_objects(ids_by_model: dict[type[models.Model], Iterable[int]]) -> None:
+        """Reindex the given objects, dropping the ones that no longer match"""
+        available = SearchIndex.available_models(ids_by_model)
+        for model in available:
+            SearchIndex._index(
+                model, model._base_manager.filter(pk__in=list(ids_by_model[model]))
+            )
+
+    @staticmethod
+    def update(
+        instance: models.Model, update_fields: Iterable[str] | None = None
+    ) -> None:
+        """
+        Reindex a saved or deleted instance and the documents that include it.
+
+        Saves of only update_fields that are in no document, such as the last login
+        of a profile, leave the index as it is.
+        """
+        model = type(instance)
+        if update_fields is not None:
+            fields = SearchIndex.indexed_fields().get(model, set())
+            if fields.isdisjoint(update_fields):
+                return
+        targets = [(model, Q(pk=instance.pk))]
+        targets.extend(
+            (dependent, Q(**{path: instance.pk}))
+            for dependent, path in SearchIndex.dependents().get(model, [])
+        )
+        targets = [
+            target for target in targets if target[0] in SearchIndex.indexed_admins()
+        ]
+        if not targets:
+            return
+        available = SearchIndex.available_models(model for model, _ in targets)
+        for target_model, condition in targets:
+            if target_model in available:
+                SearchIndex._index(
+                    target_model, target_model._base_manager.filter(condition)
+                )
+
+    @staticmethod
+    def search(queryset: QuerySet, search_term: str) -> QuerySet | None:
+        """
+        Filter the queryset to the objects matching every word of the search term.
+
+        Returns None if the term cannot be searched in the index, either because
+        the model has no index table or a word is too short for trigrams.
+        """
+        words = []
+        for word in smart_split(search_term):
+            if word.startswith(('"', "'")) and word[0] == word[-1]:
+                word = unescape_string_literal(word)
+            if len(word) < MIN_WORD_LENGTH:
+                return None
+            words.append(word)
+        if not words or queryset.model not in SearchIndex.available_models(
+            [queryset.model]
+        ):
+            return None
+
+        table = connection.ops.quote_name(SearchIndex.table_name(queryset.model))
+        query = " AND ".join('"' + word.replace('"', '""') + '"' for word in words)
+        return queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [query])
+        )
+
+    @staticmethod
+    def _index(model: type[models.Model], objects: QuerySet) -> None:
+        table = connection.ops.quote_name(SearchIndex.table_name(model))
+        ids_sql, ids_params = objects.order_by().values("pk").query.sql_with_params()
+        documents_sql, documents_params = (
+            model._default_manager.filter(pk__in=objects.order_by().values("pk"))
+            .order_by()
+            .annotate(search_document=SearchIndex._document(model))
+            .values_list("pk", "search_document")
+            .query.sql_with_params()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE rowid IN ({ids_sql})", ids_params
+            )
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, content) {documents_sql}",
+                documents_params,
+            )
+
+    @staticmethod
+    def _document(model: type[models.Model]) -> models.Expression:
+        values = []
+        for field_path in SearchIndex.indexed_admins()[model].search_fields:
+            if values:
+                values.append(Value(FIELD_SEPARATOR, models.TextField()))
+            values.append(
+                Coalesce(
+                    Cast(F(field_path), models.TextField()),
+                    Value("", models.TextField()),
+                )
+            )
+        return _JoinText(*values)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.generations import bump_table_generation
+from common.search import SearchIndex
+
+
+# Bulk writes and queryset updates do not send these signals, so anything cached
+# against table generations must also expire on its own. Only the tables of
+# CACHED_MODELS have generations.
+@receiver(post_save)
+@receiver(post_delete)
+def bump_generation(sender, **kwargs) -> None:
+    bump_table_generation(sender._meta.db_table)
+
+
+# Soft deletes are saves, and drop the object from the index since the default
+# manager no longer returns it
+@receiver(post_save)
+@receiver(post_delete)
+def update_search_index(sender, instance, update_fields=None, **kwargs) -> None:
+    SearchIndex.update(instance, update_fields)
@@ -1,13 +1,61 @@
 window.addEventListener("DOMContentLoaded", function() {
-  const urlParams = new URLSearchParams(window.location.search);
-  const query = urlParams.get("q");
-  if (!query || !query.trim()) {
-    return;
-  }
-  document.querySelectorAll("#page-links a").forEach(element => {
+  const results = document.getElementById("search-results");
+  const searchForm = document.getElementById("search-form");
+
+  function pageUrl(element) {
     const urlParams = new URLSearchParams(window.location.search);
-    urlParams.set("page", element.dataset.page);
-    const url = `${window.location.origin}${window.location.pathname}?${urlParams.toString()}`;
-    element.href = url;
+    if (element.dataset.cursor) {
+      urlParams.set("cursor", element.dataset.cursor);
+      urlParams.delete("page");
+    } else {
+      urlParams.set("page", element.dataset.page);
+      urlParams.delete("cursor");
+    }
+    return `${window.location.pathname}?${urlParams.toString()}`;
+  }
+
+  function rewritePageLinks() {
+    results.querySelectorAll("#page-links a").forEach(element => {
+      element.href = pageUrl(element);
+    });
+  }
+
+  // Swap in the table and pagination only, falling back to a full page load
+  function load(url, push) {
+    const partialUrl = new URL(url, window.location.origin);
+    partialUrl.searchParams.set("partial", "html");
+    fetch(partialUrl).then(response => {
+      return response.ok ? response.text() : Promise.reject(response);
+    }).then(html => {
+      if (push) {
+        history.pushState(null, "", url);
+      }
+      results.innerHTML = html;
+      rewritePageLinks();
+    }).catch(error => {
+      console.warn(error);
+      window.location.assign(url);
+    });
+  }
+
+  rewritePageLinks();
+
+  results.addEventListener("click", event => {
+    const link = event.target.closest("#page-links a");
+    if (!link || event.ctrlKey || event.metaKey || event.shiftKey) {
+      return;
+    }
+    event.preventDefault();
+    load(link.href, true);
   });
-}, false);
\ No newline at end of file
+
+  if (searchForm) {
+    searchForm.addEventListener("submit", event => {
+      event.preventDefault();
+      const urlParams = new URLSearchParams(new FormData(searchForm));
+      load(`${window.location.pathname}?${urlParams.toString()}`, true);
+    });
+  }
+
+  window.addEventListener("popstate", () => load(window.location.href, false));
+}, false);
@@ -2,12 +2,19 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from django.db.models import Count
 from django.middleware import csrf
 
+from common.access import UserAccess
+from common.models import Team
 from common.tables.paginator import TableColumn
 
 if TYPE_CHECKING:
-    from common.models import Meet, Team
+    from collections.abc import Callable
+
+    from django.db.models import QuerySet
+
+    from common.models import Meet
     from registration.models import CoachRequest
 
 
@@ -19,18 +26,23 @@ def _process_coach_request_builder(coach_request: CoachRequest, context: dict) -
             <form action="{request.build_absolute_uri()}" method="post" name="{approve}">
                 <input type="hidden" name="csrfmiddlewaretoken" value="{csrf.get_token(request)}">
                 <input type="submit" class="btn {'btn-success' if approve else 'btn-danger'}" value="{'Approve' if approve else 'Deny'}">
-                <input type="hidden" name="team_id" value="{coach_request.team.id}">
-                <input type="hidden" name="profile_id" value="{coach_request.profile.id}">
+                <input type="hidden" name="team_id" value="{coach_request.team_id}">
+                <input type="hidden" name="profile_id" value="{coach_request.profile_id}">
                 <input type="hidden" name="approve" value="{approve}">
             </form>
         </div"""
 
 
+def _entries_prepare(objects: list[Any], context: dict) -> dict:
+    """Find which of the objects on the page have editable entries"""
+    ids = [obj.id for obj in objects]
+    return {"editable_ids": set(context["filter_editable_ids"](ids))}
+
+
 def _entries_builder(obj: Any, context: dict) -> str:
-    editable_ids = context["editable_ids"]
-    if obj.id not in editable_ids:
+    if obj.id not in context["editable_ids"]:
         return ""
-    meet_team_ids = context["meet_team_ids_map"][obj.id]
+    meet_team_ids = context["meet_team_ids"](obj)
     return f"""
         <div class="position-relative text-center">
             <a href="/registration/entries/meet/{meet_team_ids[0]}/team/{meet_team_ids[1]}/edit" class="btn btn-secondary link-light stretched-link text-decoration-none">
@@ -48,24 +60,49 @@ def _registered_meets_builder(team: Team) -> str:
         </div"""
 
 
-def _registered_teams_builder(meet: Meet) -> str:
+def _registered_teams_prepare(meets: list[Meet], context: dict) -> dict:
+    team_counts = (
+        Team.objects.filter(meets__id__in=[meet.id for meet in meets])
+        .values_list("meets__id")
+        .annotate(Count("id"))
+    )
+    return {"team_counts": dict(team_counts)}
+
+
+def _registered_teams_builder(meet: Meet, context: dict) -> str:
     return f"""
         <div class="position-relative text-center">
             <a href="/meet/{ meet.id }/teams" class="btn btn-secondary link-light stretched-link text-decoration-none">
-                View Registered Teams ({meet.teams.all().count()})
+                View Registered Teams ({context["team_counts"].get(meet.id, 0)})
             </a>
         </div"""
 
 
+def _sheets_builder(meet: Meet) -> str:
+    return f"""
+        <div class="text-center">
+            <a href="/registration/entries/meet/{meet.id}/sheets/psych" class="btn btn-sm btn-secondary link-light text-decoration-none">Psych Sheet</a>
+            <a href="/registration/entries/meet/{meet.id}/sheets/heat" class="btn btn-sm btn-secondary link-light text-decoration-none">Heat Sheet</a>
+        </div"""
+
+
+def _team_coach_status_prepare(teams: list[Team], context: dict) -> dict:
+    access = UserAccess.for_request(context["request"])
+    return {
+        "joined_team_ids": access.team_ids,
+        "requested_team_ids": access.coach_request_team_ids,
+    }
+
+
 def _team_coach_status_builder(team: Team, context: dict) -> str:
     request = context["request"]
     button_class = "btn-success"
     button_text = "Join Team"
     disabled = False
-    if team in request.user.teams.all():
+    if team.id in context["joined_team_ids"]:
         disabled = True
         button_text = "Joined"
-    if team.id in request.user.coach_requests.all().values_list("team", flat=True):
+    if team.id in context["requested_team_ids"]:
         button_class = "btn-danger"
         button_text = "Requested"
     return f"""
@@ -78,21 +115,34 @@ def _team_coach_status_builder(team: Team, context: dict) -> str:
         </div"""
 
 
+def _select_related(field: str) -> Callable[[QuerySet], QuerySet]:
+    return lambda objects: objects.select_related(field)
+
+
 class Column:
     END_DATE = TableColumn("End Date", field="end_date")
-    ENTRIES = TableColumn("Entries", builder=_entries_builder)
-    MEET = TableColumn("Meet", field="meet")
+    # Context: filter_editable_ids, called once with the ids of the objects on the
+    # page, and meet_team_ids, mapping an object to its (meet id, team id)
+    ENTRIES = TableColumn("Entries", builder=_entries_builder, prepare=_entries_prepare)
+    MEET = TableColumn("Meet", field="meet", prepare_queryset=_select_related("meet"))
     NAME = TableColumn("Name", field="name")
     PROCESS_COACH_REQUEST = TableColumn("", builder=_process_coach_request_builder)
-    PROFILE = TableColumn("Profile", field="profile")
+    PROFILE = TableColumn(
+        "Profile", field="profile", prepare_queryset=_select_related("profile")
+    )
     REGISTERED_MEETS = TableColumn(
         "Registered Meets", builder=_registered_meets_builder
     )
     REGISTERED_TEAMS = TableColumn(
-        "Registered Teams", builder=_registered_teams_builder
+        "Registered Teams",
+        builder=_registered_teams_builder,
+        prepare=_registered_teams_prepare,
     )
+    SHEETS = TableColumn("Sheets", builder=_sheets_builder)
     START_DATE = TableColumn("Start Date", field="start_date")
-    TEAM = TableColumn("Team", field="team")
+    TEAM = TableColumn("Team", field="team", prepare_queryset=_select_related("team"))
     TEAM_COACH_STATUS = TableColumn(
-        "Join Team Request", builder=_team_coach_status_builder
+        "Join Team Request",
+        builder=_team_coach_status_builder,
+        prepare=_team_coach_status_prepare,
     )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.core.cache import cache
+
+from common.constants import (
+    COUNT_CACHE_TIMEOUT,
+    COUNT_ESTIMATE_SAMPLE_SIZE,
+    COUNT_ESTIMATE_THRESHOLD,
+)
+from common.generations import cached_tables, table_generations
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class CountProvider:
+    """
+    Count the rows of a listing for its paginator.
+
+    Counts are cached per query, whose SQL holds the model, search term and user
+    scope, together with the generations of every table the query reads, as long
+    as they are all tables of CACHED_MODELS. Above
+    COUNT_ESTIMATE_THRESHOLD matches the count is estimated from the share of a
+    sample of the table that matches, so the full search is never counted.
+    """
+
+    def __init__(
+        self,
+        timeout: int = COUNT_CACHE_TIMEOUT,
+        threshold: int | None = COUNT_ESTIMATE_THRESHOLD,
+        sample_size: int = COUNT_ESTIMATE_SAMPLE_SIZE,
+    ) -> None:
+        self.timeout = timeout
+        self.threshold = threshold
+        self.sample_size = sample_size
+        self.estimated = False
+
+    def count(self, objects: QuerySet) -> int:
+        sql = str(objects.query)
+        tables = [
+            model._meta.db_table
+            for model in apps.get_models()
+            if f'"{model._meta.db_table}"' in sql
+        ]
+        if not cached_tables().issuperset(tables):
+            # Writes to the other tables would not expire the count
+            count, self.estimated = self._count(objects)
+            return count
+        generations = ",".join(
+            f"{table}:{generation}"
+            for table, generation in table_generations(tables).items()
+        )
+        digest = hashlib.sha256(f"{generations}|{sql}".encode()).hexdigest()
+        key = f"table-count:{objects.model._meta.label_lower}:{digest}"
+
+        cached = cache.get(key)
+        if cached is None:
+            cached = self._count(objects)
+            cache.set(key, cached, self.timeout)
+        count, self.estimated = cached
+        return count
+
+    def _count(self, objects: QuerySet) -> tuple[int, bool]:
+        if self.threshold is None:
+            return objects.count(), False
+        # Counting a sliced clone stops reading rows past the threshold, even when
+        # the queryset itself was already evaluated
+        count = objects.all()[: self.threshold + 1].count()
+        if count <= self.threshold:
+            return count, False
+        return max(count, self._estimate(objects)), True
+
+    def _estimate(self, objects: QuerySet) -> int:
+        manager = objects.model._default_manager
+        total = manager.count()
+        sample = manager.order_by("pk").values("pk")[: self.sample_size]
+        matches = objects.filter(pk__in=sample).count()
+        return total * matches // min(total, self.sample_size)
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from collections.abc import Sequence
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from django.contrib import admin
+from django.core import signing
+from django.core.cache import cache
 from django.core.paginator import EmptyPage, Page, Paginator
-from django.db.models import QuerySet
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
 
 from common import utils
+from common.access import UserAccess
 from common.admin import BaseAdmin
+from common.constants import LISTING_CACHE_TIMEOUT
+from common.generations import table_generations
 from common.models import BaseModel
+from common.tables.counts import CountProvider
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
@@ -21,6 +34,8 @@ M = TypeVar("M", bound=BaseModel)
 
 
 class PaginatedSearchRenderer:
+    RESULTS_TEMPLATE = "paginated-search-results.html"
+
     def __init__(
         self,
         request: HttpRequest,
@@ -30,27 +45,128 @@ class PaginatedSearchRenderer:
         columns: list[TableColumn],
         template: str = "paginated-search-base.html",
         per_page: int = 15,
+        keyset: bool = False,
+        count_provider: CountProvider | None = None,
+        cache_models: list[type[BaseModel]] | None = None,
     ) -> None:
         self.request = request
+        self.model_type = model_type
+        self.admin_type = admin_type
         self.table_header = table_header
         self.columns = columns
         self.template = template
         self.per_page = per_page
+        self.keyset = keyset
+        self.count_provider = count_provider or CountProvider()
+        self.cache_models = cache_models
         self.search_term = request.GET.get("q", "").strip()
         self.page_number = utils.as_int(request.GET.get("page"), 1)
-        self.objects = self._get_objects(model_type, admin_type)
+        self.cursor = request.GET.get("cursor", "")
+
+    @cached_property
+    def objects(self) -> QuerySet[M]:
+        """The listed objects, which views may replace before rendering"""
+        return self._get_objects(self.model_type, self.admin_type)
 
     def render(self):
+        """
+        Render the listing page, or only its results when paginated-search.js asks.
+
+        With ?partial=html only the table and pagination are rendered, and with
+        ?partial=json the rows and pagination are returned as data. If cache_models
+        is given, the results are cached until one of those tables changes.
+        """
+        partial = self.request.GET.get("partial")
+        if partial == "json":
+            return JsonResponse(
+                self._cached(
+                    "json", lambda: self._get_page_data(self._get_model_page())
+                )
+            )
+        if self.cache_models is None:
+            return render(
+                self.request,
+                self.RESULTS_TEMPLATE if partial == "html" else self.template,
+                {
+                    "table_header": self.table_header,
+                    "search_term": self.search_term,
+                    "page": self._get_model_page(),
+                },
+            )
+
+        results = self._cached(
+            "html",
+            lambda: render_to_string(
+                self.RESULTS_TEMPLATE, {"page": self._get_model_page()}, self.request
+            ),
+        )
+        if partial == "html":
+            return HttpResponse(results)
         return render(
             self.request,
             self.template,
             {
                 "table_header": self.table_header,
                 "search_term": self.search_term,
-                "page": self._get_model_page(),
+                "results": results,
             },
         )
 
+    def _cached(self, kind: str, build: Callable[[], Any]) -> Any:
+        if self.cache_models is None:
+            return build()
+        generations = table_generations(
+            model._meta.db_table for model in self.cache_models
+        )
+        params = [self.search_term, self.page_number, self.cursor]
+        digest = hashlib.sha256(json.dumps([generations, params]).encode()).hexdigest()
+        key = (
+            f"listing:{kind}:{self.request.path}:"
+            f"{PaginatedSearchRenderer._auth_bucket(self.request)}:{digest}"
+        )
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache.set(key, value, LISTING_CACHE_TIMEOUT)
+        return value
+
+    @staticmethod
+    def _auth_bucket(request: HttpRequest) -> str:
+        """Group users who are shown the same results, coaches each see their own"""
+        access = UserAccess.for_request(request)
+        if access.is_coach:
+            return f"coach:{access.user.id}"
+        if access.is_superuser:
+            return "superuser"
+        if access.is_official:
+            return "official"
+        if access.user.is_authenticated:
+            return "user"
+        return "anonymous"
+
+    @staticmethod
+    def _get_page_data(page: WrappedPage) -> dict:
+        if getattr(page, "is_keyset", False):
+            pagination = {
+                "previous_cursor": (
+                    page.previous_cursor if page.has_previous() else None
+                ),
+                "next_cursor": page.next_cursor if page.has_next() else None,
+            }
+        else:
+            pagination = {
+                "number": page.number,
+                "pages": [
+                    None if number == page.paginator.ELLIPSIS else number
+                    for number in page.adjusted_elided_pages
+                ],
+            }
+        return {
+            "headers": list(page.column_headers),
+            "rows": [list(row) for row in page],
+            "pagination": pagination,
+        }
+
     def _get_objects(
         self,
         model_type: type[M],
@@ -65,7 +181,16 @@ class PaginatedSearchRenderer:
         return objects
 
     def _get_model_page(self) -> WrappedPage[M]:
-        paginator = Paginator(self.objects, per_page=self.per_page)
+        objects = self.objects
+        for column in self.columns:
+            if column.prepare_queryset is not None:
+                objects = column.prepare_queryset(objects)
+        if self.keyset:
+            return WrappedPage(
+                KeysetPage(objects, self.per_page, self.cursor), self.columns
+            )
+        paginator = Paginator(objects, per_page=self.per_page)
+        paginator.count = self.count_provider.count(self.objects)
         page = paginator.get_page(self.page_number)
         try:
             page.adjusted_elided_pages = list(
@@ -78,6 +203,157 @@ class PaginatedSearchRenderer:
         return WrappedPage(page, self.columns)
 
 
+class KeysetPage(Sequence):
+    """
+    A page read by seeking past the last row of the previous page.
+
+    Rows are ordered by the queryset ordering, or the model's Meta.ordering, with
+    relations followed to their own ordering and the primary key as a tiebreak.
+    The next and previous pages are found with a range filter on those keys
+    rather than an OFFSET and nothing is counted, so every page costs the same.
+    """
+
+    CURSOR_SALT = "common.tables.paginator.KeysetPage"
+    # Numbered page links are not available without counting every row
+    adjusted_elided_pages = []
+    is_keyset = True
+
+    def __init__(self, objects: QuerySet, per_page: int, cursor: str = "") -> None:
+        keys = KeysetPage.ordering_keys(objects)
+        direction, values = KeysetPage._decode_cursor(cursor, len(keys))
+        backwards = direction == "previous"
+        if backwards:
+            keys = [(path, not descending) for path, descending in keys]
+
+        objects = objects.annotate(
+            **{f"_keyset_{index}": F(path) for index, (path, _) in enumerate(keys)}
+        ).order_by(
+            *(KeysetPage._order_by(path, descending) for path, descending in keys)
+        )
+        if values is not None:
+            objects = objects.filter(KeysetPage._after(keys, values))
+
+        rows = list(objects[: per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if backwards:
+            rows.reverse()
+        self.object_list = rows
+        self.number = None
+        self.has_previous_page = values is not None and (has_more or not backwards)
+        self.has_next_page = has_more if not backwards else values is not None
+        self.previous_cursor = self._cursor("previous", rows[0] if rows else None, keys)
+        self.next_cursor = self._cursor("next", rows[-1] if rows else None, keys)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.has_next_page
+
+    def has_previous(self) -> bool:
+        return self.has_previous_page
+
+    def has_other_pages(self) -> bool:
+        return self.has_next_page or self.has_previous_page
+
+    @staticmethod
+    def ordering_keys(objects: QuerySet) -> list[tuple[str, bool]]:
+        """The (lookup path, descending) keys that order the queryset uniquely"""
+        ordering = objects.query.order_by or objects.model._meta.ordering
+        keys = []
+        for name in ordering:
+            keys.extend(KeysetPage._expand_ordering(objects.model, name))
+        return keys + [("pk", False)]
+
+    @staticmethod
+    def _expand_ordering(model, name: str, prefix: str = "", descending=False):
+        if not isinstance(name, str):
+            raise ValueError("Keyset pages only support ordering by field names")
+        if name.startswith("-"):
+            name = name[1:]
+            descending = not descending
+        if name == "pk" or "__" in name:
+            return [(f"{prefix}{name}", descending)]
+        field = model._meta.get_field(name)
+        if not (field.many_to_one or field.one_to_one):
+            return [(f"{prefix}{name}", descending)]
+        related_ordering = field.related_model._meta.ordering
+        if not related_ordering:
+            return [(f"{prefix}{name}__pk", descending)]
+        keys = []
+        for related_name in related_ordering:
+            keys.extend(
+                KeysetPage._expand_ordering(
+                    field.related_model, related_name, f"{prefix}{name}__", descending
+                )
+            )
+        return keys
+
+    @staticmethod
+    def _order_by(path: str, descending: bool):
+        # NULLs sort first ascending and last descending on every database
+        if descending:
+            return F(path).desc(nulls_last=True)
+        return F(path).asc(nulls_first=True)
+
+    @staticmethod
+    def _after(keys: list[tuple[str, bool]], values: list) -> Q:
+        """Match the rows ordered after the given key values"""
+        after = Q(pk__in=[])
+        equal = Q()
+        for (path, descending), value in zip(keys, values):
+            if value is None:
+                if not descending:
+                    after |= equal & Q(**{f"{path}__isnull": False})
+                equal &= Q(**{f"{path}__isnull": True})
+            else:
+                lookup = "lt" if descending else "gt"
+                after |= equal & Q(**{f"{path}__{lookup}": value})
+                if descending:
+                    after |= equal & Q(**{f"{path}__isnull": True})
+                equal &= Q(**{path: value})
+        return after
+
+    @staticmethod
+    def _cursor(direction: str, row: Any, keys: list[tuple[str, bool]]) -> str:
+        if row is None:
+            return ""
+        return signing.dumps(
+            {
+                "direction": direction,
+                "values": [
+                    getattr(row, f"_keyset_{index}") for index in range(len(keys))
+                ],
+            },
+            salt=KeysetPage.CURSOR_SALT,
+            serializer=_CursorSerializer,
+            compress=True,
+        )
+
+    @staticmethod
+    def _decode_cursor(cursor: str, key_count: int) -> tuple[str, list | None]:
+        if not cursor:
+            return "next", None
+        try:
+            data = signing.loads(
+                cursor, salt=KeysetPage.CURSOR_SALT, serializer=_CursorSerializer
+            )
+        except signing.BadSignature:
+            return "next", None
+        if len(data["values"]) != key_count:
+            return "next", None
+        return data["direction"], data["values"]
+
+
+class _CursorSerializer(signing.JSONSerializer):
+    def dumps(self, obj: Any) -> bytes:
+        return DjangoJSONEncoder(separators=(",", ":")).encode(obj).encode("latin-1")
+
+
 class WrappedPage:
     def __init__(self, page: Page, columns: list[TableColumn]) -> None:
         self.page = page
@@ -87,29 +363,53 @@ class WrappedPage:
     def column_headers(self) -> Iterator[str]:
         return (column.header for column in self.columns)
 
+    @cached_property
+    def column_contexts(self) -> list[dict | None]:
+        """The context of each column, prepared once for the objects on the page"""
+        objects = list(self.page)
+        return [column.prepare_page(objects) for column in self.columns]
+
     def __getattr__(self, key: Any):
         return self.page.__getattribute__(key)
 
     def __getitem__(self, index: Any) -> WrappedObject:
-        return WrappedObject(self.page.__getitem__(index), self.columns)
+        return WrappedObject(
+            self.page.__getitem__(index), self.columns, self.column_contexts
+        )
 
     def __len__(self) -> int:
         return len(self.page.object_list)
 
 
 class WrappedObject:
-    def __init__(self, obj: BaseModel, columns: list[TableColumn]) -> None:
+    def __init__(
+        self,
+        obj: BaseModel,
+        columns: list[TableColumn],
+        contexts: list[dict | None],
+    ) -> None:
         self.obj = obj
         self.columns = columns
+        self.contexts = contexts
 
     def __getitem__(self, index: Any) -> Any:
-        return self.columns[index].value_of(self.obj)
+        return self.columns[index].value_of(self.obj, self.contexts[index])
 
     def __len__(self) -> int:
         return len(self.columns)
 
 
 class TableColumn:
+    """
+    A column of a paginated table, rendered from a field or a builder.
+
+    Builders that need more than the row itself can avoid a query per row with
+    two optional batch hooks. prepare_queryset adds select_related, annotations
+    and the like to the listing before it is paged, and prepare returns lookups
+    read once for every object on the page, which are merged into the context
+    passed to the builder.
+    """
+
     def __init__(
         self,
         header: str,
@@ -119,6 +419,8 @@ class TableColumn:
         | Callable[[BaseModel, dict], str]
         | None = None,
         context: dict | None = None,
+        prepare_queryset: Callable[[QuerySet], QuerySet] | None = None,
+        prepare: Callable[[list[BaseModel], dict], dict] | None = None,
     ) -> None:
         self.header = header
         if field is None and builder is None:
@@ -126,20 +428,38 @@ class TableColumn:
         self.field = field
         self.builder = builder
         self.context = context
+        self.prepare_queryset = prepare_queryset
+        self.prepare = prepare
 
     def with_context(self, context: dict) -> TableColumn:
         return TableColumn(
-            self.header, field=self.field, builder=self.builder, context=context
+            self.header,
+            field=self.field,
+            builder=self.builder,
+            context=context,
+            prepare_queryset=self.prepare_queryset,
+            prepare=self.prepare,
         )
 
     def with_header(self, header: str) -> TableColumn:
         return TableColumn(
-            header, field=self.field, builder=self.builder, context=self.context
+            header,
+            field=self.field,
+            builder=self.builder,
+            context=self.context,
+            prepare_queryset=self.prepare_queryset,
+            prepare=self.prepare,
         )
 
-    def value_of(self, obj: BaseModel) -> str:
+    def prepare_page(self, objects: list[BaseModel]) -> dict | None:
+        if self.prepare is None:
+            return self.context
+        context = self.context or {}
+        return {**context, **self.prepare(objects, context)}
+
+    def value_of(self, obj: BaseModel, context: dict | None = None) -> str:
         if self.field:
             return str(getattr(obj, self.field))
-        if self.context is None:
+        if context is None:
             return self.builder(obj)
-        return self.builder(obj, self.context)
+        return self.builder(obj, context)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from common.models import Athlete, Meet, Team
+from common.tables.counts import CountProvider
+
+
+class CountProviderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(5):
+            Meet.objects.create(name=f"Meet {index}")
+
+    def test_count_is_cached(self):
+        provider = CountProvider()
+        assert provider.count(Meet.objects.all()) == 5
+        with self.assertNumQueries(0):
+            assert provider.count(Meet.objects.all()) == 5
+        assert provider.count(Meet.objects.filter(name__icontains="1")) == 1
+
+    def test_save_and_delete_invalidate_count(self):
+        provider = CountProvider()
+        assert provider.count(Meet.objects.all()) == 5
+        meet = Meet.objects.create(name="Meet 5")
+        assert provider.count(Meet.objects.all()) == 6
+        meet.delete()
+        assert provider.count(Meet.objects.all()) == 5
+
+    def test_joined_table_writes_invalidate_count(self):
+        provider = CountProvider()
+        team = Team.objects.create(name="Team")
+        objects = Athlete.objects.filter(team__name__icontains="Swim")
+        assert provider.count(objects) == 0
+        Athlete.objects.create(team=team, first_name="First", last_name="Last")
+        team.name = "Swim Team"
+        team.save()
+        assert provider.count(objects) == 1
+
+    def test_culled_generation_does_not_match_old_counts(self):
+        provider = CountProvider()
+        assert provider.count(Meet.objects.all()) == 5
+        Meet.objects.create(name="Meet 5")
+        cache.delete(f"table-generation:{Meet._meta.db_table}")
+        assert provider.count(Meet.objects.all()) == 6
+
+    def test_only_cached_models_have_generations(self):
+        team = Team.objects.create(name="Team")
+        Athlete.objects.create(team=team, first_name="First", last_name="Last")
+        assert cache.get(f"table-generation:{Team._meta.db_table}") is not None
+        assert cache.get(f"table-generation:{Athlete._meta.db_table}") is None
+
+    def test_large_counts_are_estimated(self):
+        provider = CountProvider(threshold=10, sample_size=20)
+        team = Team.objects.create(name="Team")
+        Athlete.objects.bulk_create(
+            Athlete(team=team, first_name=f"{index % 2}", last_name="Last")
+            for index in range(100)
+        )
+        assert provider.count(Athlete.objects.filter(first_name="0")) == 50
+        assert provider.estimated
+        assert provider.count(Athlete.objects.filter(first_name="0")[:5]) == 5
+        assert not provider.estimated
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.models import Athlete, Meet, Team
+from common.tables.paginator import KeysetPage
+
+
+def read_all_pages(objects, per_page: int) -> list[list[int]]:
+    pages = []
+    cursor = ""
+    while True:
+        page = KeysetPage(objects, per_page, cursor)
+        pages.append([row.id for row in page])
+        if not page.has_next():
+            return pages
+        cursor = page.next_cursor
+
+
+class KeysetPageTest(TestCase):
+    def setUp(self):
+        start = datetime.date(2024, 1, 1)
+        for index in range(11):
+            start_date = (
+                None if index % 4 == 0 else start + datetime.timedelta(index % 3)
+            )
+            Meet.objects.create(name=f"Meet {index:02}", start_date=start_date)
+
+    def test_ordering_keys_follow_relations(self):
+        assert KeysetPage.ordering_keys(Meet.objects.all()) == [
+            ("start_date", False),
+            ("end_date", False),
+            ("name", False),
+            ("pk", False),
+        ]
+        assert KeysetPage.ordering_keys(Athlete.objects.all()) == [
+            ("team__name", False),
+            ("first_name", False),
+            ("last_name", False),
+            ("pk", False),
+        ]
+        assert KeysetPage.ordering_keys(Meet.objects.order_by("-name")) == [
+            ("name", True),
+            ("pk", False),
+        ]
+
+    def test_pages_match_offset_pagination(self):
+        # Keyset pages break ties on the primary key
+        for objects, ordering in (
+            (Meet.objects.all(), Meet._meta.ordering),
+            (Meet.objects.order_by("-start_date"), ["-start_date"]),
+        ):
+            expected = list(
+                objects.order_by(*ordering, "pk").values_list("id", flat=True)
+            )
+            pages = read_all_pages(objects, 3)
+            assert [len(page) for page in pages] == [3, 3, 3, 2]
+            assert [id for page in pages for id in page] == expected
+
+    def test_previous_pages(self):
+        objects = Meet.objects.all()
+        pages = read_all_pages(objects, 3)
+        page = KeysetPage(objects, 3)
+        for _ in range(len(pages) - 1):
+            page = KeysetPage(objects, 3, page.next_cursor)
+        assert not page.has_next()
+
+        for expected in reversed(pages[:-1]):
+            page = KeysetPage(objects, 3, page.previous_cursor)
+            assert [row.id for row in page] == expected
+            assert page.has_next()
+        assert not page.has_previous()
+
+    def test_invalid_cursor_reads_first_page(self):
+        page = KeysetPage(Meet.objects.all(), 3, "not-a-cursor")
+        assert [row.id for row in page] == read_all_pages(Meet.objects.all(), 3)[0]
+        assert not page.has_previous()
+
+    def test_page_does_not_count_or_offset(self):
+        team = Team.objects.create(name="Team")
+        Athlete.objects.bulk_create(
+            Athlete(team=team, first_name=f"First {index}", last_name="Last")
+            for index in range(50)
+        )
+        cursor = KeysetPage(Athlete.objects.all(), 15).next_cursor
+        with CaptureQueriesContext(connection) as context:
+            page = KeysetPage(Athlete.objects.all(), 15, cursor)
+        assert len(page) == 15
+        assert len(context.captured_queries) == 1
+        sql = context.captured_queries[0]["sql"]
+        assert "COUNT" not in sql
+        assert "OFFSET" not in sql
+
+
+class PartialResultsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(20):
+            Team.objects.create(name=f"Team {index:02}")
+
+    def test_html_partial_renders_only_results(self):
+        response = self.client.get(reverse("all teams") + "?page=2&partial=html")
+        content = response.content.decode()
+        assert "<html" not in content
+        assert 'id="page-links"' in content
+        assert "Team 15" in content
+        assert "Team 14" not in content
+
+    def test_json_partial_returns_rows(self):
+        response = self.client.get(reverse("all teams") + "?page=2&partial=json")
+        data = response.json()
+        assert data["headers"] == ["Name", "Registered Meets"]
+        assert [row[0] for row in data["rows"]] == [
+            f"Team {index}" for index in range(15, 20)
+        ]
+        assert data["pagination"] == {"number": 2, "pages": [1, 2]}
+
+    def test_json_partial_returns_cursors(self):
+        Meet.objects.create(name="Meet")
+        data = self.client.get(reverse("all meets") + "?partial=json").json()
+        assert data["pagination"] == {"previous_cursor": None, "next_cursor": None}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+
+from common.access import UserAccess
+from common.admin import BaseAdmin
+from common.models import Athlete, Coach, Team
+from common.testing import full_table_scans, indexes_used
+from registration.models import CoachRequest
+
+
+class UserAccessTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.needham = Team.objects.create(name="Needham")
+        cls.wellesley = Team.objects.create(name="Wellesley")
+        cls.coach = get_user_model().objects.create_user(username="coach")
+        Coach.objects.create(team=cls.needham, profile=cls.coach)
+        CoachRequest.objects.create(team=cls.wellesley, profile=cls.coach)
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_lookups_are_read_once_per_request(self):
+        request = self.request_for(self.coach)
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                access = UserAccess.for_request(request)
+                assert access.team_ids == {self.needham.id}
+                assert access.coach_request_team_ids == {self.wellesley.id}
+                assert access.coaches(self.needham.id)
+                assert not access.coaches(self.wellesley.id)
+        assert UserAccess.for_request(self.request_for(self.coach)) is not access
+
+    def test_removed_coach_has_no_teams(self):
+        Coach.objects.filter(profile=self.coach).delete()
+        assert UserAccess(self.coach).team_ids == frozenset()
+
+    def test_teams_lookup_uses_coach_index(self):
+        assert "coach_profile_idx" in indexes_used(
+            lambda: UserAccess(self.coach).team_ids
+        )
+
+    def test_anonymous_user_has_no_teams(self):
+        with self.assertNumQueries(0):
+            access = UserAccess.for_request(self.request_for(AnonymousUser()))
+            assert not access.is_coach
+            assert access.team_ids == frozenset()
+
+    def test_athlete_admin_form_limits_teams(self):
+        request = self.request_for(self.coach)
+        form_class = admin.site._registry[Athlete].get_form(request)
+        data = {"first_name": "First", "last_name": "Last", "active": True}
+
+        form = form_class({**data, "team": self.needham.id})
+        assert list(form.fields["team"].queryset) == [self.needham]
+        assert form.is_valid(), form.errors
+        form = form_class({**data, "team": self.wellesley.id})
+        assert not form.is_valid()
+
+    def test_scoped_admin_querysets_use_indexes(self):
+        request = self.request_for(self.coach)
+        for model, model_admin in admin.site._registry.items():
+            if type(model_admin).get_queryset is BaseAdmin.get_queryset:
+                continue
+            changelist = model_admin.get_changelist_instance(request)
+            objects = changelist.get_queryset(request)
+            self.assertEqual(
+                full_table_scans(lambda: (list(objects[:100]), objects.count())),
+                [],
+                model,
+            )
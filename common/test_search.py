@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.constants import Event
+from common.models import Athlete, Meet, Team
+from common.search import SearchIndex
+from registration.models import MeetRelayEntry
+
+
+def search(model, search_term: str) -> set[int]:
+    model_admin = admin.site._registry[model]
+    request = RequestFactory().get("/")
+    results, _ = model_admin.get_search_results(
+        request, model.objects.all(), search_term
+    )
+    return set(results.values_list("id", flat=True))
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.needham = Team.objects.create(name="Needham")
+        self.wellesley = Team.objects.create(name="Wellesley")
+        self.athletes = [
+            Athlete.objects.create(team=team, first_name=first, last_name="Smith")
+            for team, first in (
+                (self.needham, "Alice"),
+                (self.needham, "Bob"),
+                (self.wellesley, "Carol"),
+                (self.wellesley, "Dave"),
+            )
+        ]
+        for model in SearchIndex.indexed_admins():
+            SearchIndex.rebuild(model)
+        # The index tables are rolled back with the rest of the test
+        self.addCleanup(SearchIndex.index_tables.cache_clear)
+
+    def test_search_uses_index(self):
+        with CaptureQueriesContext(connection) as context:
+            assert search(Team, "eedh") == {self.needham.id}
+        assert "MATCH" in context.captured_queries[-1]["sql"]
+        assert search(Athlete, "SMITH needham") == {
+            self.athletes[0].id,
+            self.athletes[1].id,
+        }
+        assert search(Athlete, "alice wellesley") == set()
+
+    def test_short_words_fall_back_to_lookups(self):
+        with CaptureQueriesContext(connection) as context:
+            assert search(Team, "ne") == {self.needham.id}
+        assert "MATCH" not in context.captured_queries[-1]["sql"]
+
+    def test_saves_and_soft_deletes_update_index(self):
+        self.needham.name = "Dover"
+        self.needham.save()
+        assert search(Team, "Dover") == {self.needham.id}
+        assert search(Team, "Needham") == set()
+        # The documents of the team's athletes include its name
+        assert search(Athlete, "Dover") == {self.athletes[0].id, self.athletes[1].id}
+
+        self.athletes[0].delete()
+        assert search(Athlete, "Dover") == {self.athletes[1].id}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM "{SearchIndex.table_name(Athlete)}" '
+                "WHERE rowid = %s",
+                [self.athletes[0].id],
+            )
+            assert cursor.fetchall() == []
+
+    def test_relay_entries_match_lookups(self):
+        meet = Meet.objects.create(name="Invitational")
+        relay = MeetRelayEntry.objects.create(
+            meet=meet,
+            team=self.wellesley,
+            event=Event.S_200_YARD_MEDLEY_RELAY,
+            order=0,
+            athlete_0=self.athletes[2],
+            athlete_1=self.athletes[3],
+            athlete_2=self.athletes[2],
+            athlete_3=self.athletes[3],
+            seed=12345,
+        )
+        for term in ("dave", "invitational wellesley", "12345", "medley carol"):
+            assert search(MeetRelayEntry, term) == {relay.id}, term
+        assert search(MeetRelayEntry, "alice") == set()
+
+    def test_saves_of_unindexed_fields_skip_index(self):
+        search(Team, "Needham")
+        with CaptureQueriesContext(connection) as context:
+            self.athletes[0].active = False
+            self.athletes[0].save(update_fields=["active"])
+        assert len(context.captured_queries) == 1
+
+        with CaptureQueriesContext(connection) as context:
+            self.needham.name = "Needham High"
+            self.needham.save(update_fields=["name"])
+        assert not any(
+            "sqlite_master" in query["sql"] for query in context.captured_queries
+        )
+        assert search(Athlete, "high bob") == {self.athletes[1].id}
+
+    def test_index_objects_covers_bulk_writes(self):
+        [team] = Team.objects.bulk_create([Team(name="Dover")])
+        assert search(Team, "Dover") == set()
+        SearchIndex.index_objects({Team: [team.id]})
+        assert search(Team, "Dover") == {team.id}
+
+    def test_build_command_indexes_existing_rows(self):
+        Team.objects.bulk_create([Team(name="Dover")])
+        call_command("buildsearchindex", stdout=StringIO())
+        assert search(Team, "Dover") == {Team.objects.get(name="Dover").id}
+
+    def test_paginated_listing_uses_index(self):
+        user = get_user_model().objects.create_superuser(
+            username="admin", password="password"
+        )
+        self.client.force_login(user)
+        response = self.client.get(reverse("all teams") + "?q=welles")
+        self.assertContains(response, "Wellesley")
+        self.assertNotContains(response, "Needham")
@@ -1,8 +1,19 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from io import StringIO
 
-from common.utils import is_seed, seed_to_decimal
+from django.core.management import BaseCommand
+from django.test import override_settings
+
+from common.constants import Event
+from common.utils import (
+    format_event_seed,
+    format_seed,
+    is_seed,
+    parse_seed,
+    parse_seeds,
+    warn_unless_cache_shared,
+)
 
 
 def test_str_is_seed():
@@ -26,13 +37,46 @@ def test_str_is_not_seed():
     assert not is_seed("1:23.456")
 
 
-def test_seed_to_decimal():
-    assert seed_to_decimal("0") == Decimal(0)
-    assert seed_to_decimal("00") == Decimal(0)
-    assert seed_to_decimal("12") == Decimal(12)
-    assert seed_to_decimal("12.34") == Decimal("12.34")
-    assert seed_to_decimal(".12") == Decimal(".12")
-    assert seed_to_decimal(".1") == Decimal(".1")
-    assert seed_to_decimal("12.") == Decimal(12)
-    assert seed_to_decimal("1:23.45") == Decimal("83.45")
-    assert seed_to_decimal("123:45.67") == Decimal("7425.67")
+def test_parse_seed():
+    assert parse_seed("0") == 0
+    assert parse_seed("00") == 0
+    assert parse_seed("12") == 1200
+    assert parse_seed("12.34") == 1234
+    assert parse_seed(".12") == 12
+    assert parse_seed(".1") == 10
+    assert parse_seed("12.") == 1200
+    assert parse_seed("1:23.45") == 8345
+    assert parse_seed("123:45.67") == 742567
+    assert parse_seed("1:2.34") is None
+    assert parse_seed("") is None
+
+
+def test_parse_seeds():
+    assert parse_seeds(["59.1", "1:01.23", "1:1"]) == [5910, 6123, None]
+
+
+def test_format_seed():
+    assert format_seed(1234) == "12.34"
+    assert format_seed(6123) == "1:01.23"
+    assert format_seed(8345) == "1:23.45"
+    assert format_seed(742567) == "123:45.67"
+    assert format_seed(500) == "5.00"
+
+
+def test_format_event_seed():
+    assert format_event_seed(Event.S_100_YARD_FREESTYLE, 6123) == "1:01.23"
+    assert format_event_seed(Event.D_1_METER_DIVING, 25050) == "250.50"
+    assert format_event_seed(Event.D_1_METER_DIVING, None) == ""
+
+
+def test_warn_unless_cache_shared():
+    command = BaseCommand(stderr=StringIO())
+    warn_unless_cache_shared(command)
+    assert "not shared" in command.stderr.getvalue()
+
+    command = BaseCommand(stderr=StringIO())
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    ):
+        warn_unless_cache_shared(command)
+    assert not command.stderr.getvalue()
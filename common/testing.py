@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+def query_counts(
+    request: Callable[[], Any], grow: Callable[[int], Any], sizes: Iterable[int]
+) -> list[int]:
+    """
+    Count the queries issued by request after growing the data to each size.
+
+    Useful for asserting that the cost of a view does not depend on the amount
+    of data it renders.
+    """
+    counts = []
+    for size in sizes:
+        grow(size)
+        with CaptureQueriesContext(connection) as context:
+            request()
+        counts.append(len(context.captured_queries))
+    return counts
+
+
+# A step of a query plan that reads a table or a subquery without an index
+_SCAN = re.compile(r"SCAN (?P<table>\w+)")
+# A step of a query plan that searches an index, whose name may contain spaces
+_INDEX = re.compile(r"USING (?:COVERING )?INDEX (?P<index>.+?)(?: \(\w+[=<>]|$)")
+# A table aliased in a query, as Django does in subqueries, plans name the alias
+_ALIAS = re.compile(r'"(?P<table>\w+)" (?P<alias>[A-Z]\d+)\b')
+
+
+def _query_plans(request: Callable[[], Any]) -> list[tuple[str, str]]:
+    """Plan every SELECT issued by request, as (sql, detail) for each step"""
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        request()
+
+    steps = []
+    with connection.cursor() as cursor:
+        for sql, params in queries:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            steps.extend((sql, detail) for *_, detail in cursor.fetchall())
+    return steps
+
+
+def full_table_scans(request: Callable[[], Any]) -> list[tuple[str, str]]:
+    """
+    Find the queries issued by request that read a whole table.
+
+    Every SELECT is planned again with EXPLAIN QUERY PLAN, and each step of its
+    plan that scans a table without an index is returned with the query.
+    """
+    tables = set(connection.introspection.table_names())
+    scans = []
+    for sql, detail in _query_plans(request):
+        aliases = {match["alias"]: match["table"] for match in _ALIAS.finditer(sql)}
+        match = _SCAN.fullmatch(detail)
+        if match and aliases.get(match["table"], match["table"]) in tables:
+            scans.append((sql, detail))
+    return scans
+
+
+def indexes_used(request: Callable[[], Any]) -> set[str]:
+    """The names of the indexes that the queries issued by request search"""
+    return {
+        match["index"]
+        for _, detail in _query_plans(request)
+        if (match := _INDEX.search(detail))
+    }
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
 from django.urls import reverse
 from django.utils.html import format_html
 
-from common.constants import SEED_REGEX
+from common.constants import SWIM_EVENTS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.core.management import BaseCommand
+
+    from common.constants import Event
 
 
 def as_int(value: Any, or_else: int) -> int:
@@ -16,6 +24,22 @@ def as_int(value: Any, or_else: int) -> int:
         return or_else
 
 
+def warn_unless_cache_shared(command: BaseCommand) -> None:
+    """
+    Warn that a command writing entries cannot expire what the server cached.
+
+    A local memory cache belongs to a single process, so a command only expires its
+    own copy. Production shares a database cache, see swive.settings.production.
+    """
+    if isinstance(caches["default"], LocMemCache):
+        command.stderr.write(
+            command.style.WARNING(
+                "The cache is not shared with the server, restart it to expire "
+                "cached listings and seeding"
+            )
+        )
+
+
 # https://stackoverflow.com/a/53092940
 def linkify_fk(field_name: str):
     """
@@ -39,22 +63,55 @@ def linkify_fk(field_name: str):
     return _linkify_fk
 
 
+def parse_seed(seed: str) -> int | None:
+    """
+    Parse a seed such as 59.1, 1:01.23 or 250.50 into hundredths.
+
+    Returns None if the seed is not formatted properly. The string is split with
+    str methods and the parts converted straight to integers, without a regex or
+    any Decimal arithmetic.
+    """
+    minutes, colon, seconds = seed.partition(":")
+    if not colon:
+        minutes, seconds = "", minutes
+    whole, _, fraction = seconds.partition(".")
+    if len(fraction) > 2 or not (whole or fraction):
+        return None
+    if colon and (not minutes or len(whole) != 2):
+        return None
+    digits = minutes + whole + fraction
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return (60 * int(minutes or 0) + int(whole or 0)) * 100 + int(
+        fraction.ljust(2, "0")
+    )
+
+
+def parse_seeds(seeds: Iterable[str]) -> list[int | None]:
+    return [parse_seed(seed) for seed in seeds]
+
+
 def is_seed(seed: str) -> bool:
-    return SEED_REGEX.match(seed) and seed != "."
+    return parse_seed(seed) is not None
+
+
+def format_hundredths(value: int) -> str:
+    seconds, hundredths = divmod(value, 100)
+    return f"{seconds}.{hundredths:02}"
 
 
-def seed_to_decimal(seed: str) -> Decimal:
-    if ":" not in seed:
-        return Decimal("0" + seed)
-    minutes, seconds = seed.split(":")
-    seconds, milliseconds = seconds.split(".")
-    seconds = str(60 * int(minutes) + int(seconds))
-    return Decimal(f"{seconds}.{milliseconds}")
+def format_seed(seed: int) -> str:
+    seconds, hundredths = divmod(seed, 100)
+    if seconds >= 60:
+        minutes, seconds = divmod(seconds, 60)
+        return f"{minutes}:{seconds:02}.{hundredths:02}"
+    return format_hundredths(seed)
 
 
-def format_seed(seed: Decimal) -> str:
-    if seed >= 60:
-        minutes = seed // 60
-        seconds = seed - 60 * minutes
-        return f"{minutes}:{seconds}"
-    return str(seed)
+def format_event_seed(event: Event, seed: int | None) -> str:
+    """Format a seed as a time for swim events and as a score otherwise"""
+    if seed is None:
+        return ""
+    if event in SWIM_EVENTS:
+        return format_seed(seed)
+    return format_hundredths(seed)
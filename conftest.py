@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+
+import django
+import pytest
+
+
+def pytest_configure() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "swive.settings.development")
+    django.setup()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def django_test_environment():
+    from django.apps import apps
+    from django.conf import settings
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    # Migrations are generated on deploy, so build the test schema from the models
+    settings.MIGRATION_MODULES = {
+        app_config.label: None for app_config in apps.get_app_configs()
+    }
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    yield
+    teardown_databases(old_config, verbosity=0)
+    teardown_test_environment()
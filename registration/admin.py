@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from django.contrib import admin
 
 from common import utils
 from common.admin import BaseAdmin
+from registration.managers import MeetSeedingManager, MeetSnapshotManager
 from registration.models import CoachRequest, MeetIndividualEntry, MeetRelayEntry
 
+if TYPE_CHECKING:
+    from django.db import models
+    from django.http import HttpRequest
+
+
+class MeetEntryAdmin(BaseAdmin):
+    def delete_queryset(self, request: HttpRequest, queryset: models.QuerySet) -> None:
+        # Deleting selected entries sends no signals
+        meet_ids = set(queryset.values_list("meet_id", flat=True))
+        super().delete_queryset(request, queryset)
+        for meet_id in meet_ids:
+            MeetSeedingManager.invalidate(meet_id)
+            MeetSnapshotManager.invalidate(meet_id)
+
 
 @admin.register(MeetIndividualEntry)
-class MeetIndividualEntryAdmin(BaseAdmin):
+class MeetIndividualEntryAdmin(MeetEntryAdmin):
     fields = (
         "meet",
         "team",
@@ -34,10 +51,11 @@ class MeetIndividualEntryAdmin(BaseAdmin):
         "athlete__last_name",
         "seed",
     )
+    search_index = True
 
 
 @admin.register(MeetRelayEntry)
-class MeetRelayEntryAdmin(BaseAdmin):
+class MeetRelayEntryAdmin(MeetEntryAdmin):
     fields = (
         "meet",
         "team",
@@ -75,6 +93,7 @@ class MeetRelayEntryAdmin(BaseAdmin):
         "athlete_3__last_name",
         "seed",
     )
+    search_index = True
 
 
 @admin.register(CoachRequest)
@@ -86,3 +105,4 @@ class CoachRequestAdmin(BaseAdmin):
         "profile__username",
         "profile__email",
     )
+    search_index = True
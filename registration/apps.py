@@ -6,3 +6,6 @@ from django.apps import AppConfig
 class RegistrationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "registration"
+
+    def ready(self) -> None:
+        from registration import signals  # noqa: F401
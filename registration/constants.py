@@ -2,3 +2,33 @@ from __future__ import annotations
 
 ENTRIES_PER_INDIVIDUAL_EVENT = 4
 ENTRIES_PER_RELAY_EVENT = 1
+
+# Render athlete selects with only the chosen athlete and let meet-entry.js fill
+# in the rest of the roster from a single JSON blob
+HYDRATE_ROSTER = True
+
+LANES = 6
+# Number of final heats whose entries are dealt across heats when circle seeding
+CIRCLE_SEEDED_HEATS = 3
+# Seeded sheets are also invalidated whenever an entry of the meet changes
+SEEDING_CACHE_TIMEOUT = 60 * 60
+
+# Entry limits for each athlete at a meet, None for no limit. The limits are off
+# unless a league enforces them, e.g. 2 individual events and 4 events in all.
+MAX_INDIVIDUAL_EVENTS_PER_ATHLETE = None
+MAX_EVENTS_PER_ATHLETE = None
+ALLOW_BACK_TO_BACK_INDIVIDUAL_EVENTS = True
+
+# Snapshots of the entries of meets with closed entries are written under MEDIA_ROOT
+SNAPSHOT_DIRECTORY = "snapshots"
+# Number of parsed snapshots kept in memory by each process
+SNAPSHOT_CACHE_SIZE = 32
+# Archived snapshots of meets whose entries were removed from the entry tables
+ARCHIVE_DIRECTORY = "archive"
+
+# Soft-deleted entries are purged once they have been deleted this long
+PURGE_DELETED_ENTRIES_AFTER_DAYS = 30
+# Rows deleted per statement when purging or archiving entries
+PURGE_BATCH_SIZE = 1000
+# Seasons start on the first of this month, and end when the next one starts
+SEASON_START_MONTH = 8
@@ -3,24 +3,93 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.utils import ErrorDict
 
 from common import utils
-from common.constants import SWIM_EVENTS, Event
+from common.constants import INDIVIDUAL_EVENTS, Event
 from common.forms import BaseForm
 
 if TYPE_CHECKING:
+    from django.http import QueryDict
+
     from registration.models import Athlete
 
 
-class MeetEntryForm(BaseForm):
-    order = forms.IntegerField(min_value=0, widget=forms.HiddenInput())
-    seed = forms.CharField(max_length=10, required=False, empty_value=None)
+class RosterSelect(forms.Select):
+    """A select rendering only the chosen athlete.
+
+    The rest of the roster is filled in on the client by meet-entry.js.
+    """
+
+    def __init__(self, labels: dict[str, str]) -> None:
+        super().__init__(attrs={"data-roster": "roster"})
+        self.labels = labels
+
+    def optgroups(self, name, value, attrs=None):
+        choices = [("", "")] + [
+            (option_value, self.labels[option_value])
+            for option_value in value
+            if option_value in self.labels
+        ]
+        return [
+            (
+                None,
+                [
+                    self.create_option(
+                        name, option_value, label, option_value in value, index
+                    )
+                ],
+                index,
+            )
+            for index, (option_value, label) in enumerate(choices)
+        ]
 
-    def __init__(self, event: Event, *args, **kwargs) -> None:
+
+class RosterChoiceField(forms.TypedChoiceField):
+    """A choice of athlete from a roster, validated with a set lookup."""
+
+    def __init__(self, athlete_choices: list[Athlete], hydrate: bool = False) -> None:
+        choices = [(athlete.id, str(athlete)) for athlete in athlete_choices]
+        labels = {str(athlete_id): label for athlete_id, label in choices}
+        super().__init__(
+            choices=[("", "")] + choices,
+            required=False,
+            coerce=int,
+            empty_value=None,
+            widget=RosterSelect(labels) if hydrate else None,
+        )
+        self.athlete_ids = labels.keys()
+
+    def valid_value(self, value: str) -> bool:
+        return value in self.athlete_ids
+
+
+class MeetEntryForm(BaseForm):
+    """A single slot of a MeetEntriesGrid.
+
+    The fields are shared by every row of the grid and the rows are cleaned
+    together by MeetEntriesGrid.full_clean.
+    """
+
+    def __init__(
+        self,
+        grid: MeetEntriesGrid,
+        event: Event,
+        order: int,
+        fields: dict[str, forms.Field],
+        *args,
+        **kwargs,
+    ) -> None:
         initial = kwargs.get("initial")
-        if initial and initial.get("seed") and event in SWIM_EVENTS:
-            initial["seed"] = utils.format_seed(initial["seed"])
+        if initial and initial.get("seed") is not None:
+            initial["seed"] = utils.format_event_seed(event, initial["seed"])
         super().__init__(*args, **kwargs)
+        self.grid = grid
+        self.event = event
+        self.order = order
+        self.fields = fields
+        self.saved_entry = None
 
     @property
     def athlete_fields(self):
@@ -30,54 +99,91 @@ class MeetEntryForm(BaseForm):
     def seed_field(self):
         return next(field for field in self.visible_fields() if "seed" == field.name)
 
-    def clean(self) -> None:
-        if self.cleaned_data["seed"] is None:
-            return
-        for field in self.athlete_fields:
-            if self.cleaned_data[field.name] is None:
-                self.add_error(field.name, "Missing athlete")
-        if not utils.is_seed(self.cleaned_data["seed"]):
-            self.add_error("seed", "Seed not formatted properly")
-        self.cleaned_data["seed"] = utils.seed_to_decimal(self.cleaned_data["seed"])
-
-
-class MeetIndividualEntryForm(MeetEntryForm):
-    athlete = forms.TypedChoiceField(
-        choices=[("", "")], required=False, coerce=int, empty_value=None
-    )
-
-    def __init__(self, athlete_choices: list[Athlete], *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self.fields["athlete"].choices += [
-            (athlete.id, athlete) for athlete in athlete_choices
-        ]
-
-
-class MeetRelayEntryForm(MeetEntryForm):
-    athlete_0 = forms.TypedChoiceField(
-        choices=[("", "")], required=False, coerce=int, empty_value=None
-    )
-    athlete_1 = forms.TypedChoiceField(
-        choices=[("", "")], required=False, coerce=int, empty_value=None
-    )
-    athlete_2 = forms.TypedChoiceField(
-        choices=[("", "")], required=False, coerce=int, empty_value=None
-    )
-    athlete_3 = forms.TypedChoiceField(
-        choices=[("", "")], required=False, coerce=int, empty_value=None
-    )
-
-    def __init__(self, athlete_choices: list[Athlete], *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-        self.fields["athlete_0"].choices += [
-            (athlete.id, athlete) for athlete in athlete_choices
-        ]
-        self.fields["athlete_1"].choices += [
-            (athlete.id, athlete) for athlete in athlete_choices
-        ]
-        self.fields["athlete_2"].choices += [
-            (athlete.id, athlete) for athlete in athlete_choices
-        ]
-        self.fields["athlete_3"].choices += [
-            (athlete.id, athlete) for athlete in athlete_choices
-        ]
+    def full_clean(self) -> None:
+        if not self.is_bound:
+            self._errors = ErrorDict()
+        elif self._errors is None:
+            self.grid.full_clean()
+
+
+class MeetEntriesGrid:
+    """Every entry slot of the meet entries page.
+
+    The athlete roster is held once and shared by the fields of every row.
+    Bound data is parsed and validated for the whole grid in a single pass.
+    """
+
+    def __init__(
+        self,
+        athlete_choices: list[Athlete],
+        data: QueryDict | None = None,
+        hydrate_roster: bool = False,
+    ) -> None:
+        self.data = data
+        athlete_field = RosterChoiceField(athlete_choices, hydrate=hydrate_roster)
+        self.individual_fields = self._build_fields(athlete_field, ["athlete"])
+        self.relay_fields = self._build_fields(
+            athlete_field, ["athlete_0", "athlete_1", "athlete_2", "athlete_3"]
+        )
+        self.rows: list[MeetEntryForm] = []
+        # Errors of the grid as a whole, such as a save that was rolled back
+        self.errors: list[str] = []
+
+    def add_row(
+        self, event: Event, order: int, initial: dict | None = None
+    ) -> MeetEntryForm:
+        if event in INDIVIDUAL_EVENTS:
+            fields = self.individual_fields
+        else:
+            fields = self.relay_fields
+        row = MeetEntryForm(
+            self,
+            event,
+            order,
+            fields,
+            data=self.data,
+            prefix=f"{event.as_prefix()}-{order}",
+            initial={"order": order, **(initial or {})},
+        )
+        self.rows.append(row)
+        return row
+
+    def full_clean(self) -> None:
+        seeds = []
+        for row in self.rows:
+            row._errors = ErrorDict()
+            row.cleaned_data = {}
+            for name, bound_field in row._bound_items():
+                try:
+                    row.cleaned_data[name] = bound_field.field.clean(bound_field.data)
+                except ValidationError as e:
+                    row.add_error(name, e)
+            if row.cleaned_data.get("seed") is not None:
+                seeds.append(row)
+
+        for row in seeds:
+            for field in row.athlete_fields:
+                if (
+                    field.name in row.cleaned_data
+                    and row.cleaned_data[field.name] is None
+                ):
+                    row.add_error(field.name, "Missing athlete")
+
+        parsed_seeds = utils.parse_seeds(row.cleaned_data["seed"] for row in seeds)
+        for row, seed in zip(seeds, parsed_seeds):
+            if seed is None:
+                row.add_error("seed", "Seed not formatted properly")
+            else:
+                row.cleaned_data["seed"] = seed
+
+    @staticmethod
+    def _build_fields(
+        athlete_field: RosterChoiceField, athlete_field_names: list[str]
+    ) -> dict[str, forms.Field]:
+        fields = {"order": forms.IntegerField(min_value=0, widget=forms.HiddenInput())}
+        for name in athlete_field_names:
+            fields[name] = athlete_field
+        fields["seed"] = forms.CharField(
+            max_length=10, required=False, empty_value=None
+        )
+        return fields
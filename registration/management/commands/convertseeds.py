@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.core.management import BaseCommand
+from django.db import connection, models
+
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+
+class Command(BaseCommand):
+    help = "Convert decimal entry seeds to hundredths, run before migrate"
+
+    def handle(self, *args, **options):
+        tables = connection.introspection.table_names()
+        for model in (MeetIndividualEntry, MeetRelayEntry):
+            table = model._meta.db_table
+            if table not in tables or not self._is_decimal(table):
+                self.stdout.write(f"{table}: nothing to convert")
+                continue
+
+            old_field = models.DecimalField(
+                max_digits=6, decimal_places=2, blank=True, null=True
+            )
+            old_field.set_attributes_from_name("seed")
+            old_field.model = model
+            # Scaling the values and changing the column type happen together, so
+            # running the command again never scales a seed twice
+            with connection.schema_editor() as schema_editor:
+                schema_editor.execute(
+                    f"UPDATE {schema_editor.quote_name(table)} "
+                    "SET seed = CAST(ROUND(seed * 100) AS INTEGER) "
+                    "WHERE seed IS NOT NULL"
+                )
+                schema_editor.alter_field(
+                    model, old_field, model._meta.get_field("seed")
+                )
+            self.stdout.write(f"{table}: converted seeds to hundredths")
+
+    @staticmethod
+    def _is_decimal(table: str) -> bool:
+        with connection.cursor() as cursor:
+            description = connection.introspection.get_table_description(cursor, table)
+        column = next(column for column in description if column.name == "seed")
+        field_type = connection.introspection.get_field_type(column.type_code, column)
+        return field_type == "DecimalField"
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.core.management import BaseCommand, CommandError
+
+from common.models import Meet
+from registration.managers import MeetEntriesExporter
+
+
+class Command(BaseCommand):
+    help = "Export every team's entries for a meet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("meet_id", type=int)
+        parser.add_argument("--format", choices=["csv", "sdif"], default="csv")
+
+    def handle(self, *args, **options):
+        try:
+            meet = Meet.objects.get(id=options["meet_id"])
+        except Meet.DoesNotExist:
+            raise CommandError(f"Meet {options['meet_id']} does not exist")
+
+        if options["format"] == "csv":
+            lines = MeetEntriesExporter.csv_lines(meet)
+        else:
+            lines = MeetEntriesExporter.sdif_lines(meet)
+        for line in lines:
+            self.stdout.write(line, ending="")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.core.management import BaseCommand, CommandError
+
+from common.models import MeetTeam
+from common.utils import warn_unless_cache_shared
+from registration.managers import ImportEntriesError, MeetEntriesImporter
+
+
+class Command(BaseCommand):
+    help = "Import a team's entries for a meet from a CSV or SDIF file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("meet_id", type=int)
+        parser.add_argument("team_id", type=int)
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "sdif"], default="csv")
+
+    def handle(self, *args, **options):
+        try:
+            meet_team = MeetTeam.objects.select_related("team").get(
+                meet__id=options["meet_id"], team__id=options["team_id"]
+            )
+        except MeetTeam.DoesNotExist:
+            raise CommandError("Team is not registered for the meet")
+
+        with open(options["path"], encoding="utf-8-sig") as f:
+            content = f.read()
+        try:
+            count = MeetEntriesImporter.import_entries(
+                meet_team, content, options["format"]
+            )
+        except ImportEntriesError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"Imported {count} entries")
+        warn_unless_cache_shared(self)
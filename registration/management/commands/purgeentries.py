@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from common.models import Meet
+from common.search import SearchIndex
+from common.utils import warn_unless_cache_shared
+from registration.constants import (
+    PURGE_BATCH_SIZE,
+    PURGE_DELETED_ENTRIES_AFTER_DAYS,
+    SEASON_START_MONTH,
+)
+from registration.managers import MeetSeedingManager, MeetSnapshotManager
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from common.models import SoftDeleteModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge old soft-deleted entries, and archive the entries of meets of "
+        "completed past seasons to their snapshots. Reopening entries for an "
+        "archived meet starts it over with no entries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=PURGE_DELETED_ENTRIES_AFTER_DAYS,
+            help="Purge entries deleted at least this many days ago",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Archive the entries of closed meets of completed past seasons",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        for model in (MeetIndividualEntry, MeetRelayEntry):
+            # Entries deleted before deletion times were kept are old enough
+            count = self.purge(
+                model,
+                model.all_objects.filter(
+                    Q(deleted_at__lt=cutoff) | Q(deleted_at=None), deleted=True
+                ),
+            )
+            self.stdout.write(f"{model._meta.db_table}: purged {count}")
+
+        if options["archive"]:
+            meets = (
+                Meet.all_objects.filter(entries_open=False)
+                .alias(last_date=Coalesce("end_date", "start_date"))
+                .filter(last_date__lt=self.season_start())
+            )
+            for meet in meets:
+                self.archive(meet)
+        warn_unless_cache_shared(self)
+
+    def archive(self, meet: Meet) -> None:
+        entries = [
+            (model, model.all_objects.filter(meet=meet))
+            for model in (MeetIndividualEntry, MeetRelayEntry)
+        ]
+        if not any(model_entries.exists() for _, model_entries in entries):
+            return
+        snapshot = MeetSnapshotManager.archive(meet)
+        count = sum(
+            self.purge(model, model_entries) for model, model_entries in entries
+        )
+        MeetSeedingManager.invalidate(meet.id)
+        self.stdout.write(
+            f"{meet}: archived {len(snapshot.rows)} entries, removed {count}"
+        )
+
+    @staticmethod
+    def purge(model: type[SoftDeleteModel], entries: QuerySet) -> int:
+        count = 0
+        while ids := list(entries.values_list("id", flat=True)[:PURGE_BATCH_SIZE]):
+            with transaction.atomic():
+                count += model.all_objects.filter(id__in=ids).hard_delete()
+            SearchIndex.index_objects({model: ids})
+        return count
+
+    @staticmethod
+    def season_start() -> datetime.date:
+        """The first day of the current season"""
+        today = timezone.localdate()
+        year = today.year if today.month >= SEASON_START_MONTH else today.year - 1
+        return datetime.date(year, SEASON_START_MONTH, 1)
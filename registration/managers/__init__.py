@@ -1 +1,18 @@
-from registration.managers._meet_entries_manager import MeetEntriesManager
+from registration.managers._meet_entries_exporter import MeetEntriesExporter
+from registration.managers._meet_entries_importer import (
+    ImportEntriesError,
+    MeetEntriesImporter,
+)
+from registration.managers._meet_entries_manager import (
+    MeetEntriesManager,
+    StaleEntriesError,
+)
+from registration.managers._meet_seeding_manager import (
+    EventSheet,
+    MeetSeedingManager,
+    SeededEntry,
+)
+from registration.managers._meet_snapshot_manager import (
+    MeetSnapshot,
+    MeetSnapshotManager,
+)
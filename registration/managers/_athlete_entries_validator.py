@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Hashable
+from typing import TYPE_CHECKING
+
+from common.constants import EVENT_ORDER, INDIVIDUAL_EVENTS, SWIM_EVENTS, Event
+from registration.constants import (
+    ALLOW_BACK_TO_BACK_INDIVIDUAL_EVENTS,
+    MAX_EVENTS_PER_ATHLETE,
+    MAX_INDIVIDUAL_EVENTS_PER_ATHLETE,
+)
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+if TYPE_CHECKING:
+    from registration.models import MeetEntry
+
+# Lineups map a key for each entry to its event and athlete ids
+Lineup = dict[Hashable, tuple[Event, list[int]]]
+
+SWIM_INDIVIDUAL_EVENT_POSITIONS = {
+    event: position
+    for position, event in enumerate(
+        event
+        for event in EVENT_ORDER
+        if event in INDIVIDUAL_EVENTS and event in SWIM_EVENTS
+    )
+}
+
+
+class AthleteEntriesValidator:
+    @staticmethod
+    def read_lineup(meet_id: int, team_id: int) -> Lineup:
+        """Read the saved entries of a team, keyed by (model, id)"""
+        lineup = {}
+        for model, athlete_fields in (
+            (MeetIndividualEntry, ["athlete"]),
+            (MeetRelayEntry, ["athlete_0", "athlete_1", "athlete_2", "athlete_3"]),
+        ):
+            for entry_id, event, *athlete_ids in model.objects.filter(
+                meet__id=meet_id, team__id=team_id
+            ).values_list("id", "event", *athlete_fields):
+                lineup[(model, entry_id)] = (Event(event), athlete_ids)
+        return lineup
+
+    @staticmethod
+    def athlete_ids(entry: MeetEntry) -> list[int]:
+        if isinstance(entry, MeetIndividualEntry):
+            return [entry.athlete_id]
+        return [
+            entry.athlete_0_id,
+            entry.athlete_1_id,
+            entry.athlete_2_id,
+            entry.athlete_3_id,
+        ]
+
+    @staticmethod
+    def find_violations(lineup: Lineup) -> dict[Hashable, list[tuple[int, str]]]:
+        """
+        Check the events of every athlete in a lineup against the entry limits.
+
+        Returns the (athlete id, message) violations of each entry involved, keyed
+        like the lineup.
+        """
+        keys_by_athlete = defaultdict(list)
+        for key, (_, athlete_ids) in lineup.items():
+            for athlete_id in athlete_ids:
+                keys_by_athlete[athlete_id].append(key)
+
+        violations = defaultdict(list)
+        for athlete_id, keys in keys_by_athlete.items():
+            if len(keys) == 1:
+                continue
+            individual_keys = [
+                key for key in keys if lineup[key][0] in INDIVIDUAL_EVENTS
+            ]
+            for message, violating_keys in AthleteEntriesValidator._check_athlete(
+                lineup, keys, individual_keys
+            ):
+                for key in violating_keys:
+                    violations[key].append((athlete_id, message))
+        return violations
+
+    @staticmethod
+    def _check_athlete(lineup: Lineup, keys: list, individual_keys: list):
+        event_counts = Counter(lineup[key][0] for key in keys)
+        for event, count in event_counts.items():
+            if count > 1:
+                yield (
+                    f"entered in {event} more than once",
+                    [key for key in keys if lineup[key][0] == event],
+                )
+
+        if (
+            MAX_INDIVIDUAL_EVENTS_PER_ATHLETE is not None
+            and len(individual_keys) > MAX_INDIVIDUAL_EVENTS_PER_ATHLETE
+        ):
+            yield (
+                f"entered in more than {MAX_INDIVIDUAL_EVENTS_PER_ATHLETE} "
+                "individual events",
+                individual_keys,
+            )
+        if MAX_EVENTS_PER_ATHLETE is not None and len(keys) > MAX_EVENTS_PER_ATHLETE:
+            yield (f"entered in more than {MAX_EVENTS_PER_ATHLETE} events", keys)
+
+        if ALLOW_BACK_TO_BACK_INDIVIDUAL_EVENTS:
+            return
+        keys_by_position = {
+            SWIM_INDIVIDUAL_EVENT_POSITIONS[lineup[key][0]]: key
+            for key in individual_keys
+            if lineup[key][0] in SWIM_INDIVIDUAL_EVENT_POSITIONS
+        }
+        for position, key in keys_by_position.items():
+            next_key = keys_by_position.get(position + 1)
+            if next_key is not None:
+                yield (
+                    f"entered in back to back events {lineup[key][0]} and "
+                    f"{lineup[next_key][0]}",
+                    [key, next_key],
+                )
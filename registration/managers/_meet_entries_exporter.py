@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from common import utils
+from common.constants import EVENT_ORDER, INDIVIDUAL_EVENTS, Event
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django.db.models import QuerySet
+
+    from common.models import Meet
+
+
+class ExportRow(NamedTuple):
+    team_id: int
+    team: str
+    event: Event
+    order: int
+    athletes: list[tuple[str, str]]
+    seed: int | None
+
+
+class _Echo:
+    """A file-like object that returns what is written to it"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class MeetEntriesExporter:
+    CHUNK_SIZE = 500
+    CSV_HEADER = [
+        "Team",
+        "Event",
+        "Order",
+        "Athlete 1",
+        "Athlete 2",
+        "Athlete 3",
+        "Athlete 4",
+        "Seed",
+    ]
+    # SDIF event distance and stroke code, diving has no SDIF stroke code
+    SDIF_EVENTS = {
+        Event.S_200_YARD_MEDLEY_RELAY: (200, "7"),
+        Event.S_200_YARD_FREESTYLE_RELAY: (200, "6"),
+        Event.S_400_YARD_FREESTYLE_RELAY: (400, "6"),
+        Event.S_200_YARD_INDIVIDUAL_MEDLEY: (200, "5"),
+        Event.S_100_YARD_BUTTERFLY: (100, "4"),
+        Event.S_100_YARD_BACKSTROKE: (100, "2"),
+        Event.S_100_YARD_BREASTSTROKE: (100, "3"),
+        Event.S_50_YARD_FREESTYLE: (50, "1"),
+        Event.S_100_YARD_FREESTYLE: (100, "1"),
+        Event.S_200_YARD_FREESTYLE: (200, "1"),
+        Event.S_500_YARD_FREESTYLE: (500, "1"),
+    }
+
+    @staticmethod
+    def iter_rows(meet_id: int) -> Iterator[ExportRow]:
+        """
+        Stream every team's entries for a meet in event order.
+
+        Each event is read with one joined query whose results are fetched in
+        chunks, so memory use does not depend on the size of the meet.
+        """
+        for event in EVENT_ORDER:
+            model = (
+                MeetIndividualEntry if event in INDIVIDUAL_EVENTS else MeetRelayEntry
+            )
+            yield from MeetEntriesExporter._query_rows(
+                model.objects.filter(meet__id=meet_id, event=event).order_by(
+                    "team__name", "order"
+                )
+            )
+
+    @staticmethod
+    def iter_rows_by_team(meet_id: int) -> Iterator[ExportRow]:
+        """
+        Stream every team's entries for a meet team by team, each in event order.
+
+        Each entry table is read with one joined query ordered by team, event and
+        order, fetched in chunks, and the two are merged, so memory use does not
+        depend on the size of the meet either.
+        """
+        event_position = Case(
+            *(
+                When(event=event, then=Value(position))
+                for position, event in enumerate(EVENT_ORDER)
+            ),
+            output_field=IntegerField(),
+        )
+        return heapq.merge(
+            *(
+                MeetEntriesExporter._query_rows(
+                    model.objects.filter(meet__id=meet_id).order_by(
+                        "team__name", event_position, "order"
+                    )
+                )
+                for model in (MeetIndividualEntry, MeetRelayEntry)
+            ),
+            key=lambda row: (row.team, EVENT_ORDER.index(row.event), row.order),
+        )
+
+    @staticmethod
+    def _query_rows(entries: QuerySet) -> Iterator[ExportRow]:
+        if entries.model is MeetIndividualEntry:
+            athlete_fields = ["athlete"]
+        else:
+            athlete_fields = ["athlete_0", "athlete_1", "athlete_2", "athlete_3"]
+        name_fields = [
+            f"{field}__{name}"
+            for field in athlete_fields
+            for name in ("first_name", "last_name")
+        ]
+        rows = entries.values_list(
+            "team_id", "team__name", "event", "order", "seed", *name_fields
+        ).iterator(chunk_size=MeetEntriesExporter.CHUNK_SIZE)
+        for team_id, team, event, order, seed, *names in rows:
+            yield ExportRow(
+                team_id=team_id,
+                team=team,
+                event=Event(event),
+                order=order,
+                athletes=list(zip(names[::2], names[1::2])),
+                seed=seed,
+            )
+
+    @staticmethod
+    def csv_lines(meet: Meet, rows: Iterable[ExportRow] | None = None) -> Iterator[str]:
+        """Stream the entries for a meet as CSV, read live unless rows are given"""
+        if rows is None:
+            rows = MeetEntriesExporter.iter_rows(meet.id)
+        writer = csv.writer(_Echo())
+        yield writer.writerow(MeetEntriesExporter.CSV_HEADER)
+        for row in rows:
+            athletes = [f"{first} {last}" for first, last in row.athletes]
+            yield writer.writerow(
+                [
+                    row.team,
+                    row.event,
+                    row.order,
+                    *athletes,
+                    *[""] * (4 - len(athletes)),
+                    utils.format_event_seed(row.event, row.seed),
+                ]
+            )
+
+    @staticmethod
+    def sdif_lines(
+        meet: Meet, rows: Iterable[ExportRow] | None = None
+    ) -> Iterator[str]:
+        """
+        Stream the entries for a meet as a fixed-width SDIF (v3) style file.
+
+        Every record is 160 characters wide. Diving entries are left out since SDIF
+        has no stroke code for them. Individual records carry no team code and
+        belong to the team record before them, so the entries are read live team by
+        team, and rows given must come team by team too.
+        """
+        if rows is None:
+            rows = MeetEntriesExporter.iter_rows_by_team(meet.id)
+        counts = Counter()
+        today = timezone.localdate().strftime("%m%d%Y")
+        yield MeetEntriesExporter._sdif_record(
+            (1, "A0"), (3, "1"), (4, "V3"), (12, "01"), (44, "Swive"), (106, today)
+        )
+        yield MeetEntriesExporter._sdif_record(
+            (1, "B1"),
+            (3, "1"),
+            (12, meet.name[:30]),
+            (122, meet.start_date.strftime("%m%d%Y") if meet.start_date else ""),
+            (130, meet.end_date.strftime("%m%d%Y") if meet.end_date else ""),
+        )
+        counts["B"] += 1
+
+        current_team = None
+        for row in rows:
+            if row.event not in MeetEntriesExporter.SDIF_EVENTS:
+                continue
+            if row.team != current_team:
+                current_team = row.team
+                counts["C"] += 1
+                yield MeetEntriesExporter._sdif_record(
+                    (1, "C1"),
+                    (3, "1"),
+                    (12, MeetEntriesExporter._team_code(row.team)),
+                    (18, row.team[:30]),
+                )
+            team = MeetEntriesExporter._team_code(row.team)
+            distance, stroke = MeetEntriesExporter.SDIF_EVENTS[row.event]
+            seed = utils.format_event_seed(row.event, row.seed) or "NT"
+            if row.event in INDIVIDUAL_EVENTS:
+                counts["D"] += 1
+                yield MeetEntriesExporter._sdif_record(
+                    (1, "D0"),
+                    (3, "1"),
+                    (12, MeetEntriesExporter._swimmer_name(*row.athletes[0])),
+                    (68, f"{distance:>4}"),
+                    (72, stroke),
+                    (89, f"{seed:>8}"),
+                    (97, "Y"),
+                )
+                continue
+
+            counts["E"] += 1
+            yield MeetEntriesExporter._sdif_record(
+                (1, "E0"),
+                (3, "1"),
+                (12, "ABCDEFGHIJKLMNOPQRSTUVWXYZ"[row.order % 26]),
+                (13, team),
+                (19, f"{len(row.athletes):>2}"),
+                (22, f"{distance:>4}"),
+                (26, stroke),
+                (46, f"{seed:>8}"),
+                (54, "Y"),
+            )
+            for leg, athlete in enumerate(row.athletes, start=1):
+                counts["F"] += 1
+                yield MeetEntriesExporter._sdif_record(
+                    (1, "F0"),
+                    (3, "1"),
+                    (16, team),
+                    (22, "ABCDEFGHIJKLMNOPQRSTUVWXYZ"[row.order % 26]),
+                    (23, MeetEntriesExporter._swimmer_name(*athlete)),
+                    (77, str(leg)),
+                )
+
+        yield MeetEntriesExporter._sdif_record(
+            (1, "Z0"),
+            (3, "1"),
+            (12, "01"),
+            (44, f"{counts['B']:>3}"),
+            (47, f"{counts['B']:>3}"),
+            (50, f"{counts['C']:>4}"),
+            (54, f"{counts['C']:>4}"),
+            (58, f"{counts['D']:>6}"),
+            (70, f"{counts['E']:>5}"),
+            (75, f"{counts['F']:>6}"),
+        )
+
+    @staticmethod
+    def _sdif_record(*fields: tuple[int, str]) -> str:
+        """Build a record from (1-indexed column, value) pairs"""
+        record = [" "] * 160
+        for column, value in fields:
+            record[column - 1 : column - 1 + len(value)] = value
+        return "".join(record[:160]) + "\r\n"
+
+    @staticmethod
+    def _swimmer_name(first_name: str, last_name: str) -> str:
+        return f"{last_name}, {first_name}"[:28]
+
+    @staticmethod
+    def _team_code(team: str) -> str:
+        return re.sub(r"\W", "", team).upper()[:6]
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import transaction
+from django.db.models import F
+
+from common import utils
+from common.constants import INDIVIDUAL_EVENTS, RELAY_EVENTS, Event
+from common.models import Athlete, MeetTeam
+from common.search import SearchIndex
+from registration.constants import (
+    ENTRIES_PER_INDIVIDUAL_EVENT,
+    ENTRIES_PER_RELAY_EVENT,
+)
+from registration.managers._athlete_entries_validator import AthleteEntriesValidator
+from registration.managers._meet_entries_exporter import MeetEntriesExporter
+from registration.managers._meet_seeding_manager import MeetSeedingManager
+from registration.managers._meet_snapshot_manager import MeetSnapshotManager
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from registration.models import MeetEntry
+
+
+class ImportEntriesError(Exception):
+    def __init__(self, errors: list[str]) -> None:
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+class ImportRow(NamedTuple):
+    line: int
+    event: str
+    order: int | None
+    athletes: list[str]
+    seed: str
+
+
+class MeetEntriesImporter:
+    """
+    Load a team's entries for a meet from a CSV or SDIF file.
+
+    The whole file is validated at once with set operations over the parsed rows,
+    then every imported event replaces the team's entries for that event in a
+    single transaction.
+    """
+
+    SDIF_EVENTS = {
+        code: event for event, code in MeetEntriesExporter.SDIF_EVENTS.items()
+    }
+
+    @staticmethod
+    def import_entries(meet_team: MeetTeam, content: str, format: str) -> int:
+        if format == "csv":
+            rows = MeetEntriesImporter.parse_csv(content, meet_team.team.name)
+        elif format == "sdif":
+            rows = MeetEntriesImporter.parse_sdif(content, meet_team.team.name)
+        else:
+            raise ImportEntriesError([f"Unknown format {format}"])
+        entries = MeetEntriesImporter.build_entries(meet_team, rows)
+        MeetEntriesImporter.save_entries(meet_team, entries)
+        return len(entries)
+
+    @staticmethod
+    def parse_csv(content: str, team_name: str) -> list[ImportRow]:
+        reader = csv.DictReader(io.StringIO(content))
+        missing = {"Event", "Order", "Athlete 1", "Seed"} - set(reader.fieldnames or [])
+        if missing:
+            raise ImportEntriesError([f"Missing columns: {', '.join(sorted(missing))}"])
+
+        rows = []
+        for record in reader:
+            if record.get("Team") and record["Team"] != team_name:
+                continue
+            order = record["Order"].strip()
+            rows.append(
+                ImportRow(
+                    line=reader.line_num,
+                    event=record["Event"].strip(),
+                    order=int(order) if order.isdigit() else None,
+                    athletes=[
+                        name
+                        for leg in range(1, 5)
+                        if (name := (record.get(f"Athlete {leg}") or "").strip())
+                    ],
+                    seed=record["Seed"].strip(),
+                )
+            )
+        return rows
+
+    @staticmethod
+    def parse_sdif(content: str, team_name: str) -> list[ImportRow]:
+        team_code = MeetEntriesExporter._team_code(team_name)
+        rows = []
+        orders = Counter()
+        in_team = False
+        for line, record in enumerate(content.splitlines(), start=1):
+            code = record[:2]
+            if code == "C1":
+                in_team = record[11:17].strip() == team_code
+            # Relay records carry their own team code, individual records belong
+            # to the team record before them
+            if code in ("E0", "F0"):
+                column = 12 if code == "E0" else 15
+                if record[column : column + 6].strip() != team_code:
+                    continue
+            elif not in_team:
+                continue
+
+            if code == "D0":
+                event = MeetEntriesImporter._sdif_event(record[67:71], record[71])
+                rows.append(
+                    ImportRow(
+                        line=line,
+                        event=event,
+                        order=orders[event],
+                        athletes=[MeetEntriesImporter._sdif_name(record[11:39])],
+                        seed=MeetEntriesImporter._sdif_seed(record[88:96]),
+                    )
+                )
+                orders[event] += 1
+            elif code == "E0":
+                letter = record[11]
+                rows.append(
+                    ImportRow(
+                        line=line,
+                        event=MeetEntriesImporter._sdif_event(
+                            record[21:25], record[25]
+                        ),
+                        order=ord(letter) - ord("A") if letter.isalpha() else None,
+                        athletes=[],
+                        seed=MeetEntriesImporter._sdif_seed(record[45:53]),
+                    )
+                )
+            elif code == "F0" and rows and rows[-1].event in RELAY_EVENTS:
+                rows[-1].athletes.append(MeetEntriesImporter._sdif_name(record[22:50]))
+        return rows
+
+    @staticmethod
+    def build_entries(meet_team: MeetTeam, rows: list[ImportRow]) -> list[MeetEntry]:
+        """Validate the rows against each other and the roster and build the entries"""
+        errors = defaultdict(list)
+        athlete_ids = MeetEntriesImporter._build_athlete_index(meet_team.team_id)
+
+        unknown_events = {row.event for row in rows} - set(Event)
+        for row in rows:
+            if row.event in unknown_events:
+                errors[row.line].append(f"Unknown event {row.event}")
+            elif row.order is None or row.order >= MeetEntriesImporter._slots(
+                row.event
+            ):
+                errors[row.line].append("Invalid order")
+
+        slots = Counter((row.event, row.order) for row in rows)
+        for row in rows:
+            if slots[(row.event, row.order)] > 1:
+                errors[row.line].append("Entry already exists")
+
+        names = {name for row in rows for name in row.athletes}
+        unknown_names = names - athlete_ids.keys()
+        ambiguous_names = {name for name in names if athlete_ids.get(name, 0) is None}
+        for row in rows:
+            for name in row.athletes:
+                if name in unknown_names:
+                    errors[row.line].append(f"Athlete {name} not on roster")
+                elif name in ambiguous_names:
+                    errors[row.line].append(f"More than one athlete named {name}")
+            athlete_count = 1 if row.event in INDIVIDUAL_EVENTS else 4
+            if len(row.athletes) < athlete_count:
+                errors[row.line].append("Missing athlete")
+            elif len(row.athletes) > athlete_count:
+                errors[row.line].append("Too many athletes")
+            if len(set(row.athletes)) < len(row.athletes):
+                errors[row.line].append("Duplicate athlete")
+
+        seeds = utils.parse_seeds(row.seed for row in rows)
+        for row, seed in zip(rows, seeds):
+            if row.seed and seed is None:
+                errors[row.line].append("Seed not formatted properly")
+
+        if errors:
+            raise ImportEntriesError(
+                [
+                    f"Line {line}: {message}"
+                    for line, messages in sorted(errors.items())
+                    for message in messages
+                ]
+            )
+        entries = [
+            MeetEntriesImporter._build_entry(meet_team, row, seed, athlete_ids)
+            for row, seed in zip(rows, seeds)
+        ]
+        MeetEntriesImporter._check_entry_limits(meet_team, rows, entries)
+        return entries
+
+    @staticmethod
+    def _check_entry_limits(
+        meet_team: MeetTeam, rows: list[ImportRow], entries: list[MeetEntry]
+    ) -> None:
+        """Check the athlete entry limits on the saved lineup with the import applied"""
+        imported_events = {row.event for row in rows}
+        lineup = {
+            key: (event, athlete_ids)
+            for key, (event, athlete_ids) in AthleteEntriesValidator.read_lineup(
+                meet_team.meet_id, meet_team.team_id
+            ).items()
+            if event not in imported_events
+        }
+        names = {}
+        for row, entry in zip(rows, entries):
+            athlete_ids = AthleteEntriesValidator.athlete_ids(entry)
+            lineup[row.line] = (Event(row.event), athlete_ids)
+            names.update(zip(athlete_ids, row.athletes))
+
+        violations = AthleteEntriesValidator.find_violations(lineup)
+        errors = [
+            f"Line {row.line}: {names[athlete_id]} {message}"
+            for row in rows
+            for athlete_id, message in violations.get(row.line, [])
+        ]
+        if errors:
+            raise ImportEntriesError(errors)
+
+    @staticmethod
+    def save_entries(meet_team: MeetTeam, entries: Iterable[MeetEntry]) -> None:
+        entries_by_model = defaultdict(list)
+        for entry in entries:
+            entries_by_model[type(entry)].append(entry)
+        events_by_model = {
+            model: {entry.event for entry in model_entries}
+            for model, model_entries in entries_by_model.items()
+        }
+
+        ids_by_model = {}
+        with transaction.atomic():
+            MeetTeam.objects.filter(id=meet_team.id).update(version=F("version") + 1)
+            for model, events in events_by_model.items():
+                replaced = model.objects.filter(
+                    meet__id=meet_team.meet_id,
+                    team__id=meet_team.team_id,
+                    event__in=events,
+                )
+                ids_by_model[model] = list(replaced.values_list("id", flat=True))
+                replaced.delete()
+                ids_by_model[model].extend(
+                    entry.id
+                    for entry in model.objects.bulk_create(entries_by_model[model])
+                )
+        MeetSeedingManager.invalidate(meet_team.meet_id)
+        MeetSnapshotManager.invalidate(meet_team.meet_id)
+        SearchIndex.index_objects(ids_by_model)
+
+    @staticmethod
+    def _build_athlete_index(team_id: int) -> dict[str, int | None]:
+        """Map every athlete name on the roster to its id, or None if not unique"""
+        athlete_ids = {}
+        for athlete_id, first_name, last_name in Athlete.objects.filter(
+            team__id=team_id, active=True
+        ).values_list("id", "first_name", "last_name"):
+            name = f"{first_name} {last_name}"
+            athlete_ids[name] = None if name in athlete_ids else athlete_id
+        return athlete_ids
+
+    @staticmethod
+    def _build_entry(
+        meet_team: MeetTeam,
+        row: ImportRow,
+        seed: int | None,
+        athlete_ids: dict[str, int | None],
+    ) -> MeetEntry:
+        fields = {
+            "meet_id": meet_team.meet_id,
+            "team_id": meet_team.team_id,
+            "event": row.event,
+            "order": row.order,
+            "seed": seed,
+        }
+        if row.event in INDIVIDUAL_EVENTS:
+            return MeetIndividualEntry(
+                athlete_id=athlete_ids[row.athletes[0]], **fields
+            )
+        return MeetRelayEntry(
+            **{
+                f"athlete_{leg}_id": athlete_ids[name]
+                for leg, name in enumerate(row.athletes)
+            },
+            **fields,
+        )
+
+    @staticmethod
+    def _slots(event: str) -> int:
+        if event in INDIVIDUAL_EVENTS:
+            return ENTRIES_PER_INDIVIDUAL_EVENT
+        return ENTRIES_PER_RELAY_EVENT
+
+    @staticmethod
+    def _sdif_event(distance: str, stroke: str) -> str:
+        distance = int(distance) if distance.strip().isdigit() else 0
+        return MeetEntriesImporter.SDIF_EVENTS.get(
+            (distance, stroke), f"{distance} {stroke}"
+        )
+
+    @staticmethod
+    def _sdif_name(name: str) -> str:
+        last_name, _, first_name = name.strip().partition(", ")
+        return f"{first_name} {last_name}"
+
+    @staticmethod
+    def _sdif_seed(seed: str) -> str:
+        seed = seed.strip()
+        return "" if seed == "NT" else seed
@@ -4,20 +4,34 @@ import itertools
 from collections import defaultdict
 from typing import TYPE_CHECKING, TypedDict
 
-from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS, PermissionDenied, ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+from django.http import Http404, QueryDict
 
-from common.constants import INDIVIDUAL_EVENTS, RELAY_EVENTS
-from common.models import Athlete, Meet, MeetTeam, Team
-from registration.constants import ENTRIES_PER_INDIVIDUAL_EVENT, ENTRIES_PER_RELAY_EVENT
-from registration.forms import MeetIndividualEntryForm, MeetRelayEntryForm
+from common import utils
+from common.constants import INDIVIDUAL_EVENTS, RELAY_EVENTS, Event
+from common.models import Athlete, Coach, Meet, MeetTeam, Team
+from common.search import SearchIndex
+from registration.constants import (
+    ENTRIES_PER_INDIVIDUAL_EVENT,
+    ENTRIES_PER_RELAY_EVENT,
+    HYDRATE_ROSTER,
+)
+from registration.forms import MeetEntriesGrid
+from registration.managers._athlete_entries_validator import AthleteEntriesValidator
+from registration.managers._meet_seeding_manager import MeetSeedingManager
+from registration.managers._meet_snapshot_manager import MeetSnapshotManager
 from registration.models import MeetIndividualEntry, MeetRelayEntry
 
 if TYPE_CHECKING:
-    from django.http import Http404, HttpRequest
+    from collections.abc import Iterable
+
+    from django.http import HttpRequest
 
     from account.models import Profile
-    from common.constants import Event
     from registration.forms import MeetEntryForm
+    from registration.managers._meet_entries_exporter import ExportRow
     from registration.models import MeetEntry
 
 
@@ -27,6 +41,21 @@ class Section(TypedDict):
     forms: list[MeetEntryForm]
 
 
+class StaleEntriesError(Exception):
+    """The entries were saved by someone else since they were loaded"""
+
+
+class ReadOnlyRow(TypedDict):
+    athletes: list[str]
+    seed: str
+
+
+class ReadOnlySection(TypedDict):
+    event: Event
+    count: int
+    rows: list[ReadOnlyRow]
+
+
 class MeetEntriesManager:
     INDIVIDUAL_EVENT_ATHLETE_FIELDS = ["athlete"]
     RELAY_EVENT_ATHLETE_FIELDS = ["athlete_0", "athlete_1", "athlete_2", "athlete_3"]
@@ -40,31 +69,133 @@ class MeetEntriesManager:
     ]
 
     @staticmethod
-    def validate_request(user: Profile, meet_id: int, team_id: int) -> None:
-        if not Meet.objects.filter(id=meet_id).exists():
-            raise Http404("Meet not found")
-        if not Team.objects.filter(id=team_id).exists():
-            raise Http404("Team not found")
-        if not MeetTeam.objects.filter(meet__id=meet_id, team__id=team_id).exists():
+    def validate_request(user: Profile, meet_id: int, team_id: int) -> MeetTeam:
+        """
+        Resolve the meet, team and registration and check the user coaches the team.
+
+        Everything is fetched in one query and the registration is returned with its
+        meet and team loaded.
+        """
+        meet_teams = MeetTeam.objects.select_related("meet", "team").filter(
+            meet__id=meet_id,
+            meet__deleted=False,
+            team__id=team_id,
+            team__deleted=False,
+        )
+        if not user.is_superuser:
+            # Checked in the same query instead of through UserAccess.team_ids,
+            # which would cost these pages a query of their own
+            meet_teams = meet_teams.annotate(
+                is_coach=Exists(
+                    Coach.objects.filter(team=OuterRef("team"), profile=user)
+                )
+            )
+        meet_team = meet_teams.first()
+
+        if meet_team is None:
+            if not Meet.objects.filter(id=meet_id).exists():
+                raise Http404("Meet not found")
+            if not Team.objects.filter(id=team_id).exists():
+                raise Http404("Team not found")
             raise Http404("Team not registered to meet")
 
-        if user.is_superuser:
-            return
-        if team_id not in user.teams.all().values_list("id", flat=True):
+        if not user.is_superuser and not meet_team.is_coach:
             raise PermissionDenied("User is not registered to the team")
+        return meet_team
 
     @staticmethod
     def read_entries_by_event_by_order(
-        meet_id: int, team_id: int
+        meet_id: int, team_id: int, with_athletes: bool = False
     ) -> dict[Event, dict[int, MeetEntry]]:
+        """
+        Read the entries of a team for a meet with one query per entry table.
+
+        Only the athlete ids are loaded unless with_athletes is set, in which case
+        the athletes are joined in. Reading entry.athlete without with_athletes
+        costs a query per entry; use entry.athlete_id instead.
+        """
+        individual_entries = MeetIndividualEntry.objects.filter(
+            meet__id=meet_id, team__id=team_id
+        )
+        relay_entries = MeetRelayEntry.objects.filter(
+            meet__id=meet_id, team__id=team_id
+        )
+        if with_athletes:
+            individual_entries = individual_entries.select_related("athlete")
+            relay_entries = relay_entries.select_related(
+                *MeetEntriesManager.RELAY_EVENT_ATHLETE_FIELDS
+            )
+
         entries_by_event_by_order = defaultdict(lambda: {})
-        for entry in itertools.chain(
-            MeetIndividualEntry.objects.filter(meet__id=meet_id, team__id=team_id),
-            MeetRelayEntry.objects.filter(meet__id=meet_id, team__id=team_id),
-        ):
+        for entry in itertools.chain(individual_entries, relay_entries):
             entries_by_event_by_order[entry.event][entry.order] = entry
         return entries_by_event_by_order
 
+    @staticmethod
+    def build_roster(athlete_choices: list[Athlete]) -> list[dict] | None:
+        if not HYDRATE_ROSTER:
+            return None
+        return [{"id": athlete.id, "name": str(athlete)} for athlete in athlete_choices]
+
+    @staticmethod
+    def build_read_only_sections(
+        events: list[Event],
+        rows_by_event_by_order: dict[Event, dict[int, ReadOnlyRow]],
+    ) -> list[ReadOnlySection]:
+        sections = []
+        for event in events:
+            if event in INDIVIDUAL_EVENTS:
+                count = ENTRIES_PER_INDIVIDUAL_EVENT
+            elif event in RELAY_EVENTS:
+                count = ENTRIES_PER_RELAY_EVENT
+            rows_by_order = rows_by_event_by_order.get(event, {})
+            rows = [
+                rows_by_order.get(index, ReadOnlyRow(athletes=[], seed=""))
+                for index in range(count)
+            ]
+            sections.append(ReadOnlySection(event=event, count=count, rows=rows))
+        return sections
+
+    @staticmethod
+    def read_only_rows(
+        entries_by_event_by_order: dict[Event, dict[int, MeetEntry]],
+    ) -> dict[Event, dict[int, ReadOnlyRow]]:
+        """Read-only rows of entries read with athletes"""
+        return {
+            event: {
+                order: MeetEntriesManager._build_read_only_row(event, entry)
+                for order, entry in entries_by_order.items()
+            }
+            for event, entries_by_order in entries_by_event_by_order.items()
+        }
+
+    @staticmethod
+    def read_only_rows_from_export(
+        rows: Iterable[ExportRow],
+    ) -> dict[Event, dict[int, ReadOnlyRow]]:
+        """Read-only rows of the exported entries of a team, as in a snapshot"""
+        rows_by_event_by_order = defaultdict(lambda: {})
+        for row in rows:
+            rows_by_event_by_order[row.event][row.order] = ReadOnlyRow(
+                athletes=[f"{first} {last}" for first, last in row.athletes],
+                seed=utils.format_event_seed(row.event, row.seed),
+            )
+        return rows_by_event_by_order
+
+    @staticmethod
+    def _build_read_only_row(event: Event, entry: MeetEntry | None) -> ReadOnlyRow:
+        if entry is None:
+            return ReadOnlyRow(athletes=[], seed="")
+
+        if event in INDIVIDUAL_EVENTS:
+            athletes = [entry.athlete.name]
+        elif event in RELAY_EVENTS:
+            athletes = [athlete.name for athlete in entry.athletes]
+
+        return ReadOnlyRow(
+            athletes=athletes, seed=utils.format_event_seed(event, entry.seed)
+        )
+
     @staticmethod
     def build_event_sections(
         request: HttpRequest,
@@ -72,21 +203,25 @@ class MeetEntriesManager:
         entries_by_event_by_order: dict[Event, dict[int, MeetEntry]],
         athlete_choices: list[Athlete],
     ) -> list[Section]:
+        grid = MeetEntriesGrid(
+            athlete_choices,
+            request.POST if request.method == "POST" else None,
+            hydrate_roster=HYDRATE_ROSTER,
+        )
         sections = []
         for event in events:
             sections.append(
                 MeetEntriesManager._build_event_section_for_editing(
-                    request, event, entries_by_event_by_order[event], athlete_choices
+                    grid, event, entries_by_event_by_order[event]
                 )
             )
         return sections
 
     @staticmethod
     def _build_event_section_for_editing(
-        request: HttpRequest,
+        grid: MeetEntriesGrid,
         event: Event,
         entries_by_order: dict[int, MeetEntry],
-        athlete_choices: list[Athlete],
     ) -> Section:
         if event in INDIVIDUAL_EVENTS:
             count = ENTRIES_PER_INDIVIDUAL_EVENT
@@ -94,7 +229,7 @@ class MeetEntriesManager:
             count = ENTRIES_PER_RELAY_EVENT
         forms = [
             MeetEntriesManager._build_event_entry_form(
-                request, event, entries_by_order, athlete_choices, index
+                grid, event, entries_by_order, index
             )
             for index in range(count)
         ]
@@ -102,48 +237,30 @@ class MeetEntriesManager:
 
     @staticmethod
     def _build_event_entry_form(
-        request: HttpRequest,
+        grid: MeetEntriesGrid,
         event: Event,
         entries_by_order: dict[int, MeetEntry],
-        athlete_choices: list[Athlete],
         index: int,
     ) -> MeetEntryForm:
-        prefix = f"{event.as_prefix()}-{index}"
-
-        if event in INDIVIDUAL_EVENTS:
-            form_class = MeetIndividualEntryForm
-        elif event in RELAY_EVENTS:
-            form_class = MeetRelayEntryForm
-
-        if request.method == "POST":
-            return form_class(athlete_choices, request.POST, prefix=prefix, event=event)
-
-        initial = {"order": index}
-        if index not in entries_by_order:
-            return form_class(
-                athlete_choices, prefix=prefix, initial=initial, event=event
-            )
+        if grid.data is not None or index not in entries_by_order:
+            return grid.add_row(event, index)
 
         entry = entries_by_order[index]
         if event in INDIVIDUAL_EVENTS:
-            initial.update(
-                {
-                    "athlete": entry.athlete.id,
-                    "seed": entry.seed,
-                }
-            )
+            initial = {
+                "athlete": entry.athlete_id,
+                "seed": entry.seed,
+            }
         elif event in RELAY_EVENTS:
-            initial.update(
-                {
-                    "athlete_0": entry.athlete_0.id,
-                    "athlete_1": entry.athlete_1.id,
-                    "athlete_2": entry.athlete_2.id,
-                    "athlete_3": entry.athlete_3.id,
-                    "seed": entry.seed,
-                }
-            )
+            initial = {
+                "athlete_0": entry.athlete_0_id,
+                "athlete_1": entry.athlete_1_id,
+                "athlete_2": entry.athlete_2_id,
+                "athlete_3": entry.athlete_3_id,
+                "seed": entry.seed,
+            }
 
-        return form_class(athlete_choices, prefix=prefix, initial=initial, event=event)
+        return grid.add_row(event, index, initial)
 
     @staticmethod
     def update_entries(
@@ -151,39 +268,208 @@ class MeetEntriesManager:
         team_id: int,
         sections: list[Section],
         entries_by_event_by_order: dict[Event, dict[int, MeetEntry]],
-    ) -> None:
+        version: int | None = None,
+    ) -> int | None:
+        """
+        Save the entries of the given sections.
+
+        If a version is given, the save only goes through if the registration is
+        still at that version, otherwise StaleEntriesError is raised and nothing is
+        written. Returns the version of the registration after the save.
+        """
+        entries_to_create = defaultdict(list)
+        entries_to_update = defaultdict(list)
         for section in sections:
             event = section["event"]
-            for index, form in enumerate(section["forms"]):
+            for form in section["forms"]:
+                index = form.order
                 form.full_clean()
-                if not form.is_valid() or MeetEntriesManager._is_form_empty(
-                    event, form
-                ):
+                if not form.is_valid():
                     entries_by_event_by_order[event].pop(index, None)
                     continue
+                if MeetEntriesManager._is_form_empty(event, form):
+                    continue
                 if MeetEntriesManager._is_missing_athletes(event, form):
                     entries_by_event_by_order[event].pop(index, None)
                     continue
+                if MeetEntriesManager._has_duplicate_athletes(event, form):
+                    entries_by_event_by_order[event].pop(index, None)
+                    continue
 
-                current_entry = entries_by_event_by_order[event].get(index)
+                current_entry = entries_by_event_by_order[event].pop(index, None)
                 if current_entry:
-                    MeetEntriesManager._update_entry(event, current_entry, form)
-                    entries_by_event_by_order[event].pop(index)
+                    if not MeetEntriesManager._update_entry(event, current_entry, form):
+                        continue
+                    entry = current_entry
+                    pending_entries = entries_to_update
                 else:
                     entry = MeetEntriesManager._create_entry(
                         meet_id, team_id, event, index, form
                     )
-                    try:
-                        entry.full_clean()
-                        entry.save()
-                    except ValidationError as e:
-                        form.add_error(None, e)
+                    pending_entries = entries_to_create
+                if MeetEntriesManager._is_entry_valid(entry, form):
+                    pending_entries[type(entry)].append((entry, form))
 
+        entries_to_delete = defaultdict(list)
         for entry in itertools.chain.from_iterable(
             entries_by_athlete_ids.values()
             for entries_by_athlete_ids in entries_by_event_by_order.values()
         ):
-            entry.delete()
+            entries_to_delete[type(entry)].append(entry.id)
+
+        if entries_to_update or entries_to_create:
+            MeetEntriesManager._enforce_entry_limits(
+                meet_id,
+                team_id,
+                entries_to_delete,
+                entries_to_update,
+                entries_to_create,
+            )
+        if not (entries_to_delete or entries_to_update or entries_to_create):
+            return version
+
+        try:
+            with transaction.atomic():
+                if version is not None:
+                    MeetEntriesManager._claim_version(meet_id, team_id, version)
+                for model, entry_ids in entries_to_delete.items():
+                    model.objects.filter(id__in=entry_ids).delete()
+                for model, entries_and_forms in entries_to_update.items():
+                    model.objects.bulk_update(
+                        [entry for entry, _ in entries_and_forms],
+                        MeetEntriesManager._updatable_fields(model),
+                    )
+                for model, entries_and_forms in entries_to_create.items():
+                    model.objects.bulk_create([entry for entry, _ in entries_and_forms])
+        except IntegrityError:
+            for _, form in itertools.chain.from_iterable(entries_to_create.values()):
+                form.add_error(None, "Entry already exists")
+            # The updates and deletes were rolled back with the new entries
+            grid = next(form.grid for section in sections for form in section["forms"])
+            grid.errors.append(
+                "None of the changes were saved, since some of the entries already "
+                "exist. Review the entries and save again."
+            )
+            return version
+        MeetSeedingManager.invalidate(meet_id)
+        MeetSnapshotManager.invalidate(meet_id)
+        SearchIndex.index_objects(
+            {
+                model: [
+                    *entries_to_delete[model],
+                    *(entry.id for entry, _ in entries_to_update[model]),
+                    *(entry.id for entry, _ in entries_to_create[model]),
+                ]
+                for model in (MeetIndividualEntry, MeetRelayEntry)
+            }
+        )
+        return None if version is None else version + 1
+
+    @staticmethod
+    def attach_saved_entries(
+        sections: list[Section],
+        entries_by_event_by_order: dict[Event, dict[int, MeetEntry]],
+    ) -> None:
+        """Attach the saved entry to every row whose submitted values differ from it"""
+        for section in sections:
+            event = section["event"]
+            if event in INDIVIDUAL_EVENTS:
+                fields = MeetEntriesManager.INDIVIDUAL_EVENT_ATHLETE_FIELDS
+            elif event in RELAY_EVENTS:
+                fields = MeetEntriesManager.RELAY_EVENT_ATHLETE_FIELDS
+            for form in section["forms"]:
+                entry = entries_by_event_by_order[event].get(form.order)
+                submitted = [
+                    form.cleaned_data.get(field) for field in fields + ["seed"]
+                ]
+                if entry is None:
+                    saved = [None] * len(submitted)
+                else:
+                    saved = [getattr(entry, f"{field}_id") for field in fields]
+                    saved.append(entry.seed)
+                if submitted != saved:
+                    form.saved_entry = MeetEntriesManager._build_read_only_row(
+                        event, entry
+                    )
+
+    @staticmethod
+    def _claim_version(meet_id: int, team_id: int, version: int) -> None:
+        if not MeetTeam.objects.filter(
+            meet__id=meet_id, team__id=team_id, version=version
+        ).update(version=F("version") + 1):
+            raise StaleEntriesError
+
+    @staticmethod
+    def update_cells(
+        meet_id: int, team_id: int, cells: list[dict], version: int | None = None
+    ) -> tuple[int | None, list[dict]]:
+        """
+        Save only the given cells of the meet entries page.
+
+        Each cell names its event and order and carries its athlete ids and seed.
+        Clearing every value of a cell deletes its entry. Returns the version of the
+        registration after the save and the validation errors of each cell.
+        """
+        data = QueryDict(mutable=True)
+        orders_by_event = defaultdict(set)
+        athlete_ids = set()
+        for cell in cells:
+            event = Event(cell["event"])
+            order = int(cell["order"])
+            if event in INDIVIDUAL_EVENTS:
+                count = ENTRIES_PER_INDIVIDUAL_EVENT
+                fields = MeetEntriesManager.INDIVIDUAL_EVENT_ATHLETE_FIELDS
+            elif event in RELAY_EVENTS:
+                count = ENTRIES_PER_RELAY_EVENT
+                fields = MeetEntriesManager.RELAY_EVENT_ATHLETE_FIELDS
+            athletes = cell.get("athletes") or []
+            if not 0 <= order < count or len(athletes) > len(fields):
+                raise ValueError(f"Invalid cell {event} {order}")
+
+            prefix = f"{event.as_prefix()}-{order}"
+            data[f"{prefix}-order"] = str(order)
+            for field, athlete_id in itertools.zip_longest(fields, athletes):
+                value = "" if athlete_id is None else str(athlete_id)
+                data[f"{prefix}-{field}"] = value
+                if value.isdigit():
+                    athlete_ids.add(int(value))
+            data[f"{prefix}-seed"] = cell.get("seed") or ""
+            orders_by_event[event].add(order)
+
+        athlete_choices = list(
+            Athlete.objects.filter(team__id=team_id, active=True, id__in=athlete_ids)
+        )
+        grid = MeetEntriesGrid(athlete_choices, data)
+        sections = [
+            Section(
+                event=event,
+                count=len(orders),
+                forms=[grid.add_row(event, order) for order in sorted(orders)],
+            )
+            for event, orders in orders_by_event.items()
+        ]
+
+        current_entries = MeetEntriesManager.read_entries_by_event_by_order(
+            meet_id, team_id
+        )
+        entries_by_event_by_order = defaultdict(lambda: {})
+        for event, orders in orders_by_event.items():
+            for order in orders & current_entries[event].keys():
+                entries_by_event_by_order[event][order] = current_entries[event][order]
+
+        version = MeetEntriesManager.update_entries(
+            meet_id, team_id, sections, entries_by_event_by_order, version
+        )
+        results = []
+        for form in grid.rows:
+            errors = {field: list(errors) for field, errors in form.errors.items()}
+            if grid.errors:
+                errors[NON_FIELD_ERRORS] = [
+                    *errors.get(NON_FIELD_ERRORS, []),
+                    *grid.errors,
+                ]
+            results.append({"event": form.event, "order": form.order, "errors": errors})
+        return version, results
 
     @staticmethod
     def _is_form_empty(event: Event, form: MeetEntryForm) -> bool:
@@ -211,16 +497,109 @@ class MeetEntriesManager:
         return missing_athlete
 
     @staticmethod
-    def _update_entry(event: Event, entry: MeetEntry, form: MeetEntryForm) -> None:
+    def _has_duplicate_athletes(event: Event, form: MeetEntryForm) -> bool:
+        if event not in RELAY_EVENTS:
+            return False
+
+        athlete_ids = set()
+        for field in MeetEntriesManager.RELAY_EVENT_ATHLETE_FIELDS:
+            athlete_id = form.cleaned_data[field]
+            if athlete_id in athlete_ids:
+                athlete = dict(form.fields[field].choices)[athlete_id]
+                form.add_error(None, f"Duplicate athlete {athlete}")
+                return True
+            athlete_ids.add(athlete_id)
+        return False
+
+    @staticmethod
+    def _enforce_entry_limits(
+        meet_id: int,
+        team_id: int,
+        entries_to_delete: dict[type[MeetEntry], list[int]],
+        entries_to_update: dict[type[MeetEntry], list[tuple[MeetEntry, MeetEntryForm]]],
+        entries_to_create: dict[type[MeetEntry], list[tuple[MeetEntry, MeetEntryForm]]],
+    ) -> None:
+        """
+        Drop the pending entries that break an athlete entry limit.
+
+        The saved lineup is read with one query per entry table and the pending
+        changes are laid over it, so the check is linear in the number of entries.
+        """
+        lineup = AthleteEntriesValidator.read_lineup(meet_id, team_id)
+        for model, entry_ids in entries_to_delete.items():
+            for entry_id in entry_ids:
+                lineup.pop((model, entry_id), None)
+        forms_by_key = {}
+        for pending_entries in (entries_to_update, entries_to_create):
+            for model, entries_and_forms in pending_entries.items():
+                for entry, form in entries_and_forms:
+                    key = (model, entry.id) if entry.id else form
+                    lineup[key] = (
+                        Event(entry.event),
+                        AthleteEntriesValidator.athlete_ids(entry),
+                    )
+                    forms_by_key[key] = form
+
+        violations = AthleteEntriesValidator.find_violations(lineup)
+        rejected_forms = set()
+        for key, form in forms_by_key.items():
+            for athlete_id, message in violations.get(key, []):
+                field = next(form.athlete_fields).field
+                athlete = dict(field.choices).get(athlete_id, "Athlete")
+                form.add_error(None, f"{athlete} {message}")
+                rejected_forms.add(form)
+        if not rejected_forms:
+            return
+
+        for pending_entries in (entries_to_update, entries_to_create):
+            for model in list(pending_entries):
+                pending_entries[model] = [
+                    (entry, form)
+                    for entry, form in pending_entries[model]
+                    if form not in rejected_forms
+                ]
+                if not pending_entries[model]:
+                    del pending_entries[model]
+
+    @staticmethod
+    def _is_entry_valid(entry: MeetEntry, form: MeetEntryForm) -> bool:
+        try:
+            entry.clean_fields(
+                exclude=[
+                    field.name for field in entry._meta.fields if field.is_relation
+                ]
+            )
+        except ValidationError as e:
+            for field, messages in e.message_dict.items():
+                form.add_error(field if field in form.fields else None, messages)
+            return False
+        return True
+
+    @staticmethod
+    def _updatable_fields(model: type[MeetEntry]) -> list[str]:
+        if model is MeetIndividualEntry:
+            return MeetEntriesManager.INDIVIDUAL_EVENT_FORM_FIELDS
+        return MeetEntriesManager.RELAY_EVENT_FORM_FIELDS
+
+    @staticmethod
+    def _update_entry(event: Event, entry: MeetEntry, form: MeetEntryForm) -> bool:
         if event in INDIVIDUAL_EVENTS:
-            entry.athlete_id = form.cleaned_data["athlete"]
+            values = {"athlete_id": form.cleaned_data["athlete"]}
         elif event in RELAY_EVENTS:
-            entry.athlete_0_id = form.cleaned_data["athlete_0"]
-            entry.athlete_1_id = form.cleaned_data["athlete_1"]
-            entry.athlete_2_id = form.cleaned_data["athlete_2"]
-            entry.athlete_3_id = form.cleaned_data["athlete_3"]
-        entry.seed = form.cleaned_data["seed"]
-        entry.save()
+            values = {
+                "athlete_0_id": form.cleaned_data["athlete_0"],
+                "athlete_1_id": form.cleaned_data["athlete_1"],
+                "athlete_2_id": form.cleaned_data["athlete_2"],
+                "athlete_3_id": form.cleaned_data["athlete_3"],
+            }
+        values["seed"] = form.cleaned_data["seed"]
+
+        changed = False
+        for attr, value in values.items():
+            if getattr(entry, attr) != value:
+                setattr(entry, attr, value)
+                changed = True
+        return changed
 
     @staticmethod
     def _create_entry(
@@ -232,29 +611,18 @@ class MeetEntriesManager:
                 team_id=team_id,
                 event=event,
                 order=index,
-                athlete=Athlete.objects.filter(id=form.cleaned_data["athlete"]).get(),
+                athlete_id=form.cleaned_data["athlete"],
                 seed=form.cleaned_data["seed"],
             )
         elif event in RELAY_EVENTS:
-            athletes_by_id = {
-                athlete.id: athlete
-                for athlete in Athlete.objects.filter(
-                    id__in=[
-                        form.cleaned_data["athlete_0"],
-                        form.cleaned_data["athlete_1"],
-                        form.cleaned_data["athlete_2"],
-                        form.cleaned_data["athlete_3"],
-                    ]
-                )
-            }
             return MeetRelayEntry(
                 meet_id=meet_id,
                 team_id=team_id,
                 event=event,
                 order=index,
-                athlete_0=athletes_by_id[form.cleaned_data["athlete_0"]],
-                athlete_1=athletes_by_id[form.cleaned_data["athlete_1"]],
-                athlete_2=athletes_by_id[form.cleaned_data["athlete_2"]],
-                athlete_3=athletes_by_id[form.cleaned_data["athlete_3"]],
+                athlete_0_id=form.cleaned_data["athlete_0"],
+                athlete_1_id=form.cleaned_data["athlete_1"],
+                athlete_2_id=form.cleaned_data["athlete_2"],
+                athlete_3_id=form.cleaned_data["athlete_3"],
                 seed=form.cleaned_data["seed"],
             )
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from typing import TYPE_CHECKING, TypedDict
+
+from django.core.cache import cache
+
+from common import utils
+from common.constants import DIVE_EVENTS, EVENT_ORDER, Event
+from registration.constants import CIRCLE_SEEDED_HEATS, LANES, SEEDING_CACHE_TIMEOUT
+from registration.managers._meet_snapshot_manager import MeetSnapshotManager
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from common.models import Meet
+    from registration.managers._meet_entries_exporter import ExportRow
+
+# Sorts entries without a seed after every seeded entry
+NO_TIME = 2**31 - 1
+
+
+class SeededEntry(TypedDict):
+    rank: int
+    heat: int
+    lane: int
+    team: str
+    athletes: list[str]
+    seed: str
+
+
+class EventSheet(TypedDict):
+    event: Event
+    entries: list[SeededEntry]
+    heats: list[list[SeededEntry]]
+
+
+class EventSeeds:
+    """The entries of an event, with seeds held in hundredths in a flat array"""
+
+    def __init__(self) -> None:
+        self.seeds = array("l")
+        self.teams: list[str] = []
+        self.athletes: list[list[str]] = []
+
+    def append(self, team: str, athletes: list[str], seed: int | None) -> None:
+        self.seeds.append(NO_TIME if seed is None else seed)
+        self.teams.append(team)
+        self.athletes.append(athletes)
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+
+class MeetSeedingManager:
+    STANDARD = "standard"
+    CIRCLE = "circle"
+    METHODS = (STANDARD, CIRCLE)
+
+    @staticmethod
+    def build_sheets(meet: Meet, method: str = STANDARD) -> list[EventSheet]:
+        """
+        Seed every event of a meet.
+
+        The result is cached until an entry of the meet changes, see invalidate.
+        Meets with closed entries are seeded from their snapshot.
+        """
+        key = MeetSeedingManager._cache_key(meet.id, method)
+        sheets = cache.get(key)
+        if sheets is None:
+            snapshot = MeetSnapshotManager.load(meet)
+            if snapshot is None:
+                seeds_by_event = MeetSeedingManager.read_seeds_by_event(meet.id)
+            else:
+                seeds_by_event = MeetSeedingManager.seeds_from_rows(snapshot.rows)
+            sheets = [
+                MeetSeedingManager.seed_event(event, seeds_by_event[event], method)
+                for event in EVENT_ORDER
+                if event in seeds_by_event
+            ]
+            cache.set(key, sheets, SEEDING_CACHE_TIMEOUT)
+        return sheets
+
+    @staticmethod
+    def invalidate(meet_id: int) -> None:
+        cache.delete_many(
+            [
+                MeetSeedingManager._cache_key(meet_id, method)
+                for method in MeetSeedingManager.METHODS
+            ]
+        )
+
+    @staticmethod
+    def read_seeds_by_event(meet_id: int) -> dict[Event, EventSeeds]:
+        seeds_by_event = defaultdict(EventSeeds)
+        for model, athlete_fields in (
+            (MeetIndividualEntry, ["athlete"]),
+            (MeetRelayEntry, ["athlete_0", "athlete_1", "athlete_2", "athlete_3"]),
+        ):
+            name_fields = [
+                f"{field}__{name}"
+                for field in athlete_fields
+                for name in ("first_name", "last_name")
+            ]
+            rows = (
+                model.objects.filter(meet__id=meet_id)
+                .order_by("team__name", "order")
+                .values_list("event", "team__name", "seed", *name_fields)
+            )
+            for event, team, seed, *names in rows:
+                seeds_by_event[Event(event)].append(
+                    team,
+                    [f"{first} {last}" for first, last in zip(names[::2], names[1::2])],
+                    seed,
+                )
+        return seeds_by_event
+
+    @staticmethod
+    def seeds_from_rows(rows: Iterable[ExportRow]) -> dict[Event, EventSeeds]:
+        seeds_by_event = defaultdict(EventSeeds)
+        for row in rows:
+            seeds_by_event[row.event].append(
+                row.team,
+                [f"{first} {last}" for first, last in row.athletes],
+                row.seed,
+            )
+        return seeds_by_event
+
+    @staticmethod
+    def seed_event(event: Event, seeds: EventSeeds, method: str) -> EventSheet:
+        if event in DIVE_EVENTS:
+            # Diving seeds are scores, and the best divers go last in one flight
+            ranking = sorted(
+                range(len(seeds)),
+                key=lambda index: (seeds.seeds[index] == NO_TIME, -seeds.seeds[index]),
+            )
+            heats = [ranking[::-1]]
+            return MeetSeedingManager._build_sheet(event, seeds, ranking, heats)
+
+        ranking = sorted(range(len(seeds)), key=seeds.seeds.__getitem__)
+        if method == MeetSeedingManager.CIRCLE:
+            heats = MeetSeedingManager._circle_seed(ranking)
+        else:
+            heats = MeetSeedingManager._standard_seed(ranking)
+        return MeetSeedingManager._build_sheet(event, seeds, ranking, heats)
+
+    @staticmethod
+    def _build_sheet(
+        event: Event, seeds: EventSeeds, ranking: list[int], heats: list[list[int]]
+    ) -> EventSheet:
+        entries = [None] * len(seeds)
+        seeded_heats = []
+        for heat_number, heat in enumerate(heats, start=1):
+            if event in DIVE_EVENTS:
+                lanes = range(1, len(heat) + 1)
+            else:
+                lanes = MeetSeedingManager._lane_order()
+            seeded_heat = []
+            for index, lane in zip(heat, lanes):
+                seed = seeds.seeds[index]
+                entries[index] = SeededEntry(
+                    rank=0,
+                    heat=heat_number,
+                    lane=lane,
+                    team=seeds.teams[index],
+                    athletes=seeds.athletes[index],
+                    seed=MeetSeedingManager._format_seed(event, seed),
+                )
+                seeded_heat.append(entries[index])
+            seeded_heats.append(sorted(seeded_heat, key=lambda entry: entry["lane"]))
+
+        for rank, index in enumerate(ranking, start=1):
+            entries[index]["rank"] = rank
+        return EventSheet(
+            event=event,
+            entries=[entries[index] for index in ranking],
+            heats=seeded_heats,
+        )
+
+    @staticmethod
+    def _standard_seed(ranking: list[int]) -> list[list[int]]:
+        """
+        Fill heats from the last, fastest heat backwards.
+
+        The first heat is topped up to three entries from the second when possible.
+        """
+        heat_count = -(-len(ranking) // LANES)
+        heats = [
+            ranking[(heat_count - 1 - heat) * LANES : (heat_count - heat) * LANES]
+            for heat in range(heat_count)
+        ]
+        if heat_count > 1 and len(heats[0]) < 3:
+            moved = min(3 - len(heats[0]), len(heats[1]) - 3)
+            if moved > 0:
+                heats[0] = heats[1][-moved:] + heats[0]
+                heats[1] = heats[1][:-moved]
+        return heats
+
+    @staticmethod
+    def _circle_seed(ranking: list[int]) -> list[list[int]]:
+        """Deal the fastest entries across the last heats, seed the rest as standard"""
+        heat_count = -(-len(ranking) // LANES)
+        circled_heats = min(CIRCLE_SEEDED_HEATS, heat_count)
+        circled = ranking[: circled_heats * LANES]
+        rest = ranking[circled_heats * LANES :]
+
+        heats = MeetSeedingManager._standard_seed(rest) if rest else []
+        circle = [[] for _ in range(circled_heats)]
+        for position, index in enumerate(circled):
+            circle[circled_heats - 1 - position % circled_heats].append(index)
+        return heats + circle
+
+    @staticmethod
+    def _lane_order() -> list[int]:
+        """The lanes from the center out, fastest entry first"""
+        center = (LANES + 1) // 2
+        lanes = [center]
+        for offset in range(1, LANES):
+            lane = center + (offset + 1) // 2 * (1 if offset % 2 else -1)
+            lanes.append(lane)
+        return lanes
+
+    @staticmethod
+    def _format_seed(event: Event, seed: int) -> str:
+        if seed == NO_TIME:
+            return "NT"
+        return utils.format_event_seed(event, seed)
+
+    @staticmethod
+    def _cache_key(meet_id: int, method: str) -> str:
+        return f"meet-seeding:{meet_id}:{method}"
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import gzip
+import itertools
+import json
+import os
+import re
+import tempfile
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from common.constants import Event
+from common.models import Meet
+from registration.constants import (
+    ARCHIVE_DIRECTORY,
+    SNAPSHOT_CACHE_SIZE,
+    SNAPSHOT_DIRECTORY,
+)
+from registration.managers._meet_entries_exporter import ExportRow, MeetEntriesExporter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class MeetSnapshot(NamedTuple):
+    meet_id: int
+    version: int
+    rows: tuple[ExportRow, ...]
+    rows_by_team: dict[int, list[ExportRow]]
+
+    @staticmethod
+    def of(meet_id: int, version: int, rows: Iterable[ExportRow]) -> MeetSnapshot:
+        """A snapshot of the rows, grouped by team once for the team pages"""
+        rows = tuple(rows)
+        rows_by_team = defaultdict(list)
+        for row in rows:
+            rows_by_team[row.team_id].append(row)
+        return MeetSnapshot(meet_id, version, rows, dict(rows_by_team))
+
+    def team_rows(self, team_id: int) -> list[ExportRow]:
+        return self.rows_by_team.get(team_id, [])
+
+
+class MeetSnapshotManager:
+    """
+    Publish the entries of a meet whose entries are closed as a file.
+
+    Closing entries writes every team's entries to a gzipped JSON file under
+    MEDIA_ROOT, named by meet and version. The file is never changed: writes to
+    the entries of a closed meet publish the next version, see invalidate, and
+    while entries are open the file is not read. Views and exports of a closed
+    meet read the file instead of the entry tables, and the snapshots of past
+    seasons are archived, see the purgeentries command.
+    """
+
+    FORMAT = 1
+
+    @staticmethod
+    def load(meet: Meet) -> MeetSnapshot | None:
+        """The snapshot of a meet with closed entries, built if there is none yet"""
+        if meet.entries_open:
+            return None
+        path = MeetSnapshotManager._latest_path(
+            meet.id, SNAPSHOT_DIRECTORY
+        ) or MeetSnapshotManager._latest_path(meet.id, ARCHIVE_DIRECTORY)
+        if path is not None:
+            try:
+                return MeetSnapshotManager._read(path)
+            except FileNotFoundError:
+                # Pruned by a newer version since it was listed
+                pass
+        return MeetSnapshotManager.build(meet.id)
+
+    @staticmethod
+    def rows(meet: Meet, by_team: bool = False) -> Iterable[ExportRow]:
+        """
+        Every team's entries for a meet, from the snapshot if entries are closed.
+
+        The rows come in event order, or team by team if by_team is set.
+        """
+        snapshot = MeetSnapshotManager.load(meet)
+        if snapshot is None:
+            if by_team:
+                return MeetEntriesExporter.iter_rows_by_team(meet.id)
+            return MeetEntriesExporter.iter_rows(meet.id)
+        if by_team:
+            return itertools.chain.from_iterable(
+                sorted(snapshot.rows_by_team.values(), key=lambda rows: rows[0].team)
+            )
+        return snapshot.rows
+
+    @staticmethod
+    def build(meet_id: int) -> MeetSnapshot:
+        """Write the next version of the snapshot of a meet and prune older ones"""
+        paths = MeetSnapshotManager._paths(meet_id, SNAPSHOT_DIRECTORY)
+        snapshot = MeetSnapshot.of(
+            meet_id=meet_id,
+            version=max(paths, default=0) + 1,
+            rows=MeetEntriesExporter.iter_rows(meet_id),
+        )
+        MeetSnapshotManager._write(snapshot, SNAPSHOT_DIRECTORY)
+        for path in paths.values():
+            path.unlink(missing_ok=True)
+        return snapshot
+
+    @staticmethod
+    def invalidate(meet_id: int) -> None:
+        """
+        Publish the next version of the snapshot of a meet whose entries changed.
+
+        The snapshot is built once the current transaction commits, and only if it
+        was published and entries are closed, since the first read builds it
+        otherwise. Several writes to a meet in a transaction build it once.
+        """
+        if any(
+            getattr(callback, "snapshot_meet_id", None) == meet_id
+            for _, callback, _ in connection.run_on_commit
+        ):
+            return
+
+        def publish() -> None:
+            # Writes after this one publish again
+            publish.snapshot_meet_id = None
+            if (
+                MeetSnapshotManager._latest_path(meet_id, SNAPSHOT_DIRECTORY)
+                and Meet._base_manager.filter(id=meet_id, entries_open=False).exists()
+            ):
+                MeetSnapshotManager.build(meet_id)
+
+        publish.snapshot_meet_id = meet_id
+        transaction.on_commit(publish)
+
+    @staticmethod
+    def archive(meet: Meet) -> MeetSnapshot:
+        """
+        Keep the snapshot of a meet with closed entries in the archive directory.
+
+        The archived snapshot is never pruned, so the entries of the meet can be
+        removed from the entry tables. Loading the snapshot of the meet falls back
+        to the archive.
+        """
+        snapshot = MeetSnapshotManager.load(meet)
+        if snapshot is None:
+            raise ValueError(f"Entries are open for meet {meet.id}")
+        MeetSnapshotManager._write(snapshot, ARCHIVE_DIRECTORY)
+        return snapshot
+
+    @staticmethod
+    def _write(snapshot: MeetSnapshot, directory_name: str) -> None:
+        path = MeetSnapshotManager._path(
+            snapshot.meet_id, snapshot.version, directory_name
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Readers never see a partly written file since the rename is atomic
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, suffix=".tmp", delete=False
+        ) as file:
+            with gzip.open(file, "wt", encoding="utf-8") as content:
+                json.dump(
+                    {
+                        "format": MeetSnapshotManager.FORMAT,
+                        "meet_id": snapshot.meet_id,
+                        "version": snapshot.version,
+                        "rows": snapshot.rows,
+                    },
+                    content,
+                    separators=(",", ":"),
+                )
+        os.replace(file.name, path)
+
+    @staticmethod
+    @lru_cache(maxsize=SNAPSHOT_CACHE_SIZE)
+    def _read(path: Path) -> MeetSnapshot:
+        """Read a snapshot, which is safe to cache by path since it never changes"""
+        with gzip.open(path, "rt", encoding="utf-8") as content:
+            data = json.load(content)
+        return MeetSnapshot.of(
+            meet_id=data["meet_id"],
+            version=data["version"],
+            rows=(
+                ExportRow(
+                    team_id=team_id,
+                    team=team,
+                    event=Event(event),
+                    order=order,
+                    athletes=[tuple(athlete) for athlete in athletes],
+                    seed=seed,
+                )
+                for team_id, team, event, order, athletes, seed in data["rows"]
+            ),
+        )
+
+    @staticmethod
+    def _latest_path(meet_id: int, directory_name: str) -> Path | None:
+        paths = MeetSnapshotManager._paths(meet_id, directory_name)
+        return paths[max(paths)] if paths else None
+
+    @staticmethod
+    def _paths(meet_id: int, directory_name: str) -> dict[int, Path]:
+        """The snapshot files of a meet in a directory by version"""
+        directory = Path(settings.MEDIA_ROOT) / directory_name
+        if not directory.is_dir():
+            return {}
+        paths = {}
+        for path in directory.glob(f"meet-{meet_id}-v*.json.gz"):
+            match = re.fullmatch(rf"meet-{meet_id}-v(\d+)\.json\.gz", path.name)
+            if match:
+                paths[int(match.group(1))] = path
+        return paths
+
+    @staticmethod
+    def _path(meet_id: int, version: int, directory_name: str) -> Path:
+        return (
+            Path(settings.MEDIA_ROOT)
+            / directory_name
+            / f"meet-{meet_id}-v{version}.json.gz"
+        )
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from common.constants import Event
+from registration.managers import _athlete_entries_validator
+from registration.managers._athlete_entries_validator import AthleteEntriesValidator
+
+
+def messages_of(violations, key) -> list[str]:
+    return [message for _, message in violations.get(key, [])]
+
+
+@pytest.fixture
+def entry_limits(monkeypatch):
+    monkeypatch.setattr(
+        _athlete_entries_validator, "MAX_INDIVIDUAL_EVENTS_PER_ATHLETE", 2
+    )
+    monkeypatch.setattr(_athlete_entries_validator, "MAX_EVENTS_PER_ATHLETE", 4)
+    monkeypatch.setattr(
+        _athlete_entries_validator, "ALLOW_BACK_TO_BACK_INDIVIDUAL_EVENTS", False
+    )
+
+
+LINEUP = {
+    "diving": (Event.D_1_METER_DIVING, [1]),
+    "50 free": (Event.S_50_YARD_FREESTYLE, [1]),
+    "500 free": (Event.S_500_YARD_FREESTYLE, [1]),
+    "medley relay": (Event.S_200_YARD_MEDLEY_RELAY, [1, 2, 3, 4]),
+    "free relay": (Event.S_200_YARD_FREESTYLE_RELAY, [1, 2, 3, 4]),
+    "other": (Event.S_100_YARD_BACKSTROKE, [2]),
+}
+
+
+def test_limits_are_off_by_default():
+    assert AthleteEntriesValidator.find_violations(LINEUP) == {}
+
+
+def test_limits_are_reported_for_every_entry_involved(entry_limits):
+    violations = AthleteEntriesValidator.find_violations(LINEUP)
+
+    assert messages_of(violations, "50 free") == [
+        "entered in more than 2 individual events",
+        "entered in more than 4 events",
+    ]
+    assert messages_of(violations, "medley relay") == ["entered in more than 4 events"]
+    assert "other" not in violations
+
+
+def test_same_and_back_to_back_events_are_reported(entry_limits):
+    violations = AthleteEntriesValidator.find_violations(
+        {
+            0: (Event.S_200_YARD_FREESTYLE, [1]),
+            1: (Event.S_200_YARD_INDIVIDUAL_MEDLEY, [1]),
+            2: (Event.S_50_YARD_FREESTYLE, [2]),
+            3: (Event.S_50_YARD_FREESTYLE, [2]),
+            4: (Event.D_1_METER_DIVING, [3]),
+            5: (Event.S_200_YARD_FREESTYLE, [3]),
+        }
+    )
+
+    assert messages_of(violations, 0) == [
+        "entered in back to back events 200 Yard Freestyle and "
+        "200 Yard Individual Medley"
+    ]
+    assert messages_of(violations, 2) == ["entered in 50 Yard Freestyle more than once"]
+    assert 4 not in violations
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from common import utils
+from common.constants import Event
+from registration.managers._meet_seeding_manager import EventSeeds, MeetSeedingManager
+
+
+def build_seeds(seeds: list[str | None]) -> EventSeeds:
+    event_seeds = EventSeeds()
+    for index, seed in enumerate(seeds):
+        event_seeds.append(
+            f"Team {index}", [f"Athlete {index}"], seed and utils.parse_seed(seed)
+        )
+    return event_seeds
+
+
+def heats_of(sheet) -> list[list[tuple[int, str]]]:
+    return [
+        [(entry["lane"], entry["team"]) for entry in heat] for heat in sheet["heats"]
+    ]
+
+
+def test_lanes_fill_from_the_center():
+    assert MeetSeedingManager._lane_order() == [3, 4, 2, 5, 1, 6]
+
+
+def test_standard_seeding_puts_fastest_last_and_no_times_first():
+    seeds = build_seeds([None, "30.00", "25.00", "26.00", "27.00", "28.00", "29.00"])
+
+    sheet = MeetSeedingManager.seed_event(
+        Event.S_50_YARD_FREESTYLE, seeds, MeetSeedingManager.STANDARD
+    )
+
+    assert [entry["team"] for entry in sheet["entries"]][:2] == ["Team 2", "Team 3"]
+    assert sheet["entries"][-1]["seed"] == "NT"
+    assert [len(heat) for heat in sheet["heats"]] == [3, 4]
+    assert heats_of(sheet)[1] == [
+        (2, "Team 4"),
+        (3, "Team 2"),
+        (4, "Team 3"),
+        (5, "Team 5"),
+    ]
+
+
+def test_circle_seeding_deals_fastest_across_final_heats():
+    seeds = build_seeds([f"{60 + index}.00" for index in range(20)])
+
+    sheet = MeetSeedingManager.seed_event(
+        Event.S_100_YARD_FREESTYLE, seeds, MeetSeedingManager.CIRCLE
+    )
+
+    heats = heats_of(sheet)
+    assert len(heats) == 4
+    assert (3, "Team 0") in heats[3]
+    assert (3, "Team 1") in heats[2]
+    assert (3, "Team 2") in heats[1]
+    assert (4, "Team 3") in heats[3]
+    assert sheet["entries"][0]["seed"] == "1:00.00"
+
+
+def test_diving_is_one_flight_with_best_score_last():
+    seeds = build_seeds(["250.50", None, "310.25"])
+
+    sheet = MeetSeedingManager.seed_event(
+        Event.D_1_METER_DIVING, seeds, MeetSeedingManager.STANDARD
+    )
+
+    assert [entry["team"] for entry in sheet["entries"]] == [
+        "Team 2",
+        "Team 0",
+        "Team 1",
+    ]
+    assert heats_of(sheet) == [[(1, "Team 1"), (2, "Team 0"), (3, "Team 2")]]
@@ -5,7 +5,15 @@ from django.db import models
 from django.db.models import Q
 
 from account.models import Profile
-from common.models import Athlete, BaseModel, EventChoice, Meet, SoftDeleteModel, Team
+from common.models import (
+    Athlete,
+    BaseModel,
+    EventChoice,
+    Meet,
+    SeedField,
+    SoftDeleteModel,
+    Team,
+)
 
 
 class MeetEntry(SoftDeleteModel):
@@ -13,7 +21,7 @@ class MeetEntry(SoftDeleteModel):
     team = models.ForeignKey(Team, on_delete=models.RESTRICT)
     event = models.CharField(max_length=30, choices=EventChoice.choices)
     order = models.PositiveIntegerField()
-    seed = models.DecimalField(max_digits=6, decimal_places=2, blank=True, null=True)
+    seed = SeedField(blank=True, null=True)
 
     class Meta:
         abstract = True
@@ -39,6 +47,20 @@ class MeetIndividualEntry(MeetEntry):
                 name="one MeetIndividualEntry per (meet, team, event, order)",
             )
         ]
+        indexes = [
+            # Exports and seeding read the entries of a meet by event
+            models.Index(
+                fields=["meet", "event"],
+                condition=Q(deleted=False),
+                name="individual_entry_event_idx",
+            ),
+            # Soft-deleted entries by age, see purgeentries
+            models.Index(
+                fields=["deleted_at"],
+                condition=Q(deleted=True),
+                name="individual_entry_purge_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.meet} - {self.team} - {self.event} - {self.order} - {self.athlete} - {self.seed}"
@@ -71,6 +93,20 @@ class MeetRelayEntry(MeetEntry):
                 name="one MeetRelayEntry per (meet, team, event, order)",
             )
         ]
+        indexes = [
+            # Exports and seeding read the entries of a meet by event
+            models.Index(
+                fields=["meet", "event"],
+                condition=Q(deleted=False),
+                name="relay_entry_event_idx",
+            ),
+            # Soft-deleted entries by age, see purgeentries
+            models.Index(
+                fields=["deleted_at"],
+                condition=Q(deleted=True),
+                name="relay_entry_purge_idx",
+            ),
+        ]
 
     @property
     def athletes(self) -> list[Athlete]:
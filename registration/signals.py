@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from common.models import Meet
+from registration.managers import MeetSeedingManager, MeetSnapshotManager
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+
+# Bulk writes do not send these signals and invalidate the seeding and snapshot
+# themselves
+@receiver(post_save, sender=MeetIndividualEntry)
+@receiver(post_save, sender=MeetRelayEntry)
+@receiver(post_delete, sender=MeetIndividualEntry)
+@receiver(post_delete, sender=MeetRelayEntry)
+def invalidate_meet_entries(sender, instance, **kwargs) -> None:
+    MeetSeedingManager.invalidate(instance.meet_id)
+    MeetSnapshotManager.invalidate(instance.meet_id)
+
+
+@receiver(pre_save, sender=Meet)
+def note_entries_closing(sender, instance, **kwargs) -> None:
+    instance._entries_closing = (
+        instance.pk is not None
+        and not instance.entries_open
+        and Meet._base_manager.filter(pk=instance.pk, entries_open=True).exists()
+    )
+
+
+# Meets saved closed without being opened are published by the first read instead
+@receiver(post_save, sender=Meet)
+def publish_meet_snapshot(sender, instance, **kwargs) -> None:
+    if getattr(instance, "_entries_closing", False):
+        transaction.on_commit(lambda: MeetSnapshotManager.build(instance.id))
@@ -1,30 +1,134 @@
-//document.addEventListener('DOMContentLoaded', function () {
-//  const form = document.getElementById("meet-entries");
-//  function handleForm(event) {
-//    event.preventDefault();
-//    const match = location.pathname.match(/registration\/meet\/(\d+)\/team\/(\d+)\//);
-//    const meetId = match[1];
-//    const teamId = match[2];
-//    fetch(window.location.origin + `/registration/meet/${meetId}/team/${teamId}/save/`, {
-//      method: 'POST',
-//        body: new FormData(event.target),
-//      }).then(function (response) {
-//        if (response.ok) {
-//          console.log(response.json());
-//        }
-//        return Promise.reject(response);
-//      }).catch(error => {
-//        console.warn(error);
-//      });
-//  }
-//  form.addEventListener('submit', handleForm);
-//});
-//
-///* global bootstrap: false */
-//(function () {
-//  'use strict'
-//  var tooltipTriggerList = [].slice.call(document.querySelectorAll('[data-bs-toggle="tooltip"]'))
-//  tooltipTriggerList.forEach(function (tooltipTriggerEl) {
-//    new bootstrap.Tooltip(tooltipTriggerEl)
-//  })
-//})()
+window.addEventListener("DOMContentLoaded", function() {
+  const rosterElement = document.getElementById("roster");
+  if (!rosterElement) {
+    return;
+  }
+  const roster = JSON.parse(rosterElement.textContent);
+
+  function hydrate(select) {
+    if (select.dataset.hydrated) {
+      return;
+    }
+    select.dataset.hydrated = "true";
+    const selected = select.value;
+    const options = document.createDocumentFragment();
+    options.appendChild(new Option("", ""));
+    roster.forEach(athlete => {
+      const value = String(athlete.id);
+      const isSelected = value === selected;
+      options.appendChild(new Option(athlete.name, value, isSelected, isSelected));
+    });
+    select.replaceChildren(options);
+  }
+
+  document.querySelectorAll("select[data-roster]").forEach(select => {
+    if (select.disabled) {
+      return;
+    }
+    ["focus", "mousedown", "touchstart"].forEach(type => {
+      select.addEventListener(type, () => hydrate(select), {once: true, passive: true});
+    });
+  });
+}, false);
+
+window.addEventListener("DOMContentLoaded", function() {
+  const form = document.getElementById("meet-entries");
+  if (!form || !form.dataset.cellsUrl) {
+    return;
+  }
+  const status = document.getElementById("autosave-status");
+  const csrfToken = form.querySelector("[name=csrfmiddlewaretoken]").value;
+  const dirtyRows = new Set();
+  let timer = null;
+  let pending = false;
+  let stale = false;
+
+  function cellOf(row) {
+    return {
+      event: row.dataset.event,
+      order: Number(row.dataset.order),
+      athletes: Array.from(row.querySelectorAll("select"), select => select.value || null),
+      seed: row.querySelector("input[name$='-seed']").value,
+    };
+  }
+
+  function showErrors(row, errors) {
+    row.querySelectorAll(".autosave-error").forEach(element => element.remove());
+    row.querySelectorAll(".is-invalid").forEach(element => element.classList.remove("is-invalid"));
+    Object.entries(errors).forEach(([field, messages]) => {
+      const feedback = document.createElement("div");
+      feedback.className = "autosave-error invalid-feedback d-block";
+      feedback.textContent = messages.join(" ");
+      const element = row.querySelector(`[name$="-${field}"]`);
+      if (element) {
+        element.classList.add("is-invalid");
+        element.after(feedback);
+      } else {
+        row.querySelector("select").closest("td").append(feedback);
+      }
+    });
+  }
+
+  function save() {
+    if (pending) {
+      // Rows changed meanwhile stay dirty until the new version comes back
+      return;
+    }
+    pending = true;
+    const rows = new Map();
+    dirtyRows.forEach(row => rows.set(`${row.dataset.event}-${row.dataset.order}`, row));
+    dirtyRows.clear();
+    status.textContent = "Saving...";
+    fetch(form.dataset.cellsUrl, {
+      method: "POST",
+      headers: {"Content-Type": "application/json", "X-CSRFToken": csrfToken},
+      body: JSON.stringify({
+        version: Number(form.elements.version.value),
+        cells: Array.from(rows.values(), cellOf),
+      }),
+    }).then(response => {
+      if (response.status === 409) {
+        stale = true;
+        status.textContent = "These entries were saved by someone else. Reload the page before making more changes.";
+        return Promise.reject(response);
+      }
+      return response.ok ? response.json() : Promise.reject(response);
+    }).then(data => {
+      form.elements.version.value = data.version;
+      let saved = true;
+      data.cells.forEach(cell => {
+        showErrors(rows.get(`${cell.event}-${cell.order}`), cell.errors);
+        saved = saved && Object.keys(cell.errors).length === 0;
+      });
+      status.textContent = saved ? "All changes saved" : "Some entries could not be saved";
+      pending = false;
+      if (dirtyRows.size > 0) {
+        save();
+      }
+    }).catch(error => {
+      pending = false;
+      rows.forEach(row => dirtyRows.add(row));
+      if (!stale) {
+        status.textContent = "Changes not saved";
+      }
+      console.warn(error);
+    });
+  }
+
+  function markDirty(event) {
+    const row = event.target.closest("tr[data-event]");
+    if (!row) {
+      return;
+    }
+    dirtyRows.add(row);
+    if (stale) {
+      return;
+    }
+    clearTimeout(timer);
+    timer = setTimeout(save, 1000);
+  }
+
+  form.addEventListener("change", markDirty);
+  form.addEventListener("input", markDirty);
+  form.addEventListener("submit", () => clearTimeout(timer));
+}, false);
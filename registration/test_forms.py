@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.http import QueryDict
+
+from common.constants import Event
+from common.models import Athlete
+from registration.forms import MeetEntriesGrid
+
+ATHLETES = [
+    Athlete(id=athlete_id, first_name="Athlete", last_name=str(athlete_id))
+    for athlete_id in range(1, 6)
+]
+
+
+def build_grid(data: str) -> tuple[MeetEntriesGrid, list]:
+    grid = MeetEntriesGrid(ATHLETES, QueryDict(data))
+    rows = [
+        grid.add_row(Event.S_50_YARD_FREESTYLE, 0),
+        grid.add_row(Event.S_200_YARD_MEDLEY_RELAY, 0),
+    ]
+    return grid, rows
+
+
+def test_grid_shares_fields_across_rows():
+    grid, (individual, relay) = build_grid("")
+    assert individual.fields["athlete"] is relay.fields["athlete_0"]
+    assert grid.add_row(Event.S_50_YARD_FREESTYLE, 1).fields is individual.fields
+
+
+def test_grid_cleans_every_row():
+    _, (individual, relay) = build_grid(
+        "50_yard_freestyle-0-order=0&50_yard_freestyle-0-athlete=1"
+        "&50_yard_freestyle-0-seed=23.45"
+        "&200_yard_medley_relay-0-order=0&200_yard_medley_relay-0-athlete_0=2"
+        "&200_yard_medley_relay-0-seed=1:50.00"
+    )
+
+    assert individual.is_valid()
+    assert individual.cleaned_data == {
+        "order": 0,
+        "athlete": 1,
+        "seed": 2345,
+    }
+    assert not relay.is_valid()
+    assert relay.errors["athlete_1"] == ["Missing athlete"]
+
+
+def test_grid_reports_cell_errors():
+    _, (individual, _) = build_grid(
+        "50_yard_freestyle-0-order=0&50_yard_freestyle-0-athlete=99"
+        "&50_yard_freestyle-0-seed=1:2.3"
+    )
+
+    assert "athlete" in individual.errors
+    assert individual.errors["seed"] == ["Seed not formatted properly"]
@@ -0,0 +1,888 @@
+from __future__ import annotations
+
+import datetime
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from common.constants import EVENT_ORDER, INDIVIDUAL_EVENTS, Event
+from common.models import Athlete, Coach, Meet, MeetTeam, Team
+from common.testing import full_table_scans, indexes_used, query_counts
+from registration.constants import ENTRIES_PER_INDIVIDUAL_EVENT, SNAPSHOT_DIRECTORY
+from registration.managers import (
+    MeetEntriesExporter,
+    MeetEntriesManager,
+    MeetSnapshotManager,
+)
+from registration.models import MeetIndividualEntry, MeetRelayEntry
+
+MAX_FULL_PAGE_SAVE_QUERIES = 14
+
+
+def lineup_post_data(athletes: list[Athlete], seed: str) -> dict[str, str]:
+    """A full lineup of 20 athletes within the athlete entry limits"""
+    data = {}
+    individual_events = 0
+    for event in EVENT_ORDER:
+        if event in INDIVIDUAL_EVENTS:
+            for index in range(ENTRIES_PER_INDIVIDUAL_EVENT):
+                athlete = athletes[
+                    (ENTRIES_PER_INDIVIDUAL_EVENT * individual_events + index) % 20
+                ]
+                prefix = f"{event.as_prefix()}-{index}"
+                data[f"{prefix}-order"] = str(index)
+                data[f"{prefix}-athlete"] = str(athlete.id)
+                data[f"{prefix}-seed"] = seed
+            individual_events += 1
+        else:
+            prefix = f"{event.as_prefix()}-0"
+            data[f"{prefix}-order"] = "0"
+            for leg in range(4):
+                data[f"{prefix}-athlete_{leg}"] = str(athletes[16 + leg].id)
+            data[f"{prefix}-seed"] = seed
+    return data
+
+
+def add_team(meet: Meet, name: str) -> tuple[Team, list[Athlete]]:
+    """Register another team with a 50 freestyle, 500 freestyle and relay entry"""
+    team = Team.objects.create(name=name)
+    MeetTeam.objects.create(meet=meet, team=team)
+    athletes = [
+        Athlete.objects.create(first_name=name, last_name=str(i), team=team)
+        for i in range(4)
+    ]
+    for event, athlete in (
+        (Event.S_50_YARD_FREESTYLE, athletes[0]),
+        (Event.S_500_YARD_FREESTYLE, athletes[1]),
+    ):
+        MeetIndividualEntry.objects.create(
+            meet=meet, team=team, event=event, order=0, athlete=athlete, seed=3000
+        )
+    MeetRelayEntry.objects.create(
+        meet=meet,
+        team=team,
+        event=Event.S_200_YARD_FREESTYLE_RELAY,
+        order=0,
+        athlete_0=athletes[0],
+        athlete_1=athletes[1],
+        athlete_2=athletes[2],
+        athlete_3=athletes[3],
+        seed=10000,
+    )
+    return team, athletes
+
+
+class MeetEntriesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.meet = Meet.objects.create(name="Invitational", entries_open=True)
+        cls.team = Team.objects.create(name="Needham")
+        MeetTeam.objects.create(meet=cls.meet, team=cls.team)
+        cls.athletes = [
+            Athlete.objects.create(
+                first_name="Athlete", last_name=str(i), team=cls.team
+            )
+            for i in range(20)
+        ]
+        cls.coach = get_user_model().objects.create_user(
+            username="coach", password="password"
+        )
+        Coach.objects.create(team=cls.team, profile=cls.coach)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.coach)
+        self.url = reverse(
+            "edit meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+
+
+class EditMeetEntriesTest(MeetEntriesTestCase):
+    def test_full_page_save_is_bounded(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.url, lineup_post_data(self.athletes, "1:01.23")
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertLessEqual(len(context.captured_queries), MAX_FULL_PAGE_SAVE_QUERIES)
+        self.assertEqual(MeetIndividualEntry.objects.count(), 36)
+        self.assertEqual(MeetRelayEntry.objects.count(), 3)
+
+    def test_full_page_resave_is_bounded(self):
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.url,
+                lineup_post_data(self.athletes[4:] + self.athletes[:4], "59.99"),
+            )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertLessEqual(len(context.captured_queries), MAX_FULL_PAGE_SAVE_QUERIES)
+        self.assertEqual(MeetIndividualEntry.objects.count(), 36)
+        self.assertEqual(
+            set(MeetRelayEntry.objects.values_list("athlete_0", flat=True)),
+            {self.athletes[0].id},
+        )
+
+    def test_duplicate_relay_athlete_is_reported_on_form(self):
+        data = lineup_post_data(self.athletes, "1:01.23")
+        data["200_yard_medley_relay-0-athlete_1"] = str(self.athletes[16].id)
+
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Duplicate athlete")
+        self.assertFalse(
+            MeetRelayEntry.objects.filter(event="200 Yard Medley Relay").exists()
+        )
+
+    @mock.patch(
+        "registration.managers._athlete_entries_validator."
+        "MAX_INDIVIDUAL_EVENTS_PER_ATHLETE",
+        2,
+    )
+    def test_entry_limits_are_reported_on_form(self):
+        data = lineup_post_data(self.athletes, "1:01.23")
+        data["50_yard_freestyle-0-athlete"] = str(self.athletes[0].id)
+
+        response = self.client.post(self.url, data)
+
+        self.assertContains(response, "entered in more than 2 individual events")
+        self.assertEqual(MeetIndividualEntry.objects.count(), 33)
+        self.assertFalse(
+            MeetIndividualEntry.objects.filter(athlete=self.athletes[0]).exists()
+        )
+
+    def test_rolled_back_save_is_reported_for_whole_page(self):
+        data = lineup_post_data(self.athletes, "1:01.23")
+        prefix = f"{Event.S_50_YARD_FREESTYLE.as_prefix()}-3"
+        data[f"{prefix}-athlete"] = data[f"{prefix}-seed"] = ""
+        self.client.post(self.url, data)
+        late = Athlete.objects.create(
+            first_name="Late", last_name="Entry", team=self.team
+        )
+        read_entries = MeetEntriesManager.read_entries_by_event_by_order
+
+        def read_entries_before_other_save(*args, **kwargs):
+            entries_by_event_by_order = read_entries(*args, **kwargs)
+            # Another save fills the empty slot before this one writes
+            MeetIndividualEntry.objects.create(
+                meet=self.meet,
+                team=self.team,
+                event=Event.S_50_YARD_FREESTYLE,
+                order=3,
+                athlete=late,
+            )
+            return entries_by_event_by_order
+
+        data = lineup_post_data(self.athletes, "59.99")
+        with mock.patch.object(
+            MeetEntriesManager,
+            "read_entries_by_event_by_order",
+            side_effect=read_entries_before_other_save,
+        ):
+            response = self.client.post(self.url, data)
+
+        self.assertContains(response, "None of the changes were saved")
+        self.assertFalse(MeetIndividualEntry.objects.filter(seed=5999).exists())
+
+    def test_edit_page_sends_roster_once(self):
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+
+        bench = Athlete.objects.create(
+            first_name="Bench", last_name="Athlete", team=self.team
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertContains(response, 'id="roster"')
+        self.assertContains(response, str(bench), count=1)
+
+
+class ViewMeetEntriesTest(MeetEntriesTestCase):
+    def test_view_page_renders_without_forms(self):
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        Athlete.objects.create(first_name="Bench", last_name="Athlete", team=self.team)
+        url = reverse(
+            "view meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+
+        response = self.client.get(url)
+
+        self.assertNotContains(response, "<select")
+        self.assertContains(response, self.athletes[0].name)
+        self.assertNotContains(response, "Bench")
+
+
+class MeetEntriesQueryCountTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.lineup_size = 0
+
+    def grow_lineup(self, size: int) -> None:
+        for event in EVENT_ORDER:
+            if event in INDIVIDUAL_EVENTS:
+                MeetIndividualEntry.objects.bulk_create(
+                    MeetIndividualEntry(
+                        meet=self.meet,
+                        team=self.team,
+                        event=event,
+                        order=order,
+                        athlete=self.athletes[order],
+                        seed=6123,
+                    )
+                    for order in range(self.lineup_size, size)
+                )
+            elif self.lineup_size == 0:
+                MeetRelayEntry.objects.create(
+                    meet=self.meet,
+                    team=self.team,
+                    event=event,
+                    order=0,
+                    athlete_0=self.athletes[0],
+                    athlete_1=self.athletes[1],
+                    athlete_2=self.athletes[2],
+                    athlete_3=self.athletes[3],
+                    seed=10123,
+                )
+        self.lineup_size = size
+
+    def test_edit_page_queries_do_not_grow_with_lineup(self):
+        counts = query_counts(
+            lambda: self.client.get(self.url), self.grow_lineup, [1, 2, 4]
+        )
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_view_page_queries_do_not_grow_with_lineup(self):
+        url = reverse(
+            "view meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+        counts = query_counts(lambda: self.client.get(url), self.grow_lineup, [1, 2, 4])
+        self.assertEqual(len(set(counts)), 1, counts)
+
+
+class MeetEntriesQueryPlanTest(MeetEntriesTestCase):
+    def test_entries_queries_use_indexes(self):
+        data = lineup_post_data(self.athletes, "1:01.23")
+        view_url = reverse(
+            "view meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+        cells_url = reverse(
+            "save meet entry cells",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+        cell = {"event": "50 Yard Freestyle", "order": 1, "athletes": [], "seed": ""}
+        for request in (
+            lambda: self.client.post(self.url, data),
+            lambda: self.client.post(self.url, data),
+            lambda: self.client.get(self.url),
+            lambda: self.client.get(view_url),
+            lambda: self.client.post(
+                cells_url, {"cells": [cell]}, content_type="application/json"
+            ),
+        ):
+            self.assertEqual(full_table_scans(request), [])
+
+    def test_authorization_uses_coach_index(self):
+        assert "coach_profile_idx" in indexes_used(
+            lambda: MeetEntriesManager.validate_request(
+                self.coach, self.meet.id, self.team.id
+            )
+        )
+
+    def test_official_queries_use_indexes(self):
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+        cache.clear()
+        for url in (
+            reverse(
+                "export meet entries", kwargs={"meet_id": self.meet.id, "format": "csv"}
+            ),
+            reverse(
+                "export meet entries",
+                kwargs={"meet_id": self.meet.id, "format": "sdif"},
+            ),
+            reverse("meet sheets", kwargs={"meet_id": self.meet.id, "kind": "heat"}),
+        ):
+            self.assertEqual(
+                full_table_scans(lambda: list(self.client.get(url))), [], url
+            )
+
+
+class MeetEntriesAuthorizationTest(MeetEntriesTestCase):
+    def test_unknown_meet_is_not_found(self):
+        url = reverse(
+            "view meet entries", kwargs={"meet_id": 0, "team_id": self.team.id}
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_unregistered_team_is_not_found(self):
+        team = Team.objects.create(name="Wellesley")
+        Coach.objects.create(team=team, profile=self.coach)
+        url = reverse(
+            "view meet entries", kwargs={"meet_id": self.meet.id, "team_id": team.id}
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_other_coach_is_denied(self):
+        self.client.force_login(
+            get_user_model().objects.create_user(username="other", password="other")
+        )
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_removed_coach_is_denied(self):
+        Coach.objects.filter(profile=self.coach).delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_authorization_is_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            MeetEntriesManager.validate_request(self.coach, self.meet.id, self.team.id)
+        self.assertEqual(len(context.captured_queries), 1)
+
+
+class SaveMeetEntryCellsTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cells_url = reverse(
+            "save meet entry cells",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+
+    def post_cells(self, *cells: dict, version: int = 0):
+        return self.client.post(
+            self.cells_url,
+            {"version": version, "cells": list(cells)},
+            content_type="application/json",
+        )
+
+    def test_saves_and_clears_a_cell(self):
+        cell = {
+            "event": "50 Yard Freestyle",
+            "order": 1,
+            "athletes": [self.athletes[0].id],
+            "seed": "23.45",
+        }
+        response = self.post_cells(cell)
+
+        self.assertEqual(
+            response.json(),
+            {
+                "version": 1,
+                "cells": [{"event": "50 Yard Freestyle", "order": 1, "errors": {}}],
+            },
+        )
+        entry = MeetIndividualEntry.objects.get()
+        self.assertEqual((entry.order, entry.seed), (1, 2345))
+
+        self.post_cells({**cell, "athletes": [None], "seed": ""}, version=1)
+
+        self.assertFalse(MeetIndividualEntry.objects.exists())
+
+    def test_reports_cell_errors(self):
+        response = self.post_cells(
+            {
+                "event": "200 Yard Medley Relay",
+                "order": 0,
+                "athletes": [self.athletes[0].id, self.athletes[1].id],
+                "seed": "1:5",
+            }
+        )
+
+        errors = response.json()["cells"][0]["errors"]
+        self.assertEqual(errors["athlete_2"], ["Missing athlete"])
+        self.assertEqual(errors["seed"], ["Seed not formatted properly"])
+        self.assertFalse(MeetRelayEntry.objects.exists())
+
+    def test_rejects_malformed_cells(self):
+        response = self.post_cells({"event": "50 Yard Freestyle", "order": 9})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_stale_version(self):
+        MeetTeam.objects.update(version=3)
+
+        response = self.post_cells(
+            {
+                "event": "50 Yard Freestyle",
+                "order": 0,
+                "athletes": [self.athletes[0].id],
+                "seed": "",
+            },
+            version=2,
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["version"], 3)
+        self.assertFalse(MeetIndividualEntry.objects.exists())
+
+
+class ConcurrentEditTest(MeetEntriesTestCase):
+    def test_stale_save_shows_saved_entries(self):
+        data = lineup_post_data(self.athletes, "1:01.23")
+        self.client.post(self.url, {**data, "version": "0"})
+
+        response = self.client.post(
+            self.url,
+            {
+                **lineup_post_data(self.athletes[4:] + self.athletes[:4], "59.99"),
+                "version": "0",
+            },
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, "saved by someone else", status_code=409)
+        self.assertContains(response, "Saved:", status_code=409)
+        self.assertEqual(
+            MeetIndividualEntry.objects.get(event="50 Yard Freestyle", order=0).athlete,
+            self.athletes[12],
+        )
+
+    def test_saves_bump_the_version(self):
+        self.client.post(
+            self.url, {**lineup_post_data(self.athletes, "1:01.23"), "version": "0"}
+        )
+        response = self.client.post(
+            self.url,
+            {
+                **lineup_post_data(self.athletes[4:] + self.athletes[:4], "59.99"),
+                "version": "1",
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(MeetTeam.objects.get().version, 2)
+
+
+class ExportMeetEntriesTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+
+    def export(self, format: str):
+        url = reverse(
+            "export meet entries", kwargs={"meet_id": self.meet.id, "format": format}
+        )
+        return self.client.get(url)
+
+    def test_csv_streams_every_entry(self):
+        response = self.export("csv")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1 + 36 + 3)
+        self.assertEqual(
+            lines[1 + ENTRIES_PER_INDIVIDUAL_EVENT],
+            "Needham,200 Yard Medley Relay,0,"
+            "Athlete 16,Athlete 17,Athlete 18,Athlete 19,1:01.23",
+        )
+
+    def test_sdif_records_are_fixed_width(self):
+        response = self.export("sdif")
+
+        records = b"".join(response.streaming_content).decode().split("\r\n")[:-1]
+        self.assertTrue(all(len(record) == 160 for record in records))
+        codes = [record[:2] for record in records]
+        self.assertEqual(codes[:3], ["A0", "B1", "C1"])
+        self.assertEqual(codes[-1], "Z0")
+        self.assertEqual(codes.count("D0"), 32)
+        self.assertEqual(codes.count("F0"), 12)
+
+    def test_export_queries_do_not_grow_with_meet(self):
+        with CaptureQueriesContext(connection) as context:
+            b"".join(self.export("csv").streaming_content)
+        self.assertLessEqual(len(context.captured_queries), 3 + len(EVENT_ORDER))
+
+    def test_sdif_individual_records_follow_their_team(self):
+        add_team(self.meet, "Alpha")
+
+        records = b"".join(self.export("sdif").streaming_content).decode().split("\r\n")
+        team_codes = []
+        team = None
+        for record in records:
+            if record.startswith("C1"):
+                team = record[11:17].strip()
+                team_codes.append(team)
+            elif record.startswith("D0"):
+                self.assertEqual(
+                    team, "ALPHA" if "Alpha" in record[11:39] else "NEEDHA"
+                )
+        self.assertEqual(team_codes, ["ALPHA", "NEEDHA"])
+
+    def test_coach_is_denied(self):
+        self.client.force_login(self.coach)
+        self.assertEqual(self.export("csv").status_code, 403)
+
+
+class ImportMeetEntriesTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.import_url = reverse(
+            "import meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+
+    def export(self, format: str) -> str:
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        if format == "csv":
+            content = "".join(MeetEntriesExporter.csv_lines(self.meet))
+        else:
+            content = "".join(MeetEntriesExporter.sdif_lines(self.meet))
+        MeetIndividualEntry.objects.update(deleted=True)
+        MeetRelayEntry.objects.update(deleted=True)
+        return content
+
+    def import_file(self, name: str, content: str):
+        return self.client.post(
+            self.import_url, {"entries": SimpleUploadedFile(name, content.encode())}
+        )
+
+    def test_csv_round_trips_export(self):
+        content = self.export("csv")
+
+        with CaptureQueriesContext(connection) as context:
+            self.import_file("entries.csv", content)
+
+        self.assertEqual(MeetIndividualEntry.objects.count(), 36)
+        self.assertEqual(MeetRelayEntry.objects.count(), 3)
+        self.assertEqual(MeetTeam.objects.get().version, 2)
+        self.assertLessEqual(len(context.captured_queries), 16)
+
+    def test_sdif_round_trips_export(self):
+        self.import_file("entries.sd3", self.export("sdif"))
+
+        self.assertEqual(MeetIndividualEntry.objects.count(), 32)
+        relay = MeetRelayEntry.objects.get(event="200 Yard Medley Relay")
+        self.assertEqual(relay.athlete_3_id, self.athletes[19].id)
+        self.assertEqual(relay.seed, 6123)
+
+    def test_sdif_round_trips_meet_export(self):
+        alpha, alpha_athletes = add_team(self.meet, "Alpha")
+        content = self.export("sdif")
+
+        self.import_file("entries.sd3", content)
+        self.import_url = reverse(
+            "import meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": alpha.id},
+        )
+        Coach.objects.create(team=alpha, profile=self.coach)
+        self.import_file("entries.sd3", content)
+
+        self.assertEqual(MeetIndividualEntry.objects.filter(team=self.team).count(), 32)
+        self.assertEqual(
+            set(
+                MeetIndividualEntry.objects.filter(team=alpha).values_list(
+                    "event", "athlete"
+                )
+            ),
+            {
+                ("50 Yard Freestyle", alpha_athletes[0].id),
+                ("500 Yard Freestyle", alpha_athletes[1].id),
+            },
+        )
+        relay = MeetRelayEntry.objects.get(team=alpha)
+        self.assertEqual(relay.athlete_3_id, alpha_athletes[3].id)
+        self.assertEqual(MeetRelayEntry.objects.filter(team=self.team).count(), 3)
+
+    def test_invalid_file_writes_nothing(self):
+        content = (
+            "Event,Order,Athlete 1,Athlete 2,Athlete 3,Athlete 4,Seed\n"
+            "50 Yard Freestyle,0,Athlete 0,,,,23.45\n"
+            "50 Yard Freestyle,0,Athlete 1,,,,23.45\n"
+            "200 Yard Medley Relay,0,Athlete 0,Athlete 0,Athlete 1,Nobody,1:50.00\n"
+        )
+
+        response = self.import_file("entries.csv", content)
+
+        errors = [str(message) for message in response.wsgi_request._messages]
+        self.assertIn("Line 2: Entry already exists", errors)
+        self.assertIn("Line 3: Entry already exists", errors)
+        self.assertIn("Line 4: Athlete Nobody not on roster", errors)
+        self.assertIn("Line 4: Duplicate athlete", errors)
+        self.assertFalse(MeetIndividualEntry.objects.exists())
+
+
+class MeetSheetsTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+        self.sheets_url = reverse(
+            "meet sheets", kwargs={"meet_id": self.meet.id, "kind": "heat"}
+        )
+
+    def test_sheets_are_cached_until_entries_change(self):
+        self.client.get(self.sheets_url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.sheets_url)
+
+        self.assertContains(response, "Heat 1 of 1")
+        self.assertFalse(
+            any(
+                "registration_meet" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+        entry = MeetIndividualEntry.objects.filter(event="50 Yard Freestyle").first()
+        entry.seed = 2001
+        entry.save()
+
+        self.assertContains(self.client.get(self.sheets_url), "20.01")
+
+    def test_coach_is_denied(self):
+        self.client.force_login(self.coach)
+        self.assertEqual(self.client.get(self.sheets_url).status_code, 403)
+
+
+class MeetSnapshotTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.snapshots = Path(media_root.name) / SNAPSHOT_DIRECTORY
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, lineup_post_data(self.athletes, "1:01.23"))
+        self.live_csv = "".join(MeetEntriesExporter.csv_lines(self.meet))
+        self.set_entries_open(False)
+
+    def set_entries_open(self, entries_open: bool) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.meet.entries_open = entries_open
+            self.meet.save()
+
+    def entry_queries(self, url: str) -> tuple[str, list[str]]:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            content = b"".join(
+                response.streaming_content if response.streaming else [response.content]
+            )
+        return content.decode(), [
+            query["sql"]
+            for query in context.captured_queries
+            if MeetIndividualEntry._meta.db_table in query["sql"]
+            or MeetRelayEntry._meta.db_table in query["sql"]
+        ]
+
+    def test_closing_entries_publishes_snapshot(self):
+        self.assertEqual(
+            [path.name for path in self.snapshots.iterdir()],
+            [f"meet-{self.meet.id}-v1.json.gz"],
+        )
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+
+        content, queries = self.entry_queries(
+            reverse(
+                "export meet entries", kwargs={"meet_id": self.meet.id, "format": "csv"}
+            )
+        )
+        self.assertEqual(content, self.live_csv)
+        self.assertEqual(queries, [])
+        content, queries = self.entry_queries(
+            reverse("meet sheets", kwargs={"meet_id": self.meet.id, "kind": "heat"})
+        )
+        self.assertIn("1:01.23", content)
+        self.assertEqual(queries, [])
+
+    def test_sdif_export_reads_snapshot_team_by_team(self):
+        self.set_entries_open(True)
+        add_team(self.meet, "Alpha")
+        live_sdif = "".join(MeetEntriesExporter.sdif_lines(self.meet))
+        self.set_entries_open(False)
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+
+        content, queries = self.entry_queries(
+            reverse(
+                "export meet entries",
+                kwargs={"meet_id": self.meet.id, "format": "sdif"},
+            )
+        )
+        self.assertEqual(content, live_sdif)
+        self.assertEqual(queries, [])
+
+    def test_view_page_reads_snapshot(self):
+        content, queries = self.entry_queries(
+            reverse(
+                "view meet entries",
+                kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+            )
+        )
+        self.assertIn(self.athletes[0].name, content)
+        self.assertIn("1:01.23", content)
+        self.assertEqual(queries, [])
+
+    def test_reopening_entries_rebuilds_snapshot(self):
+        self.set_entries_open(True)
+        self.client.post(self.url, lineup_post_data(self.athletes, "59.99"))
+        self.set_entries_open(False)
+
+        self.assertEqual(
+            [path.name for path in self.snapshots.iterdir()],
+            [f"meet-{self.meet.id}-v2.json.gz"],
+        )
+        snapshot = MeetSnapshotManager.load(self.meet)
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual({row.seed for row in snapshot.rows}, {5999})
+
+    def test_entry_writes_publish_next_version(self):
+        view_url = reverse(
+            "view meet entries",
+            kwargs={"meet_id": self.meet.id, "team_id": self.team.id},
+        )
+        self.assertNotIn("20.01", self.client.get(view_url).content.decode())
+
+        entry = MeetIndividualEntry.objects.filter(event="50 Yard Freestyle").first()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            entry.seed = 2001
+            entry.save()
+            MeetRelayEntry.objects.first().delete()
+
+        self.assertEqual(len(callbacks), 1)
+        snapshot = MeetSnapshotManager.load(self.meet)
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual(len(snapshot.rows), 36 + 3 - 1)
+        self.assertIn("20.01", self.client.get(view_url).content.decode())
+
+    def test_entry_writes_to_open_meet_keep_snapshot(self):
+        self.set_entries_open(True)
+        with self.captureOnCommitCallbacks(execute=True):
+            MeetRelayEntry.objects.first().delete()
+
+        self.assertEqual(
+            [path.name for path in self.snapshots.iterdir()],
+            [f"meet-{self.meet.id}-v1.json.gz"],
+        )
+
+    def test_missing_snapshot_is_built_on_read(self):
+        for path in self.snapshots.iterdir():
+            path.unlink()
+
+        snapshot = MeetSnapshotManager.load(self.meet)
+
+        self.assertEqual(len(snapshot.team_rows(self.team.id)), 36 + 3)
+        self.assertEqual(snapshot.team_rows(self.team.id + 1), [])
+        self.assertIsNone(
+            MeetSnapshotManager.load(
+                Meet.objects.create(name="Open", entries_open=True)
+            )
+        )
+
+
+class PurgeEntriesTest(MeetEntriesTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        data = lineup_post_data(self.athletes, "1:01.23")
+        self.client.post(self.url, data)
+        # Clearing an event soft-deletes its entries
+        for index in range(ENTRIES_PER_INDIVIDUAL_EVENT):
+            prefix = f"{Event.S_50_YARD_FREESTYLE.as_prefix()}-{index}"
+            data[f"{prefix}-athlete"] = data[f"{prefix}-seed"] = ""
+        self.client.post(self.url, data)
+
+    def test_queryset_delete_is_one_update(self):
+        entries = MeetIndividualEntry.objects.filter(event="100 Yard Freestyle")
+        with CaptureQueriesContext(connection) as context:
+            count, _ = entries.delete()
+
+        self.assertEqual(count, ENTRIES_PER_INDIVIDUAL_EVENT)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("UPDATE"))
+        self.assertFalse(entries.exists())
+        self.assertTrue(
+            MeetIndividualEntry.all_objects.filter(
+                event="100 Yard Freestyle", deleted_at__isnull=False
+            ).exists()
+        )
+
+    def test_purges_old_deleted_entries(self):
+        deleted = MeetIndividualEntry.all_objects.filter(deleted=True)
+        self.assertTrue(deleted.exists())
+
+        call_command("purgeentries", stdout=StringIO(), stderr=StringIO())
+        self.assertTrue(deleted.exists())
+        call_command("purgeentries", days=0, stdout=StringIO(), stderr=StringIO())
+
+        self.assertFalse(deleted.exists())
+        self.assertEqual(
+            MeetIndividualEntry.objects.count(), 36 - ENTRIES_PER_INDIVIDUAL_EVENT
+        )
+
+    def test_archives_past_seasons(self):
+        export_url = reverse(
+            "export meet entries", kwargs={"meet_id": self.meet.id, "format": "csv"}
+        )
+        current_meet = Meet.objects.create(
+            name="Current", start_date=timezone.localdate()
+        )
+        MeetIndividualEntry.objects.create(
+            meet=current_meet,
+            team=self.team,
+            event="50 Yard Freestyle",
+            order=0,
+            athlete=self.athletes[0],
+        )
+        self.meet.start_date = self.meet.end_date = datetime.date(2020, 1, 1)
+        self.meet.entries_open = False
+        self.meet.save()
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="official", password="official", is_official=True
+            )
+        )
+        content = b"".join(self.client.get(export_url).streaming_content)
+
+        call_command("purgeentries", archive=True, stdout=StringIO(), stderr=StringIO())
+        # Served from the archive once the snapshots are gone
+        shutil.rmtree(Path(settings.MEDIA_ROOT) / SNAPSHOT_DIRECTORY)
+
+        self.assertFalse(
+            MeetIndividualEntry.all_objects.filter(meet=self.meet).exists()
+        )
+        self.assertFalse(MeetRelayEntry.all_objects.exists())
+        self.assertTrue(MeetIndividualEntry.objects.filter(meet=current_meet).exists())
+        self.assertEqual(
+            b"".join(self.client.get(export_url).streaming_content), content
+        )
@@ -10,11 +10,31 @@ urlpatterns = [
         views.edit_meet_entries,
         name="edit meet entries",
     ),
+    path(
+        "entries/meet/<int:meet_id>/team/<int:team_id>/cells",
+        views.save_meet_entry_cells,
+        name="save meet entry cells",
+    ),
+    path(
+        "entries/meet/<int:meet_id>/team/<int:team_id>/import",
+        views.import_meet_entries,
+        name="import meet entries",
+    ),
     path(
         "entries/meet/<int:meet_id>/team/<int:team_id>/view",
         views.view_meet_entries,
         name="view meet entries",
     ),
+    path(
+        "entries/meet/<int:meet_id>/export/<str:format>",
+        views.export_meet_entries,
+        name="export meet entries",
+    ),
+    path(
+        "entries/meet/<int:meet_id>/sheets/<str:kind>",
+        views.meet_sheets,
+        name="meet sheets",
+    ),
     path(
         "teams/join",
         views.team_coach_status,
@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+import json
+import re
 from typing import TYPE_CHECKING
 
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import Http404
-from django.shortcuts import redirect, render
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
+from common import utils
+from common.access import UserAccess
 from common.admin import TeamAdmin
 from common.constants import EVENT_ORDER
 from common.models import Coach, Meet, Team
 from common.tables.columns import Column
 from common.tables.paginator import PaginatedSearchRenderer
 from registration.admin import CoachRequestAdmin
-from registration.managers import MeetEntriesManager
+from registration.managers import (
+    ImportEntriesError,
+    MeetEntriesExporter,
+    MeetEntriesImporter,
+    MeetEntriesManager,
+    MeetSeedingManager,
+    MeetSnapshotManager,
+    StaleEntriesError,
+)
 from registration.models import Athlete, CoachRequest
 
 if TYPE_CHECKING:
@@ -24,10 +38,9 @@ if TYPE_CHECKING:
 @login_required
 @require_http_methods(["GET", "POST"])
 def edit_meet_entries(request: HttpRequest, meet_id: int, team_id: int) -> HttpResponse:
-    MeetEntriesManager.validate_request(request.user, meet_id, team_id)
-
-    meet = Meet.objects.filter(id=meet_id).get()
-    team = Team.objects.filter(id=team_id).get()
+    meet_team = MeetEntriesManager.validate_request(request.user, meet_id, team_id)
+    meet = meet_team.meet
+    team = meet_team.team
 
     if not meet.entries_open:
         return redirect("view meet entries", meet_id=meet_id, team_id=team_id)
@@ -40,12 +53,31 @@ def edit_meet_entries(request: HttpRequest, meet_id: int, team_id: int) -> HttpR
         request, EVENT_ORDER, entries_by_event_by_order, athlete_choices
     )
 
+    version = meet_team.version
+    conflict = False
+    grid = sections[0]["forms"][0].grid
     if request.method == "POST":
-        MeetEntriesManager.update_entries(
-            meet_id, team_id, sections, entries_by_event_by_order
-        )
-        if not any(form.errors for section in sections for form in section["forms"]):
-            return redirect("edit meet entries", meet_id=meet_id, team_id=team_id)
+        try:
+            version = MeetEntriesManager.update_entries(
+                meet_id,
+                team_id,
+                sections,
+                entries_by_event_by_order,
+                utils.as_int(request.POST.get("version"), version),
+            )
+        except StaleEntriesError:
+            conflict = True
+            MeetEntriesManager.attach_saved_entries(
+                sections,
+                MeetEntriesManager.read_entries_by_event_by_order(
+                    meet_id, team_id, with_athletes=True
+                ),
+            )
+            meet_team.refresh_from_db(fields=["version"])
+            version = meet_team.version
+        else:
+            if not grid.errors and not any(form.errors for form in grid.rows):
+                return redirect("edit meet entries", meet_id=meet_id, team_id=team_id)
 
     return render(
         request,
@@ -54,34 +86,90 @@ def edit_meet_entries(request: HttpRequest, meet_id: int, team_id: int) -> HttpR
             "meet_name": meet.name,
             "team_name": team.name,
             "sections": sections,
+            "roster": MeetEntriesManager.build_roster(athlete_choices),
             "view_only": False,
             "meet_id": meet_id,
             "team_id": team_id,
+            "version": version,
+            "conflict": conflict,
+            "errors": grid.errors,
         },
+        status=409 if conflict else 200,
     )
 
 
+@login_required
+@require_http_methods(["POST"])
+def save_meet_entry_cells(
+    request: HttpRequest, meet_id: int, team_id: int
+) -> JsonResponse:
+    meet_team = MeetEntriesManager.validate_request(request.user, meet_id, team_id)
+    if not meet_team.meet.entries_open:
+        raise PermissionDenied("Entries are closed for the meet")
+
+    try:
+        body = json.loads(request.body)
+        version, results = MeetEntriesManager.update_cells(
+            meet_id, team_id, body["cells"], body.get("version")
+        )
+    except StaleEntriesError:
+        meet_team.refresh_from_db(fields=["version"])
+        return JsonResponse(
+            {"error": "Entries changed", "version": meet_team.version}, status=409
+        )
+    except (KeyError, TypeError, ValueError):
+        return JsonResponse({"error": "Malformed cells"}, status=400)
+    return JsonResponse({"version": version, "cells": results})
+
+
+@login_required
+@require_http_methods(["POST"])
+def import_meet_entries(
+    request: HttpRequest, meet_id: int, team_id: int
+) -> HttpResponse:
+    meet_team = MeetEntriesManager.validate_request(request.user, meet_id, team_id)
+    if not meet_team.meet.entries_open:
+        raise PermissionDenied
+
+    upload = request.FILES.get("entries")
+    if upload is None:
+        messages.error(request, "Choose a file to import")
+        return redirect("edit meet entries", meet_id=meet_id, team_id=team_id)
+    format = "csv" if upload.name.lower().endswith(".csv") else "sdif"
+    try:
+        count = MeetEntriesImporter.import_entries(
+            meet_team, upload.read().decode("utf-8-sig", errors="replace"), format
+        )
+    except ImportEntriesError as e:
+        for error in e.errors:
+            messages.error(request, error)
+    else:
+        messages.success(request, f"Imported {count} entries")
+    return redirect("edit meet entries", meet_id=meet_id, team_id=team_id)
+
+
 @login_required
 @require_http_methods(["GET"])
 def view_meet_entries(request: HttpRequest, meet_id: int, team_id: int) -> HttpResponse:
-    MeetEntriesManager.validate_request(request.user, meet_id, team_id)
+    meet_team = MeetEntriesManager.validate_request(request.user, meet_id, team_id)
+    meet = meet_team.meet
+    team = meet_team.team
 
-    meet = Meet.objects.filter(id=meet_id).get()
-    team = Team.objects.filter(id=team_id).get()
-
-    athlete_choices = list(Athlete.objects.filter(team__id=team_id, active=True))
-    entries_by_event_by_order = MeetEntriesManager.read_entries_by_event_by_order(
-        meet_id, team_id
-    )
-    sections = MeetEntriesManager.build_event_sections(
-        request, EVENT_ORDER, entries_by_event_by_order, athlete_choices
+    snapshot = MeetSnapshotManager.load(meet)
+    if snapshot is None:
+        rows_by_event_by_order = MeetEntriesManager.read_only_rows(
+            MeetEntriesManager.read_entries_by_event_by_order(
+                meet_id, team_id, with_athletes=True
+            )
+        )
+    else:
+        rows_by_event_by_order = MeetEntriesManager.read_only_rows_from_export(
+            snapshot.team_rows(team_id)
+        )
+    sections = MeetEntriesManager.build_read_only_sections(
+        EVENT_ORDER, rows_by_event_by_order
     )
 
-    for section in sections:
-        for form in section["forms"]:
-            for key in form.fields.keys():
-                form.fields[key].disabled = True
-
     return render(
         request,
         "meet-entries.html",
@@ -94,6 +182,64 @@ def view_meet_entries(request: HttpRequest, meet_id: int, team_id: int) -> HttpR
     )
 
 
+@login_required
+@require_http_methods(["GET"])
+def export_meet_entries(
+    request: HttpRequest, meet_id: int, format: str
+) -> HttpResponse:
+    access = UserAccess.for_request(request)
+    if not access.is_superuser and not access.is_official:
+        raise PermissionDenied
+    meet = get_object_or_404(Meet, id=meet_id)
+
+    if format == "csv":
+        lines = MeetEntriesExporter.csv_lines(meet, MeetSnapshotManager.rows(meet))
+        content_type = "text/csv"
+    elif format == "sdif":
+        lines = MeetEntriesExporter.sdif_lines(
+            meet, MeetSnapshotManager.rows(meet, by_team=True)
+        )
+        content_type = "text/plain"
+    else:
+        raise Http404("Unknown export format")
+
+    filename = re.sub(r"[^\w-]", "_", meet.name) + f".{format}"
+    return StreamingHttpResponse(
+        lines,
+        content_type=content_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@login_required
+@require_http_methods(["GET"])
+def meet_sheets(request: HttpRequest, meet_id: int, kind: str) -> HttpResponse:
+    access = UserAccess.for_request(request)
+    if not access.is_superuser and not access.is_official:
+        raise PermissionDenied
+    if kind not in ("psych", "heat"):
+        raise Http404("Unknown sheet")
+    meet = get_object_or_404(Meet, id=meet_id)
+
+    method = request.GET.get("method", MeetSeedingManager.STANDARD)
+    if method not in MeetSeedingManager.METHODS:
+        method = MeetSeedingManager.STANDARD
+    sheets = MeetSeedingManager.build_sheets(meet, method)
+
+    return render(
+        request,
+        "meet-sheets.html",
+        {
+            "meet_name": meet.name,
+            "meet_id": meet_id,
+            "kind": kind,
+            "method": method,
+            "methods": MeetSeedingManager.METHODS,
+            "sheets": sheets,
+        },
+    )
+
+
 @login_required
 @require_http_methods(["GET", "POST"])
 def team_coach_status(request: HttpRequest) -> HttpResponse:
@@ -146,10 +292,16 @@ def coach_requests(request: HttpRequest) -> HttpResponse:
         ),
     ]
     renderer = PaginatedSearchRenderer(
-        request, CoachRequest, CoachRequestAdmin, "Coach Requests", columns
+        request,
+        CoachRequest,
+        CoachRequestAdmin,
+        "Coach Requests",
+        columns,
+        keyset=True,
     )
 
-    if not request.user.is_superuser:
-        renderer.objects = renderer.objects.filter(team__in=request.user.teams.all())
+    access = UserAccess.for_request(request)
+    if not access.is_superuser:
+        renderer.objects = renderer.objects.filter(team_id__in=access.team_ids)
 
     return renderer.render()
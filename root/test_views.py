@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.models import Coach, Meet, MeetTeam, Team
+from common.testing import full_table_scans, query_counts
+from registration.models import CoachRequest
+
+
+class ListingQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.superuser = get_user_model().objects.create_superuser(
+            username="admin", password="password"
+        )
+        cls.teams = [Team.objects.create(name=f"Team {i}") for i in range(3)]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.superuser)
+
+    def add_meets(self, size: int) -> None:
+        for i in range(Meet.objects.count(), size):
+            meet = Meet.objects.create(name=f"Meet {i}")
+            for team in self.teams:
+                MeetTeam.objects.create(meet=meet, team=team)
+
+    def add_coach_requests(self, size: int) -> None:
+        for i in range(CoachRequest.objects.count(), size):
+            profile = get_user_model().objects.create_user(username=f"coach {i}")
+            CoachRequest.objects.create(team=self.teams[i % 3], profile=profile)
+
+    def add_teams(self, size: int) -> None:
+        for i in range(Team.objects.count(), size):
+            team = Team.objects.create(name=f"Team {i}")
+            if i % 2:
+                Coach.objects.create(team=team, profile=self.superuser)
+
+    def test_all_meets_queries_do_not_grow_with_page(self):
+        counts = query_counts(
+            lambda: self.client.get(reverse("all meets")), self.add_meets, [1, 5, 15]
+        )
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_coach_requests_queries_do_not_grow_with_page(self):
+        counts = query_counts(
+            lambda: self.client.get(reverse("coach requests")),
+            self.add_coach_requests,
+            [1, 5, 15],
+        )
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_team_coach_status_queries_do_not_grow_with_page(self):
+        counts = query_counts(
+            lambda: self.client.get(reverse("team coach status")),
+            self.add_teams,
+            [4, 8, 15],
+        )
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_registered_teams_are_counted(self):
+        self.add_meets(2)
+        response = self.client.get(reverse("all meets"))
+        self.assertContains(response, "View Registered Teams (3)", count=2)
+
+
+class ListingQueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.meet = Meet.objects.create(name="Invitational")
+        cls.team = Team.objects.create(name="Needham")
+        MeetTeam.objects.create(meet=cls.meet, team=cls.team)
+        cls.coach = get_user_model().objects.create_user(username="coach")
+        Coach.objects.create(team=cls.team, profile=cls.coach)
+        CoachRequest.objects.create(team=cls.team, profile=cls.coach)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def assert_no_full_table_scans(self, urls: list[str]) -> None:
+        for url in urls:
+            self.assertEqual(full_table_scans(lambda: self.client.get(url)), [], url)
+
+    def test_public_listings_use_indexes(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser(username="admin")
+        )
+        self.assert_no_full_table_scans(
+            [
+                reverse("all meets"),
+                reverse("all teams"),
+                reverse("all teams") + "?q=needham",
+                reverse("teams for meet", kwargs={"meet_id": self.meet.id}),
+                reverse("meets for team", kwargs={"team_id": self.team.id}),
+            ]
+        )
+
+    def test_coach_listings_use_indexes(self):
+        # Superusers page through every coach request in primary key order instead
+        self.client.force_login(self.coach)
+        self.assert_no_full_table_scans(
+            [
+                reverse("my meets"),
+                reverse("team coach status"),
+                reverse("coach requests"),
+            ]
+        )
+
+
+class TeamHistoryQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.team = Team.objects.create(name="Needham")
+        cls.coach = get_user_model().objects.create_user(
+            username="coach", password="password"
+        )
+        Coach.objects.create(team=cls.team, profile=cls.coach)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.coach)
+
+    def add_meets(self, size: int) -> None:
+        for i in range(Meet.objects.count(), size):
+            meet = Meet.objects.create(name=f"Meet {i}")
+            MeetTeam.objects.create(meet=meet, team=self.team)
+
+    def test_my_meets_queries_do_not_grow_with_history(self):
+        counts = query_counts(
+            lambda: self.client.get(reverse("my meets")), self.add_meets, [1, 20, 40]
+        )
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_meets_for_team_queries_do_not_grow_with_history(self):
+        url = reverse("meets for team", kwargs={"team_id": self.team.id})
+        counts = query_counts(lambda: self.client.get(url), self.add_meets, [1, 20, 40])
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_entries_links_use_page_ids(self):
+        self.add_meets(2)
+        meet = Meet.objects.get(name="Meet 1")
+        for url in (
+            reverse("my meets"),
+            reverse("meets for team", kwargs={"team_id": self.team.id}),
+            reverse("teams for meet", kwargs={"meet_id": meet.id}),
+        ):
+            self.assertContains(
+                self.client.get(url),
+                f"/registration/entries/meet/{meet.id}/team/{self.team.id}/edit",
+            )
+
+
+class ListingCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.meet = Meet.objects.create(name="Invitational")
+        cls.team = Team.objects.create(name="Needham")
+        cls.meet_team = MeetTeam.objects.create(meet=cls.meet, team=cls.team)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_anonymous_listings_are_served_from_cache(self):
+        for url in (
+            reverse("all meets"),
+            reverse("all teams"),
+            reverse("teams for meet", kwargs={"meet_id": self.meet.id}),
+            reverse("meets for team", kwargs={"team_id": self.team.id}),
+        ):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url)
+            # At most the lookup of the meet or team named in the url
+            self.assertLessEqual(len(context.captured_queries), 1)
+            self.assertContains(
+                response, "Needham" if "teams" in url else "Invitational"
+            )
+
+    def test_saves_and_soft_deletes_invalidate_cache(self):
+        url = reverse("all meets")
+        self.assertContains(self.client.get(url), "View Registered Teams (1)")
+
+        team = Team.objects.create(name="Wellesley")
+        MeetTeam.objects.create(meet=self.meet, team=team)
+        self.assertContains(self.client.get(url), "View Registered Teams (2)")
+
+        self.meet.name = "Championship"
+        self.meet.save()
+        self.assertContains(self.client.get(url), "Championship")
+
+        self.meet.delete()
+        self.assertNotContains(self.client.get(url), "Championship")
+
+    def test_cache_is_split_by_auth_bucket(self):
+        url = reverse("all meets")
+        superuser = get_user_model().objects.create_superuser(username="admin")
+        self.client.force_login(superuser)
+        self.assertContains(self.client.get(url), "Psych Sheet")
+        self.client.logout()
+        self.assertNotContains(self.client.get(url), "Psych Sheet")
+
+        url = reverse("teams for meet", kwargs={"meet_id": self.meet.id})
+        coach, other_coach = [
+            get_user_model().objects.create_user(username=name)
+            for name in ("coach", "other coach")
+        ]
+        Coach.objects.create(team=self.team, profile=coach)
+        Coach.objects.create(
+            team=Team.objects.create(name="Dover"), profile=other_coach
+        )
+        self.client.force_login(coach)
+        self.assertContains(self.client.get(url), "View Entries")
+        self.client.force_login(other_coach)
+        self.assertNotContains(self.client.get(url), "View Entries")
+
+    def test_partial_results_are_cached(self):
+        url = reverse("all teams") + "?partial=html"
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(url), "Needham")
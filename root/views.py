@@ -3,17 +3,23 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, TypeVar
 
 from django.contrib.auth.decorators import login_required
+from django.http import Http404
 
+from common.access import UserAccess
 from common.admin import MeetAdmin, MeetTeamAdmin, TeamAdmin
-from common.models import Meet, MeetTeam, SoftDeleteModel, Team
+from common.models import Coach, Meet, MeetTeam, SoftDeleteModel, Team
 from common.tables.columns import Column
 from common.tables.paginator import PaginatedSearchRenderer
 
 if TYPE_CHECKING:
-    from django.http import Http404, HttpRequest, HttpResponse
+    from django.http import HttpRequest, HttpResponse
 
 M = TypeVar("M", bound=SoftDeleteModel)
 
+# The tables read by the public listings, whose cached results any write expires.
+# Coaches are cached per user, and see entries links for the teams they coach.
+PUBLIC_LISTING_MODELS = [Meet, Team, MeetTeam, Coach]
+
 
 def all_meets(request: HttpRequest) -> HttpResponse:
     columns = [
@@ -22,24 +28,38 @@ def all_meets(request: HttpRequest) -> HttpResponse:
         Column.END_DATE,
         Column.REGISTERED_TEAMS,
     ]
-    renderer = PaginatedSearchRenderer(request, Meet, MeetAdmin, "All Meets", columns)
+    access = UserAccess.for_request(request)
+    if access.is_superuser or access.is_official:
+        columns.append(Column.SHEETS)
+    renderer = PaginatedSearchRenderer(
+        request,
+        Meet,
+        MeetAdmin,
+        "All Meets",
+        columns,
+        keyset=True,
+        cache_models=PUBLIC_LISTING_MODELS,
+    )
     return renderer.render()
 
 
 def my_meets(request: HttpRequest) -> HttpResponse:
     columns = [Column.MEET, Column.TEAM]
     renderer = PaginatedSearchRenderer(
-        request, MeetTeam, MeetTeamAdmin, "My Meets", columns
+        request, MeetTeam, MeetTeamAdmin, "My Meets", columns, keyset=True
+    )
+    renderer.objects = MeetTeam.objects.filter(
+        team_id__in=UserAccess.for_request(request).team_ids
     )
-    renderer.objects = MeetTeam.objects.filter(team__in=request.user.teams.all())
     renderer.columns.append(
         Column.ENTRIES.with_context(
             {
-                "editable_ids": renderer.objects.values_list("id", flat=True),
-                "meet_team_ids_map": {
-                    meet_team.id: (meet_team.meet.id, meet_team.team.id)
-                    for meet_team in renderer.objects
-                },
+                # Every listed meet team belongs to one of the user's teams
+                "filter_editable_ids": lambda ids: ids,
+                "meet_team_ids": lambda meet_team: (
+                    meet_team.meet_id,
+                    meet_team.team_id,
+                ),
             }
         )
     )
@@ -47,24 +67,31 @@ def my_meets(request: HttpRequest) -> HttpResponse:
 
 
 def teams_for_meet(request: HttpRequest, meet_id: int) -> HttpResponse:
-    if not Meet.objects.filter(id=meet_id).exists():
+    meet = Meet.objects.filter(id=meet_id).first()
+    if meet is None:
         raise Http404("Meet not found")
 
     columns = [Column.NAME, Column.REGISTERED_MEETS]
-    meet = Meet.objects.filter(id=meet_id).get()
     renderer = PaginatedSearchRenderer(
-        request, Team, TeamAdmin, f"{meet.name} Teams", columns
+        request,
+        Team,
+        TeamAdmin,
+        f"{meet.name} Teams",
+        columns,
+        cache_models=PUBLIC_LISTING_MODELS,
     )
     renderer.objects = meet.teams.all()
 
-    if request.user.is_authenticated and request.user.is_coach:
-        meet_team_ids_map = {}
-        team_ids = request.user.teams.all().values_list("id", flat=True)
-        for team_id in team_ids:
-            meet_team_ids_map[team_id] = (meet_id, team_id)
+    access = UserAccess.for_request(request)
+    if access.is_coach:
         renderer.columns.append(
             Column.ENTRIES.with_context(
-                {"editable_ids": team_ids, "meet_team_ids_map": meet_team_ids_map}
+                {
+                    "filter_editable_ids": lambda ids: access.team_ids.intersection(
+                        ids
+                    ),
+                    "meet_team_ids": lambda team: (meet_id, team.id),
+                }
             )
         )
 
@@ -73,7 +100,14 @@ def teams_for_meet(request: HttpRequest, meet_id: int) -> HttpResponse:
 
 def all_teams(request: HttpRequest) -> HttpResponse:
     columns = [Column.NAME, Column.REGISTERED_MEETS]
-    renderer = PaginatedSearchRenderer(request, Team, TeamAdmin, "All Teams", columns)
+    renderer = PaginatedSearchRenderer(
+        request,
+        Team,
+        TeamAdmin,
+        "All Teams",
+        columns,
+        cache_models=PUBLIC_LISTING_MODELS,
+    )
     return renderer.render()
 
 
@@ -81,12 +115,15 @@ def all_teams(request: HttpRequest) -> HttpResponse:
 def my_teams(request: HttpRequest) -> HttpResponse:
     columns = [Column.NAME, Column.REGISTERED_MEETS]
     renderer = PaginatedSearchRenderer(request, Team, TeamAdmin, "My Teams", columns)
-    renderer.objects = request.user.teams.all()
+    renderer.objects = Team.objects.filter(
+        id__in=UserAccess.for_request(request).team_ids
+    )
     return renderer.render()
 
 
 def meets_for_team(request: HttpRequest, team_id: int) -> HttpResponse:
-    if not Team.objects.filter(id=team_id).exists():
+    team = Team.objects.filter(id=team_id).first()
+    if team is None:
         raise Http404("Team not found")
 
     columns = [
@@ -95,26 +132,26 @@ def meets_for_team(request: HttpRequest, team_id: int) -> HttpResponse:
         Column.END_DATE,
         Column.REGISTERED_TEAMS,
     ]
-    team = Team.objects.filter(id=team_id).get()
-    meet_ids = MeetTeam.objects.filter(team_id=team_id).values_list(
-        "meet_id", flat=True
-    )
     renderer = PaginatedSearchRenderer(
-        request, Meet, MeetAdmin, f"{team.name} Meets", columns
+        request,
+        Meet,
+        MeetAdmin,
+        f"{team.name} Meets",
+        columns,
+        cache_models=PUBLIC_LISTING_MODELS,
     )
     renderer.objects = team.meets.all()
 
-    if (
-        request.user.is_authenticated
-        and request.user.is_coach
-        and request.user.teams.all().filter(id=team_id).exists()
-    ):
-        meet_team_ids_map = {}
-        for meet in renderer.objects:
-            meet_team_ids_map[meet.id] = (meet.id, team_id)
+    access = UserAccess.for_request(request)
+    if access.is_coach and access.coaches(team_id):
         renderer.columns.append(
             Column.ENTRIES.with_context(
-                {"editable_ids": meet_ids, "meet_team_ids_map": meet_team_ids_map}
+                {
+                    "filter_editable_ids": lambda ids: MeetTeam.objects.filter(
+                        team_id=team_id, meet_id__in=ids
+                    ).values_list("meet_id", flat=True),
+                    "meet_team_ids": lambda meet: (meet.id, team_id),
+                }
             )
         )
 
@@ -15,6 +15,16 @@ DATABASES = {
     }
 }
 
+# Cache Settings
+# https://docs.djangoproject.com/en/5.0/topics/cache/#local-memory-caching
+# The development server is a single process, but the cache is not shared with
+# management commands, so restart it after running one that writes entries
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 
 try:
     from local_settings import *  # noqa
@@ -18,6 +18,20 @@ DATABASES = {
     }
 }
 
+# Cache Settings
+# https://docs.djangoproject.com/en/5.0/topics/cache/#database-caching
+# Cached listings, counts and seeding are shared by every worker and by management
+# commands, so a write in any process expires them everywhere. Storing the cache
+# in the database also makes a bumped table generation visible together with the
+# write that bumped it. The table is created on deploy with createcachetable.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "swive_cache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+}
+
 # IMPORTANT!:
 # You must keep this secret, you can store it in an
 # environment variable and set it with: